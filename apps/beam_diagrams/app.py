@@ -1,11 +1,60 @@
 import streamlit as st
-import sympy
 import random # Needed for roll_dice
 
 # Import functions from the calculator and visualizer modules
-from .beam_diagrams_calculator import calculate_beam_diagrams, interpret_dice_results, roll_dice
-from .beam_diagrams_visualizer import plot_beam_schematic, plot_diagram
+from .beam_diagrams_calculator import interpret_dice_results, roll_dice
+from .beam_cache import RESULT_CACHE, cached_beam_diagrams
+from .beam_diagrams_visualizer import plot_beam_schematic, plot_diagram, plot_deflection, plot_envelope
+from .beam_loads import BeamLoads
+from .beam_catalog import lookup_outcome
+from .beam_influence import influence_lines
+from .beam_symbolic import build_symbolic_equations
+from ..profiling import profiled_page, stage
 
+# Starting point of the manual entry (also pre-cached by the warm-up, see apps.startup)
+MANUAL_DEFAULTS = {
+    'length': 10.0, 'support_left': 'Simple', 'support_right': 'Simple',
+    'point_load_p': {'magnitude': 5.0, 'position': 5.0},
+    'dist_load_w': {'magnitude': 2.0, 'start': 2.0, 'end': 8.0},
+    'EI': 20.0 # Default EI (slope and deflection)
+}
+
+# Columns of the manual load tables (keys of the load dicts in beam_params)
+def load_table_columns(length):
+    """Column config of every manual load table; positions are limited to [0, length]."""
+    def position(label):
+        return st.column_config.NumberColumn(label, min_value=0.0, max_value=length, format="%.2f")
+    return {
+        'point_loads': {
+            'magnitude': st.column_config.NumberColumn("Magnitud P (+: abajo)", format="%.2f"),
+            'position': position("Posición x"),
+        },
+        'distributed_loads': {
+            'start': position("Inicio"),
+            'end': position("Fin"),
+            'magnitude_start': st.column_config.NumberColumn("w inicio (+: abajo)", format="%.2f"),
+            'magnitude_end': st.column_config.NumberColumn("w fin (+: abajo)", format="%.2f"),
+        },
+        'moments': {
+            'magnitude': st.column_config.NumberColumn("Magnitud C (+: antihorario)", format="%.2f"),
+            'position': position("Posición x"),
+        },
+    }
+
+def show_catalog_answers(entry):
+    """Reactions and exact V/M extrema of a catalog entry, without solving the beam."""
+    st.subheader("🔑 Clave de Respuestas (Catálogo)")
+    reactions = [(name, value) for name, value in entry['reactions'].items() if abs(value) > 1e-9]
+    for column, (name, value) in zip(st.columns(max(1, len(reactions))), reactions):
+        column.metric(name, f"{value:.3f}")
+    extrema = entry['extrema']
+    col_v, col_m = st.columns(2)
+    col_v.metric("Cortante máximo |V|", f"{extrema['V_abs_max']:.3f}",
+                 f"x = {extrema['x_V_abs_max']:.3f}", delta_color="off")
+    col_m.metric("Momento máximo |M|", f"{extrema['M_abs_max']:.3f}",
+                 f"x = {extrema['x_M_abs_max']:.3f}", delta_color="off")
+
+@profiled_page('beam_diagrams')
 def main():
     st.title("📊 Generador Interactivo de Diagramas de Viga")
     st.markdown("""
@@ -31,11 +80,16 @@ def main():
                 'dist_load_w_mag': roll_dice(3),
                 'dist_load_w_span': roll_dice(2),
                 'support_right': roll_dice(3),
-                'EI': roll_dice(4) # EI is interpreted but not used in V, M calcs here
+                'EI': roll_dice(4) # EI only affects slope and deflection
             }
             st.session_state.dice_rolls = dice_rolls # Store rolls
-            # Interpret results immediately after rolling
-            interpreted_params = interpret_dice_results(dice_rolls)
+            # Look the roll up in the precomputed catalog; interpret it live if there is none
+            catalog_entry = lookup_outcome(dice_rolls)
+            st.session_state.beam_catalog_entry = catalog_entry
+            if catalog_entry is not None:
+                interpreted_params = catalog_entry['params']
+            else:
+                interpreted_params = interpret_dice_results(dice_rolls)
             st.session_state.beam_params = interpreted_params # Store interpreted params
             st.sidebar.write("Resultados Dados:", dice_rolls) # Display dice results
 
@@ -44,6 +98,17 @@ def main():
             beam_params = st.session_state.beam_params # Use the interpreted params
             st.sidebar.write("--- Parámetros Generados (Dados) ---")
             st.sidebar.json(beam_params) # Display generated params clearly
+            catalog_entry = st.session_state.get('beam_catalog_entry')
+            if catalog_entry is not None:
+                st.sidebar.caption(f"Problema #{catalog_entry['code']} del catálogo "
+                                   f"(probabilidad {catalog_entry['probability']:.2e})")
+                with st.sidebar.expander("Clave de Respuestas (Catálogo)"):
+                    for name, value in catalog_entry['reactions'].items():
+                        st.write(f"{name} = {value:.3f}")
+                    st.write(f"|V| máx = {catalog_entry['extrema']['V_abs_max']:.3f} "
+                             f"en x = {catalog_entry['extrema']['x_V_abs_max']:.3f}")
+                    st.write(f"|M| máx = {catalog_entry['extrema']['M_abs_max']:.3f} "
+                             f"en x = {catalog_entry['extrema']['x_M_abs_max']:.3f}")
         elif 'beam_params' not in st.session_state:
              st.sidebar.info("Lanza los dados para generar la configuración.")
 
@@ -51,55 +116,53 @@ def main():
     elif input_method == "Entrada Manual":
         st.sidebar.subheader("✍️ Entrada Manual")
         # Use defaults from session state if available, otherwise use hardcoded defaults
-        defaults = st.session_state.get('beam_params', {
-            'length': 10.0, 'support_left': 'Simple', 'support_right': 'Simple',
-            'point_load_p': {'magnitude': 5.0, 'position': 5.0},
-            'dist_load_w': {'magnitude': 2.0, 'start': 2.0, 'end': 8.0},
-            'EI': 20.0 # Default EI, though not used in V, M calcs
-        })
-
-        # Ensure nested dicts exist for defaults if loading from session state
-        defaults.setdefault('point_load_p', {'magnitude': 0.0, 'position': 0.0})
-        defaults.setdefault('dist_load_w', {'magnitude': 0.0, 'start': 0.0, 'end': 0.0})
+        defaults = st.session_state.get('beam_params', MANUAL_DEFAULTS)
 
         L = st.sidebar.number_input("Longitud (L)", min_value=0.1, value=float(defaults.get('length', 10.0)), step=0.5, key="manual_L_beam")
         support_left = st.sidebar.selectbox("Apoyo Izquierdo", ('Simple', 'Empotrado'), index=('Simple', 'Empotrado').index(defaults.get('support_left', 'Simple')), key="manual_support_left_beam")
         support_right = st.sidebar.selectbox("Apoyo Derecho", ('Libre', 'Simple', 'Empotrado'), index=('Libre', 'Simple', 'Empotrado').index(defaults.get('support_right', 'Simple')), key="manual_support_right_beam")
 
-        st.sidebar.markdown("--- Carga Puntual (P) ---")
-        # Allow negative magnitude
-        p_mag = st.sidebar.number_input("Magnitud P (+: abajo, -: arriba)", value=float(defaults['point_load_p'].get('magnitude', 5.0)), step=0.5, key="manual_p_mag_beam", format="%.2f")
-        # Ensure p_pos default is within the current length L
-        default_p_pos = min(defaults['point_load_p'].get('position', L/2), L)
-        p_pos = st.sidebar.number_input("Posición P", min_value=0.0, max_value=L, value=float(default_p_pos), step=0.1, key="manual_p_pos_beam")
-
-        st.sidebar.markdown("--- Carga Distribuida (w) ---")
-        # Allow negative magnitude
-        w_mag = st.sidebar.number_input("Magnitud w (+: abajo, -: arriba)", value=float(defaults['dist_load_w'].get('magnitude', 2.0)), step=0.1, key="manual_w_mag_beam", format="%.2f")
-        # Ensure w_start default is within the current length L
-        default_w_start = min(defaults['dist_load_w'].get('start', L/4), L)
-        w_start = st.sidebar.number_input("Inicio w", min_value=0.0, max_value=L, value=float(default_w_start), step=0.1, key="manual_w_start_beam")
-        # Ensure w_end default is >= w_start and within L
-        default_w_end = min(max(w_start, defaults['dist_load_w'].get('end', 3*L/4)), L)
-        w_end = st.sidebar.number_input("Fin w", min_value=w_start, max_value=L, value=float(default_w_end), step=0.1, key="manual_w_end_beam")
-
-        # EI input (though not used for V, M calculations here)
-        # EI = st.sidebar.number_input("Módulo de Elasticidad (EI)", min_value=1.0, value=float(defaults.get('EI', 20.0)), step=1.0, key="manual_EI_beam")
+        # Load tables are seeded once (or from a new dice roll) and then owned by the editors
+        table_columns = load_table_columns(L)
+        if 'beam_load_tables' not in st.session_state or 'dice_rolls' in st.session_state:
+            import pandas as pd # Only the editable tables need pandas
+            load_lists = BeamLoads.from_params(defaults).to_params()
+            st.session_state.beam_load_tables = {
+                name: pd.DataFrame(load_lists[name], columns=list(columns))
+                for name, columns in table_columns.items()
+            }
+            # A new editor key discards edits made against the previous tables
+            st.session_state.beam_load_tables_version = st.session_state.get('beam_load_tables_version', 0) + 1
+
+        edited_loads = {}
+        for name, title in (('point_loads', "Cargas Puntuales (P)"),
+                            ('distributed_loads', "Cargas Distribuidas (w)"),
+                            ('moments', "Momentos Concentrados (C)")):
+            st.sidebar.markdown(f"--- {title} ---")
+            table = st.sidebar.data_editor(
+                st.session_state.beam_load_tables[name], num_rows="dynamic", hide_index=True,
+                column_config=table_columns[name],
+                key=f"manual_{name}_beam_{st.session_state.beam_load_tables_version}"
+            )
+            edited_loads[name] = table.dropna().to_dict('records')
+
+        # EI input (used for slope and deflection only)
+        EI = st.sidebar.number_input("Módulo de Elasticidad (EI)", min_value=1.0, value=float(defaults.get('EI', 20.0)), step=1.0, key="manual_EI_beam")
 
         # Update beam_params dictionary for manual input
         beam_params = {
             'length': L,
             'support_left': support_left,
             'support_right': support_right,
-            'point_load_p': {'magnitude': p_mag, 'position': p_pos},
-            'dist_load_w': {'magnitude': w_mag, 'start': w_start, 'end': w_end},
-            'EI': defaults.get('EI', 20.0) # Keep EI from defaults or previous state
+            **edited_loads,
+            'EI': EI
         }
         # Store manual params in session state immediately so they persist
         st.session_state.beam_params = beam_params
         # Clear dice rolls if switching to manual input
         if 'dice_rolls' in st.session_state:
             del st.session_state.dice_rolls
+        st.session_state.pop('beam_catalog_entry', None)
 
 
     # --- Calculation and Display Area ---
@@ -114,99 +177,182 @@ def main():
         - **Longitud (L):** {current_params['length']}
         - **Apoyo Izquierdo:** {current_params['support_left']}
         - **Apoyo Derecho:** {current_params['support_right']}
-        - **Carga Puntual P:** {current_params['point_load_p']['magnitude']} @ x={current_params['point_load_p']['position']:.2f}
-        - **Carga Distribuida w:** {current_params['dist_load_w']['magnitude']} de x={current_params['dist_load_w']['start']:.2f} a x={current_params['dist_load_w']['end']:.2f}
         """)
+        st.markdown("\n".join(f"- {line}" for line in BeamLoads.from_params(current_params).describe()))
         # st.json(current_params) # Alternative display
 
-        try:
-            # Calculate results
-            results = calculate_beam_diagrams(current_params)
-
-            # Display Beam Schematic
-            st.subheader("📝 Diagrama Esquemático y Memoria de Cálculo")
-            fig_beam = plot_beam_schematic(current_params, results)
-            st.plotly_chart(fig_beam, use_container_width=True)
-
-            # Display Calculation Steps in Expander
-            st.write("**Pasos del Cálculo:**")
-            with st.expander("Ver Pasos Detallados del Cálculo", expanded=False): # Start collapsed
-                for step in results.get('calculation_steps', ["No hay pasos disponibles."]):
-                    # Check for LaTeX patterns
-                    if isinstance(step, str) and ('\\' in step or '{' in step or '}' in step or '^' in step or '_' in step) and not step.startswith("**"):
-                        try:
-                            st.latex(step) # Render as LaTeX
-                        except Exception as latex_err:
-                            st.warning(f"No se pudo renderizar como LaTeX: {step}")
-                            st.text(step) # Fallback to text
-                    elif isinstance(step, str) and step.startswith("`"): # Render reaction results in code blocks
-                         st.code(step.strip("`"), language='text')
-                    elif isinstance(step, str): # Render other steps as markdown
-                         st.markdown(step, unsafe_allow_html=True)
-                    else:
-                         st.write(step) # Fallback for other types
+        # A roll found in the catalog is answered from the table; the beam is only
+        # solved when its diagrams and calculation report are requested
+        catalog_entry = st.session_state.get('beam_catalog_entry')
+        draw_diagrams = True
+        if catalog_entry is not None and catalog_entry['solved']:
+            show_catalog_answers(catalog_entry)
+            draw_diagrams = st.toggle("Dibujar diagramas y memoria de cálculo", value=False, key="beam_draw_catalog")
+
+        if draw_diagrams:
+            try:
+                # Calculate results (shared, read-only cache: reruns with the same params skip the solve)
+                results = cached_beam_diagrams(current_params)
+
+                # Display Beam Schematic
+                st.subheader("📝 Diagrama Esquemático y Memoria de Cálculo")
+                fig_beam = plot_beam_schematic(current_params, results)
+                with stage('st.plotly_chart'):
+                    st.plotly_chart(fig_beam, use_container_width=True)
+
+                # The report formats its text only when read: each section sits behind a toggle
+                # and is built only while the toggle is on
+                report = results['report']
+
+                # Display Calculation Steps behind a toggle
+                st.write("**Pasos del Cálculo:**")
+                if st.toggle("Ver Pasos Detallados del Cálculo", value=False, key="beam_show_steps"): # Start hidden
+                    for step in report.calculation_steps:
+                        # Check for LaTeX patterns
+                        if isinstance(step, str) and ('\\' in step or '{' in step or '}' in step or '^' in step or '_' in step) and not step.startswith("**"):
+                            try:
+                                st.latex(step) # Render as LaTeX
+                            except Exception as latex_err:
+                                st.warning(f"No se pudo renderizar como LaTeX: {step}")
+                                st.text(step) # Fallback to text
+                        elif isinstance(step, str) and step.startswith("`"): # Render reaction results in code blocks
+                             st.code(step.strip("`"), language='text')
+                        elif isinstance(step, str): # Render other steps as markdown
+                             st.markdown(step, unsafe_allow_html=True)
+                        else:
+                             st.write(step) # Fallback for other types
 
-            # Display Sign Conventions and Equations
-            st.markdown("**Ecuaciones y Convenciones de Signos:**")
+                # Display Sign Conventions and Equations
+                st.markdown("**Ecuaciones y Convenciones de Signos:**")
             
-            # Sign Conventions
-            with st.expander("Ver Convenciones de Signos", expanded=True):
-                st.markdown("""
-                **Convenciones de Signos:**
-                1. **Cargas:**
-                   - Cargas positivas (+) son hacia abajo
-                   - Cargas negativas (-) son hacia arriba
+                # Sign Conventions
+                with st.expander("Ver Convenciones de Signos", expanded=True):
+                    st.markdown("""
+                    **Convenciones de Signos:**
+                    1. **Cargas:**
+                       - Cargas positivas (+) son hacia abajo
+                       - Cargas negativas (-) son hacia arriba
                 
-                2. **Fuerza Cortante (V):**
-                   - V positivo (+): hacia abajo en la cara izquierda, hacia arriba en la cara derecha
-                   - Una reacción hacia arriba genera cortante negativo
+                    2. **Fuerza Cortante (V):**
+                       - V positivo (+): hacia abajo en la cara izquierda, hacia arriba en la cara derecha
+                       - Una reacción hacia arriba genera cortante negativo
                 
-                3. **Momento Flector (M):**
-                   - M positivo (+): horario en la cara izquierda, antihorario en la cara derecha
-                   - Relación: dM/dx = -V
-                """)
+                    3. **Momento Flector (M):**
+                       - M positivo (+): horario en la cara izquierda, antihorario en la cara derecha
+                       - Relación: dM/dx = -V
+                    """)
             
-            # Ecuaciones por Tramos (Student Format)
-            with st.expander("Ver Ecuaciones por Tramos", expanded=True):
-                st.markdown("Estas son las ecuaciones divididas por tramos:")
-                if 'tramos_equations' in results:
-                    for i, tramo in enumerate(results['tramos_equations'], 1):
+                # Ecuaciones por Tramos (Student Format)
+                if st.toggle("Ver Ecuaciones por Tramos", value=True, key="beam_show_tramos"):
+                    st.markdown("Estas son las ecuaciones divididas por tramos:")
+                    for i, tramo in enumerate(report.tramos_equations, 1):
                         st.markdown(f"**Tramo {i}** ({tramo['interval']})")
                         st.latex(tramo['V_eq'])
                         st.latex(tramo['M_eq'])
+
+                # Ecuaciones Generales (Mathematical Format)
+                if st.toggle("Ver Ecuaciones Generales", value=False, key="beam_show_equations"):
+                    st.markdown("Estas son las ecuaciones generales usando funciones de singularidad:")
+                    st.latex(f"V(x) = {report.shear_eq}")
+                    st.latex(f"M(x) = {report.moment_eq}")
+                    # The SymPy form is optional: it is only derived (once per topology) on request
+                    if st.checkbox("Mostrar forma simbólica (SymPy)", value=False, key="beam_show_sympy"):
+                        symbolic = build_symbolic_equations(current_params, results['reactions'])
+                        st.latex(f"V(x) = {symbolic['shear_latex']}")
+                        st.latex(f"M(x) = {symbolic['moment_latex']}")
+                        for name, formula, value in symbolic['reactions']:
+                            st.latex(f"{name} = {formula} = {value:.2f}")
+
+                # Display Diagrams
+                st.subheader("📈 Diagramas Resultantes")
+                col1, col2 = st.columns(2)
+                with col1:
+                    if 'x_values' in results and 'shear_values' in results:
+                        fig_shear = plot_diagram(results['x_values'], results['shear_values'], "Diagrama de Fuerza Cortante (V)", "Cortante (V)")
+                        with stage('st.plotly_chart'):
+                            st.plotly_chart(fig_shear, use_container_width=True)
+                    else:
+                        st.warning("No se pudieron generar los valores del diagrama de cortante.")
+                with col2:
+                     if 'x_values' in results and 'moment_values' in results:
+                        fig_moment = plot_diagram(results['x_values'], results['moment_values'], "Diagrama de Momento Flector (M)", "Momento (M)")
+                        with stage('st.plotly_chart'):
+                            st.plotly_chart(fig_moment, use_container_width=True)
+                     else:
+                        st.warning("No se pudieron generar los valores del diagrama de momento.")
+
+                # Exact extrema from the piecewise polynomials (not limited by the sampling grid)
+                if 'extrema' in results:
+                    x_v, v_max = results['extrema']['shear']['abs_max']
+                    x_m, m_max = results['extrema']['moment']['abs_max']
+                    col_v, col_m = st.columns(2)
+                    col_v.metric("Cortante máximo |V|", f"{abs(v_max):.3f}", f"x = {x_v:.3f}", delta_color="off")
+                    col_m.metric("Momento máximo |M|", f"{abs(m_max):.3f}", f"x = {x_m:.3f}", delta_color="off")
+
+                # Slope and deflection from EI (EI·y'' = M)
+                st.subheader("📉 Pendiente y Deflexión")
+                if results.get('deflection_values') is not None:
+                    fig_deflection = plot_deflection(results['x_values'], results['deflection_values'], results['slope_values'])
+                    with stage('st.plotly_chart'):
+                        st.plotly_chart(fig_deflection, use_container_width=True)
+                    x_y, y_max = results['extrema']['deflection']['abs_max']
+                    st.metric("Deflexión máxima |y|", f"{abs(y_max):.4g}", f"x = {x_y:.3f}", delta_color="off")
                 else:
-                    st.warning("No se pudieron generar las ecuaciones por tramos.")
-
-            # Ecuaciones Generales (Mathematical Format)
-            with st.expander("Ver Ecuaciones Generales", expanded=False):
-                st.markdown("Estas son las ecuaciones generales usando funciones matemáticas:")
-                if 'shear_eq' in results:
-                    st.latex(f"V(x) = {sympy.latex(results['shear_eq'])}")
-                if 'moment_eq' in results:
-                    st.latex(f"M(x) = {sympy.latex(results['moment_eq'])}")
-
-            # Display Diagrams
-            st.subheader("📈 Diagramas Resultantes")
-            col1, col2 = st.columns(2)
-            with col1:
-                if 'x_values' in results and 'shear_values' in results:
-                    fig_shear = plot_diagram(results['x_values'], results['shear_values'], "Diagrama de Fuerza Cortante (V)", "Cortante (V)")
-                    st.plotly_chart(fig_shear, use_container_width=True)
-                else:
-                    st.warning("No se pudieron generar los valores del diagrama de cortante.")
-            with col2:
-                 if 'x_values' in results and 'moment_values' in results:
-                    fig_moment = plot_diagram(results['x_values'], results['moment_values'], "Diagrama de Momento Flector (M)", "Momento (M)")
-                    st.plotly_chart(fig_moment, use_container_width=True)
-                 else:
-                    st.warning("No se pudieron generar los valores del diagrama de momento.")
-
-        except Exception as e:
-            st.error(f"Ocurrió un error durante el cálculo o la visualización: {e}")
-            st.exception(e) # Show traceback for debugging
+                    st.info("No se puede calcular la deflexión para esta configuración (ver paso 7 de la memoria de cálculo).")
+
+                # Moving loads: envelopes from the cached influence lines of this support configuration
+                st.subheader("🚚 Envolventes por Carga Móvil")
+                if st.checkbox("Calcular envolventes de un tren de cargas", value=False, key="beam_moving_load"):
+                    st.markdown("Cargas por eje (+: abajo) y separación respecto al eje anterior (la del primer eje se ignora).")
+                    import pandas as pd
+                    axles = st.data_editor(
+                        pd.DataFrame({'load': [35.0, 145.0, 145.0], 'spacing': [0.0, 4.3, 4.3]}),
+                        num_rows="dynamic", hide_index=True, key="beam_axles",
+                        column_config={
+                            'load': st.column_config.NumberColumn("Carga del eje", format="%.2f"),
+                            'spacing': st.column_config.NumberColumn("Separación", min_value=0.0, format="%.2f"),
+                        }
+                    ).dropna()
+                    if axles.empty:
+                        st.info("Agregue al menos un eje.")
+                    else:
+                        try:
+                            lines = influence_lines(float(current_params['length']), current_params['support_left'],
+                                                    current_params['support_right'])
+                            envelope = lines.envelope(axles['load'].to_numpy(), axles['spacing'].to_numpy()[1:])
+                            col_ev, col_em = st.columns(2)
+                            with col_ev:
+                                with stage('st.plotly_chart'):
+                                    st.plotly_chart(plot_envelope(envelope['x_values'], envelope['V_max'], envelope['V_min'],
+                                                                  "Envolvente de Cortante (V)", "Cortante (V)",
+                                                                  results['x_values'], results['shear_values']),
+                                                    use_container_width=True)
+                            with col_em:
+                                with stage('st.plotly_chart'):
+                                    st.plotly_chart(plot_envelope(envelope['x_values'], envelope['M_max'], envelope['M_min'],
+                                                                  "Envolvente de Momento (M)", "Momento (M)",
+                                                                  results['x_values'], results['moment_values']),
+                                                    use_container_width=True)
+                        except ValueError as err:
+                            st.warning(f"No se pueden calcular las envolventes: {err}")
+
+            except Exception as e:
+                st.error(f"Ocurrió un error durante el cálculo o la visualización: {e}")
+                st.exception(e) # Show traceback for debugging
 
     else:
         st.info("Configure la viga usando el panel lateral para ver los resultados.")
 
+    # Cache counters, to size BEAM_CACHE_MB for a classroom
+    with st.sidebar.expander("🗄️ Caché de Resultados", expanded=False):
+        stats = RESULT_CACHE.stats()
+        st.markdown(f"""
+        - **Aciertos:** {stats['hits']} (disco: {stats['disk_hits']})
+        - **Fallos:** {stats['misses']}
+        - **Tasa de aciertos:** {stats['hit_rate']:.0%}
+        - **Entradas:** {stats['entries']} ({stats['bytes'] / 2**20:.2f} de {stats['max_bytes'] / 2**20:.0f} MB)
+        - **Desalojos:** {stats['evictions']}
+        """)
+
 # Note: No need for if __name__ == "__main__": here,
 # as this will be imported and run by the page script.
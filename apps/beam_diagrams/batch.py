@@ -0,0 +1,241 @@
+"""
+Headless batch solver for beam problems, for scheduled jobs.
+
+Streams beam definitions from JSONL (one params dict per line, in the app's
+format) or CSV, packs them into chunks, solves each chunk with the
+vectorized batch solver in a process pool and writes the reactions and the
+exact V/M extrema as JSONL or as a columnar .npz file (V_abs_max and
+M_abs_max are magnitudes, never negative). Only a bounded number
+of chunks is in flight at a time, so memory does not grow with the input
+(the .npz writer keeps just the numeric output columns). Nothing here
+imports Streamlit.
+
+A malformed line does not stop the run: it is skipped and its line number
+and message are written as JSONL to --errors (or to stderr).
+
+CSV files have the columns length, support_left and support_right, an
+optional id, and either JSON lists in point_loads, distributed_loads and
+moments or the single-load columns of the dice catalog (p_magnitude,
+p_position, w_magnitude, w_start, w_end).
+
+Usage:
+    python -m apps.beam_diagrams.batch beams.jsonl --output results.jsonl
+    python -m apps.beam_diagrams.batch beams.csv --output results.npz --workers 4 --errors errors.jsonl
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+from .beam_batch import BeamBatch, REACTION_NAMES, SUPPORT_CODES, batch_extrema, solve_batch_reactions
+from .beam_loads import load_columns
+
+EXTREMA_NAMES = [f'{prefix}{d}_{k}' for d in ('V', 'M') for k in ('max', 'min', 'abs_max') for prefix in ('', 'x_')]
+OUTPUT_COLUMNS = ['solved', *REACTION_NAMES, *EXTREMA_NAMES]
+
+_LIST_COLUMNS = ('point_loads', 'distributed_loads', 'moments')
+
+def _csv_params(row):
+    """Params dict of one CSV row."""
+    params = {'length': float(row['length']), 'support_left': row['support_left'],
+              'support_right': row['support_right']}
+    for name in _LIST_COLUMNS:
+        if row.get(name):
+            params[name] = json.loads(row[name])
+    if row.get('p_magnitude'):
+        params['point_load_p'] = {'magnitude': float(row['p_magnitude']), 'position': float(row['p_position'])}
+    if row.get('w_magnitude'):
+        params['dist_load_w'] = {'magnitude': float(row['w_magnitude']), 'start': float(row['w_start']),
+                                 'end': float(row['w_end'])}
+    if row.get('id'):
+        params['id'] = row['id']
+    return params
+
+def read_records(path):
+    """
+    Yields (line number, record) for every beam of a JSONL or CSV file ('-'
+    reads JSONL from stdin): the raw line of a JSONL file or the row dict of
+    a CSV file. Parsing is left to parse_beam, which runs in the workers.
+    """
+    is_csv = path.endswith('.csv')
+    # Undecodable bytes are replaced, so they fail the parse of their own line only
+    stream = sys.stdin if path == '-' else open(path, newline='' if is_csv else None, encoding='utf-8',
+                                                errors='replace')
+    try:
+        rows = csv.DictReader(stream) if is_csv else stream
+        for number, row in enumerate(rows, 1):
+            if is_csv or row.strip():
+                yield number, row
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+def parse_beam(number, record):
+    """
+    Params dict of a record from read_records; beams without an 'id' get
+    their line number. Raises ValueError on a malformed definition: an
+    unknown support, a length that is not finite and positive, or a load
+    field that is missing a number or is not finite.
+    """
+    try:
+        params = _csv_params(record) if isinstance(record, dict) else json.loads(record)
+        for key in ('support_left', 'support_right'):
+            if params[key] not in SUPPORT_CODES:
+                raise ValueError(f"apoyo desconocido '{params[key]}'")
+        params['length'] = float(params['length'])
+        if not (math.isfinite(params['length']) and params['length'] > 0):
+            raise ValueError(f"la longitud debe ser un número positivo ({params['length']})")
+        for name, values in load_columns(params).items():
+            if not all(map(math.isfinite, values)):
+                raise ValueError(f"valor no finito en {name}")
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Línea {number}: definición de viga inválida ({e})") from e
+    params.setdefault('id', number)
+    return params
+
+def chunked(items, size):
+    """Yields lists of up to `size` consecutive items."""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+def solve_chunk(records):
+    """
+    Parses and solves a list of records. Returns the ids, one array per
+    OUTPUT_COLUMNS entry and the (line number, message) of every record that
+    could not be parsed (those are left out of the output).
+    """
+    params_list, errors = [], []
+    for number, record in records:
+        try:
+            params_list.append(parse_beam(number, record))
+        except ValueError as e:
+            errors.append((number, str(e)))
+    if not params_list:
+        return [], {name: np.zeros(0) for name in OUTPUT_COLUMNS}, errors
+    batch = BeamBatch.from_params_list(params_list)
+    reactions, solved = solve_batch_reactions(batch)
+    columns = {'solved': solved}
+    columns.update({name: reactions[:, i] for i, name in enumerate(REACTION_NAMES)})
+    columns.update(batch_extrema(batch, reactions))
+    return [p['id'] for p in params_list], columns, errors
+
+def solve_stream(records, chunk_size=2000, workers=1, max_pending=None):
+    """
+    Yields (ids, columns, errors) per chunk of records, in input order. With several
+    workers at most `max_pending` chunks (twice the workers by default) are
+    queued, so the input is read only as fast as it is solved.
+    """
+    chunks = chunked(records, chunk_size)
+    if workers == 1:
+        yield from map(solve_chunk, chunks)
+        return
+    max_pending = max_pending or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque(executor.submit(solve_chunk, chunk) for chunk in islice(chunks, max_pending))
+        while pending:
+            result = pending.popleft().result()
+            for chunk in islice(chunks, 1):
+                pending.append(executor.submit(solve_chunk, chunk))
+            yield result
+
+class JsonlWriter:
+    """Writes one JSON object per beam: id, solved, reactions and extrema."""
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, ids, columns):
+        values = {name: columns[name].tolist() for name in OUTPUT_COLUMNS}
+        for i, beam_id in enumerate(ids):
+            self.stream.write(json.dumps({
+                'id': beam_id,
+                'solved': values['solved'][i],
+                'reactions': {name: values[name][i] for name in REACTION_NAMES},
+                'extrema': {name: values[name][i] for name in EXTREMA_NAMES},
+            }) + '\n')
+
+    def close(self):
+        self.stream.flush()
+
+class NpzWriter:
+    """Collects the output columns and saves them with the ids as one .npz file."""
+    def __init__(self, path):
+        self.path = path
+        self.ids = []
+        self.columns = {name: [] for name in OUTPUT_COLUMNS}
+
+    def write(self, ids, columns):
+        self.ids.extend(ids)
+        for name in OUTPUT_COLUMNS:
+            self.columns[name].append(columns[name])
+
+    def close(self):
+        arrays = {name: np.concatenate(parts) if parts else np.zeros(0) for name, parts in self.columns.items()}
+        np.savez_compressed(self.path, id=np.array([str(i) for i in self.ids]), **arrays)
+
+def run_batch(input_path, output_path='-', chunk_size=2000, workers=None, progress=sys.stderr, interval=1.0,
+              errors_path=None):
+    """
+    Solves every beam of `input_path` and writes the results to
+    `output_path` (.npz for columnar output, '-' for JSONL on stdout).
+    Malformed lines are skipped and reported as JSONL ({"line", "error"})
+    to `errors_path`, or to stderr. Reports progress in beams per second to
+    `progress` every `interval` seconds. Uses every CPU unless `workers` is
+    given. Returns (beams, seconds, skipped lines).
+    """
+    workers = workers or os.cpu_count() or 1
+    if output_path.endswith('.npz'):
+        writer = NpzWriter(output_path)
+    else:
+        writer = JsonlWriter(sys.stdout if output_path == '-' else open(output_path, 'w', encoding='utf-8'))
+    errors = sys.stderr if errors_path is None else open(errors_path, 'w', encoding='utf-8')
+    start = last_report = time.perf_counter()
+    n = skipped = 0
+    try:
+        for ids, columns, chunk_errors in solve_stream(read_records(input_path), chunk_size, workers):
+            writer.write(ids, columns)
+            n += len(ids)
+            for number, message in chunk_errors:
+                errors.write(json.dumps({'line': number, 'error': message}, ensure_ascii=False) + '\n')
+            skipped += len(chunk_errors)
+            now = time.perf_counter()
+            if progress is not None and now - last_report >= interval:
+                print(f"{n} vigas, {n / (now - start):.0f} vigas/s", file=progress, flush=True)
+                last_report = now
+    finally:
+        writer.close()
+        if isinstance(writer, JsonlWriter) and writer.stream is not sys.stdout:
+            writer.stream.close()
+        if errors is not sys.stderr:
+            errors.close()
+    return n, time.perf_counter() - start, skipped
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resuelve lotes de vigas sin interfaz (JSONL/CSV -> JSONL/npz).")
+    parser.add_argument('input', help="Archivo .jsonl o .csv con una viga por línea ('-' lee JSONL de stdin).")
+    parser.add_argument('--output', default='-', help="Archivo .jsonl o .npz de resultados (por defecto, stdout).")
+    parser.add_argument('--workers', type=int, default=None, help="Procesos (por defecto, uno por CPU).")
+    parser.add_argument('--chunk-size', type=int, default=2000)
+    parser.add_argument('--errors', default=None,
+                        help="Archivo .jsonl con las líneas inválidas omitidas (por defecto, stderr).")
+    parser.add_argument('--quiet', action='store_true', help="No informar el progreso.")
+    args = parser.parse_args(argv)
+
+    progress = None if args.quiet else sys.stderr
+    n, seconds, skipped = run_batch(args.input, args.output, args.chunk_size, args.workers, progress,
+                                    errors_path=args.errors)
+    if progress is not None:
+        print(f"{n} vigas en {seconds:.2f} s ({n / max(seconds, 1e-9):.0f} vigas/s)"
+              + (f", {skipped} líneas inválidas omitidas" if skipped else ""), file=progress)
+
+if __name__ == '__main__':
+    main()
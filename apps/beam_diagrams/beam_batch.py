@@ -0,0 +1,336 @@
+"""
+Vectorized solver for many single-span beams at once.
+
+A BeamBatch describes K beams as a structure of arrays: one length and one
+support code per beam, and (K, n) arrays of padded loads (unused slots have
+zero magnitude). solve_beam_batch computes every reaction and the sampled
+V/M diagrams with broadcast NumPy operations; the only Python loops run over
+load slots, never over beams.
+
+The sign conventions are those of calculate_beam_diagrams.
+"""
+
+import numpy as np
+from dataclasses import dataclass, field
+
+from .beam_loads import BeamLoads, clip_distributed, load_columns
+
+SUPPORT_CODES = {'Libre': 0, 'Simple': 1, 'Empotrado': 2}
+REACTION_NAMES = ('R_A', 'R_B', 'M_A', 'M_B')
+
+def _empty_loads():
+    return np.zeros((0, 0))
+
+@dataclass
+class BeamBatch:
+    """K beams in structure-of-arrays form; load arrays have shape (K, slots)."""
+    lengths: np.ndarray
+    support_left: np.ndarray
+    support_right: np.ndarray
+    point_positions: np.ndarray = field(default_factory=_empty_loads)
+    point_magnitudes: np.ndarray = field(default_factory=_empty_loads)
+    dist_starts: np.ndarray = field(default_factory=_empty_loads)
+    dist_ends: np.ndarray = field(default_factory=_empty_loads)
+    dist_start_magnitudes: np.ndarray = field(default_factory=_empty_loads)
+    dist_end_magnitudes: np.ndarray = field(default_factory=_empty_loads)
+    moment_positions: np.ndarray = field(default_factory=_empty_loads)
+    moment_magnitudes: np.ndarray = field(default_factory=_empty_loads)
+
+    def __post_init__(self):
+        self.lengths = np.asarray(self.lengths, dtype=float).ravel()
+        K = len(self.lengths)
+        self.support_left = _support_codes(self.support_left, K)
+        self.support_right = _support_codes(self.support_right, K)
+        for name in list(self.__dataclass_fields__)[3:]:
+            values = np.asarray(getattr(self, name), dtype=float)
+            setattr(self, name, values.reshape(K, -1) if values.size else np.zeros((K, 0)))
+
+        # Clamp every position to its own beam, as calculate_beam_diagrams does
+        L = self.lengths[:, None]
+        self.point_positions = np.clip(self.point_positions, 0.0, L)
+        self.moment_positions = np.clip(self.moment_positions, 0.0, L)
+        starts = np.minimum(self.dist_starts, self.dist_ends)
+        ends = np.maximum(self.dist_starts, self.dist_ends)
+        swap = self.dist_starts > self.dist_ends
+        self.dist_start_magnitudes, self.dist_end_magnitudes = (
+            np.where(swap, self.dist_end_magnitudes, self.dist_start_magnitudes),
+            np.where(swap, self.dist_start_magnitudes, self.dist_end_magnitudes))
+        # Loads left with no length keep zero magnitudes (the batch arrays stay padded)
+        self.dist_starts, self.dist_ends, w1, w2 = clip_distributed(
+            starts, ends, self.dist_start_magnitudes, self.dist_end_magnitudes, L)
+        outside = self.dist_ends <= self.dist_starts
+        self.dist_start_magnitudes = np.where(outside, 0.0, w1)
+        self.dist_end_magnitudes = np.where(outside, 0.0, w2)
+
+    @property
+    def size(self):
+        return len(self.lengths)
+
+    @classmethod
+    def from_params_list(cls, params_list):
+        """Packs a list of beam params dicts (any load format) into a padded batch."""
+        # The batch needs no per-beam sorting, so the plain load columns are padded directly
+        columns = [load_columns(p) for p in params_list]
+
+        def padded(name):
+            rows = [c[name] for c in columns]
+            out = np.zeros((len(rows), max(map(len, rows), default=0)))
+            for i, r in enumerate(rows):
+                if r:
+                    out[i, :len(r)] = r
+            return out
+
+        return cls(
+            lengths=[p['length'] for p in params_list],
+            support_left=[p['support_left'] for p in params_list],
+            support_right=[p['support_right'] for p in params_list],
+            **{name: padded(name) for name in BeamLoads.__dataclass_fields__},
+        )
+
+    def take(self, rows):
+        """Sub-batch with the beams selected by an index array or boolean mask."""
+        return BeamBatch(**{name: getattr(self, name)[rows] for name in self.__dataclass_fields__})
+
+    def resultants(self):
+        """(K,) total downward force and ΣM_A right-hand side, as in BeamLoads.resultants."""
+        a, b = self.dist_starts, self.dist_ends
+        w1, w2 = self.dist_start_magnitudes, self.dist_end_magnitudes
+        span = b - a
+        total_force = self.point_magnitudes.sum(axis=1) + (span * (w1 + w2) / 2.0).sum(axis=1)
+        total_moment = ((self.point_magnitudes * self.point_positions).sum(axis=1)
+                        + (span * (w1 * (2 * a + b) + w2 * (a + 2 * b)) / 6.0).sum(axis=1)
+                        - self.moment_magnitudes.sum(axis=1))
+        return total_force, total_moment
+
+def _support_codes(values, K):
+    values = np.asarray(values)
+    if values.dtype.kind in 'US':
+        values = np.vectorize(SUPPORT_CODES.__getitem__, otypes=[int])(values)
+    return np.broadcast_to(values.astype(int).ravel(), (K,)).copy()
+
+def solve_batch_reactions(batch):
+    """
+    Reactions of every beam as a (K, 4) array with columns REACTION_NAMES.
+
+    Statically indeterminate beams are solved by compatibility (see
+    _indeterminate_reactions). Returns (reactions, solved) where `solved` is
+    False for unstable beams (fewer than two reactions), whose reactions only
+    satisfy ΣFy, as in calculate_beam_diagrams.
+    """
+    F, Mo = batch.resultants()
+    L = batch.lengths
+    left_R, left_M = batch.support_left >= 1, batch.support_left == 2
+    right_R, right_M = batch.support_right >= 1, batch.support_right == 2
+    n_unknowns = left_R.astype(int) + left_M + right_R + right_M
+
+    reactions = np.zeros((batch.size, 4))
+    simple_simple = left_R & right_R & ~left_M & ~right_M
+    cantilever_left = left_M & ~right_R
+    cantilever_right = right_M & ~left_R
+    only_left = (n_unknowns == 1) & left_R
+    only_right = (n_unknowns == 1) & right_R
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        R_B_ss = np.where(L > 0, Mo / L, 0.0)
+    reactions[:, 1] = np.where(simple_simple, R_B_ss, 0.0)
+    reactions[:, 0] = np.where(simple_simple, F - R_B_ss, 0.0)
+    reactions[:, 0] += np.where(cantilever_left | only_left, F, 0.0)
+    reactions[:, 2] = np.where(cantilever_left, Mo, 0.0)
+    reactions[:, 1] += np.where(cantilever_right | only_right, F, 0.0)
+    reactions[:, 3] = np.where(cantilever_right, Mo - F * L, 0.0)
+
+    indeterminate = n_unknowns > 2
+    if indeterminate.any():
+        reactions[indeterminate] = _indeterminate_reactions(batch.take(indeterminate))
+    return reactions, n_unknowns >= 2
+
+def _indeterminate_reactions(batch):
+    """
+    Reactions of Empotrado–Simple, Empotrado–Empotrado and Simple–Empotrado
+    beams by the force method, vectorized over the batch.
+
+    The released structure is a cantilever from the clamped end (the left one
+    when both are clamped). With EI constant, EI·y'' = M gives the free-end
+    compatibility conditions in terms of I0 = ∫M0 dx and I1 = ∫x·M0 dx of the
+    cantilever moment M0; both are exact with 3-point Gauss–Legendre on each
+    segment, as M0 is at most cubic there. This is the batch counterpart of
+    the direct stiffness solver used by calculate_beam_diagrams.
+    """
+    F, Mo = batch.resultants()
+    L = batch.lengths
+    left_fixed = batch.support_left == 2
+    base = np.zeros((batch.size, 4))
+    base[:, 0] = np.where(left_fixed, F, 0.0)
+    base[:, 2] = np.where(left_fixed, Mo, 0.0)
+    base[:, 1] = np.where(left_fixed, 0.0, F)
+    base[:, 3] = np.where(left_fixed, 0.0, Mo - F * L)
+
+    bp = batch_breakpoints(batch)
+    a, b = bp[:, :-1, None], bp[:, 1:, None]
+    nodes, weights = np.polynomial.legendre.leggauss(3)
+    x = ((a + b) / 2 + (b - a) / 2 * nodes).reshape(batch.size, -1)
+    w = ((b - a) / 2 * weights).reshape(batch.size, -1)
+    _, M0 = evaluate_batch(batch, base, x)
+    I0 = (w * M0).sum(axis=1)
+    I1 = (w * x * M0).sum(axis=1)
+
+    reactions = base
+    both_fixed = left_fixed & (batch.support_right == 2)
+    # Clamped at A: y(L) = L·I0 - I1 and θ(L) = I0, released by R_B (and M_B)
+    y_L, theta_L = L * I0 - I1, I0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        R_B_propped = -3 * y_L / L**3
+        R_B_fixed = 12 * (-L * y_L + L**2 / 2 * theta_L) / L**4
+        M_B_fixed = 12 * (L**2 / 2 * y_L - L**3 / 3 * theta_L) / L**4
+        # Clamped at B: y(0) = I1, released by R_A
+        R_A_propped = -3 * I1 / L**3
+    R_B = np.where(both_fixed, R_B_fixed, R_B_propped)
+    M_B = np.where(both_fixed, M_B_fixed, 0.0)
+    reactions[:, 0] = np.where(left_fixed, F - R_B, R_A_propped)
+    reactions[:, 1] = np.where(left_fixed, R_B, F - R_A_propped)
+    reactions[:, 2] = np.where(left_fixed, Mo - R_B * L - M_B, 0.0)
+    reactions[:, 3] = np.where(left_fixed, M_B, Mo - (F - R_A_propped) * L)
+    return reactions
+
+def _distance(x, a, L):
+    """<x - a>^1 for x (K, m) and a (K,); loads sitting at x = L never act."""
+    return np.maximum(x - a[:, None], 0.0) * (a < L)[:, None]
+
+def _fill_diagrams(batch, reactions, rows, x, V, M, left_limit=False):
+    """
+    Writes V and M of the beams `rows` (a slice) at the points x into the
+    views V and M. With left_limit, jumps located exactly at x are excluded.
+    """
+    step = np.greater if left_limit else np.greater_equal
+    L = batch.lengths[rows]
+    R_A, M_A = reactions[rows, 0:1], reactions[rows, 2:3]
+    V[:] = -R_A
+    M[:] = -M_A + R_A * x
+    for j in range(batch.point_positions.shape[1]):
+        a, P = batch.point_positions[rows, j], batch.point_magnitudes[rows, j:j + 1]
+        V += P * (step(x, a[:, None]) & (a < L)[:, None])
+        M -= P * _distance(x, a, L)
+
+    # w(x) = w1 + k (x - a) on [a, b] is w1<x-a>^0 + k<x-a>^1 - w2<x-b>^0 - k<x-b>^1;
+    # each bracket d is computed once and reused for V and M in Horner form.
+    span = batch.dist_ends[rows] - batch.dist_starts[rows]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slopes = np.where(span > 0, (batch.dist_end_magnitudes[rows] - batch.dist_start_magnitudes[rows]) / span, 0.0)
+    for j in range(span.shape[1]):
+        loaded = span[:, j:j + 1] > 0
+        k = slopes[:, j:j + 1]
+        for position, w, sign in ((batch.dist_starts[rows, j], batch.dist_start_magnitudes[rows, j:j + 1], 1.0),
+                                  (batch.dist_ends[rows, j], batch.dist_end_magnitudes[rows, j:j + 1], -1.0)):
+            w = sign * np.where(loaded, w, 0.0)
+            d = _distance(x, position, L)
+            if np.any(k):
+                V += d * (w + sign * k / 2 * d)
+                M -= d * d * (w / 2 + sign * k / 6 * d)
+            else:
+                V += w * d
+                M -= w / 2 * d * d
+
+    for j in range(batch.moment_positions.shape[1]):
+        a, C = batch.moment_positions[rows, j], batch.moment_magnitudes[rows, j:j + 1]
+        M -= C * (step(x, a[:, None]) & (a < L)[:, None])
+
+def evaluate_batch(batch, reactions, x, left_limit=False, chunk_size=256):
+    """
+    V and M of every beam at the points x, an array of shape (K, m).
+
+    The beams are evaluated in blocks of `chunk_size` rows so the temporaries
+    stay in cache; every block is still a single broadcast computation.
+    """
+    x = np.asarray(x, dtype=float)
+    V = np.empty_like(x)
+    M = np.empty_like(x)
+    for start in range(0, batch.size, chunk_size):
+        rows = slice(start, start + chunk_size)
+        _fill_diagrams(batch, reactions, rows, x[rows], V[rows], M[rows], left_limit)
+    return V, M
+
+def solve_beam_batch(batch, n_points=500):
+    """
+    Solves K beams at once.
+
+    Returns a dict with 'x_values', 'shear_values' and 'moment_values' as
+    (K, n_points) arrays, 'reactions' as a (K, 4) array (columns
+    REACTION_NAMES) and the boolean 'solved' mask.
+    """
+    reactions, solved = solve_batch_reactions(batch)
+    x = batch.lengths[:, None] * np.linspace(0.0, 1.0, n_points)[None, :]
+    V, M = evaluate_batch(batch, reactions, x)
+    return {
+        'x_values': x,
+        'shear_values': V,
+        'moment_values': M,
+        'reactions': reactions,
+        'solved': solved,
+    }
+
+def batch_breakpoints(batch):
+    """(K, B) sorted breakpoints per beam: both ends plus every load position."""
+    L = batch.lengths[:, None]
+    return np.sort(np.concatenate((np.zeros_like(L), L, batch.point_positions, batch.dist_starts,
+                                   batch.dist_ends, batch.moment_positions), axis=1), axis=1)
+
+def batch_extrema(batch, reactions=None):
+    """
+    Exact extrema of V and M for every beam, without dense sampling.
+
+    On each segment between breakpoints V is at most quadratic, so it is
+    recovered from its values at both ends and the midpoint. The stationary
+    points of M are the roots of that quadratic and the one of V is its
+    vertex. Candidates are both one-sided limits at every breakpoint plus those
+    interior points. Padded load slots only add zero-width segments, whose
+    limits are still genuine diagram values. Reactions of indeterminate beams
+    are taken as given (zero by default).
+
+    Returns a dict of (K,) arrays: '<D>_max', '<D>_min' and '<D>_abs_max' for
+    D in ('V', 'M'), each with its position under 'x_<key>'. '<D>_abs_max' is
+    the magnitude |D| (never negative); its sign is the one of '<D>_max' or
+    '<D>_min' at the same position.
+    """
+    if reactions is None:
+        reactions, _ = solve_batch_reactions(batch)
+    bp = batch_breakpoints(batch)
+    start, end = bp[:, :-1], bp[:, 1:]
+    V0, M0 = evaluate_batch(batch, reactions, start)
+    V1, M1 = evaluate_batch(batch, reactions, end, left_limit=True)
+    # The diagrams start at x = 0+, so there is no left limit at the origin
+    at_origin = end <= 0
+    V1, M1 = np.where(at_origin, V0, V1), np.where(at_origin, M0, M1)
+    Vm, _ = evaluate_batch(batch, reactions, (start + end) / 2)
+
+    # V(t) = c + b t + a t^2 for t in [0, 1] along the segment
+    a = 2 * (V0 + V1 - 2 * Vm)
+    b = V1 - V0 - a
+    c = V0
+    scale = np.maximum(np.abs(V0) + np.abs(V1) + np.abs(Vm), 1e-300)
+    quadratic = np.abs(a) > 1e-12 * scale
+    with np.errstate(divide='ignore', invalid='ignore'):
+        root = np.sqrt(np.maximum(b * b - 4 * a * c, 0.0))
+        t1 = np.where(quadratic, (-b - root) / (2 * a), -c / b)
+        t2 = np.where(quadratic, (-b + root) / (2 * a), np.nan)
+        t_vertex = np.where(quadratic, -b / (2 * a), np.nan)
+    roots = []
+    for t in (t1, t2, t_vertex):
+        t = np.where((t > 0) & (t < 1), t, 0.0) # invalid roots fall back to the segment start
+        roots.append(start + t * (end - start))
+    x_vertex = roots.pop()
+    x_roots = np.concatenate(roots, axis=1)
+    _, M_roots = evaluate_batch(batch, reactions, x_roots)
+    V_vertex, _ = evaluate_batch(batch, reactions, x_vertex)
+
+    result = {}
+    for name, xs, values in (('V', np.concatenate((start, end, x_vertex), axis=1),
+                              np.concatenate((V0, V1, V_vertex), axis=1)),
+                             ('M', np.concatenate((start, end, x_roots), axis=1),
+                              np.concatenate((M0, M1, M_roots), axis=1))):
+        for key, idx in (('max', np.argmax(values, axis=1)),
+                         ('min', np.argmin(values, axis=1)),
+                         ('abs_max', np.argmax(np.abs(values), axis=1))):
+            result[f'{name}_{key}'] = np.take_along_axis(values, idx[:, None], axis=1)[:, 0]
+            result[f'x_{name}_{key}'] = np.take_along_axis(xs, idx[:, None], axis=1)[:, 0]
+        result[f'{name}_abs_max'] = np.abs(result[f'{name}_abs_max'])
+    return result
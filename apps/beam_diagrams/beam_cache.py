@@ -0,0 +1,157 @@
+"""
+Process-wide result cache for beam analyses.
+
+Streamlit reruns the whole page on every widget interaction, so the same
+parameters are solved again and again, by one student and across a class
+working on the same problem. cached_beam_diagrams keys each result by a
+canonical hash of its params dict (key order and int/float spelling do not
+matter) and keeps it in an in-memory LRU shared by every session of the
+process, bounded by an approximate size in bytes. An optional directory
+tier stores the pickled results so they survive restarts; its keys include
+RESULTS_VERSION, so files written by an older engine or results schema are
+never served after a deploy.
+
+The cached results are shared objects and must be treated as read-only.
+The hit/miss counters of stats() help to size the cache for a classroom.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .beam_diagrams_calculator import calculate_beam_diagrams
+from ..profiling import timed
+
+# Part of every key: bump it whenever calculate_beam_diagrams changes its
+# numbers or the layout of its results dict
+RESULTS_VERSION = 3
+
+def _canonical(value):
+    """JSON-ready copy of params with every number as a float."""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (bool, np.bool_)) or value is None or isinstance(value, str):
+        return value
+    return float(value)
+
+def params_key(params, version=RESULTS_VERSION):
+    """Content hash of a params dict: SHA-256 of its canonical JSON and the results version."""
+    text = json.dumps({'version': version, 'params': _canonical(params)}, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of pickleable results, bounded by `max_bytes` (the
+    pickled size of the entries), with an optional directory tier.
+    """
+    def __init__(self, max_bytes=64 * 2**20, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self._entries = OrderedDict() # key -> (result, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def _store(self, key, result, size):
+        """Inserts under the lock and evicts least recently used entries."""
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (result, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def get(self, key):
+        """Cached result or None; checks memory first, then the directory."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        if self.directory and os.path.exists(self._path(key)):
+            try:
+                with open(self._path(key), 'rb') as file:
+                    data = file.read()
+                result = pickle.loads(data)
+            except Exception:
+                # Truncated file, or pickled classes that were renamed or moved: drop it (a miss)
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+                return None
+            with self._lock:
+                self._store(key, result, len(data))
+                self.disk_hits += 1
+            return result
+        return None
+
+    def put(self, key, result):
+        data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._store(key, result, len(data))
+        if self.directory:
+            # Write then rename, so a concurrent reader never sees a partial file
+            temporary = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporary, 'wb') as file:
+                file.write(data)
+            os.replace(temporary, self._path(key))
+
+    def get_or_compute(self, params, compute):
+        """compute(params) through the cache."""
+        key = params_key(params)
+        result = self.get(key)
+        if result is None:
+            with self._lock:
+                self.misses += 1
+            result = compute(params)
+            self.put(key, result)
+        return result
+
+    def clear(self):
+        """Empties the memory tier (the directory tier is kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Counters and occupancy of the cache."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+# Shared by every session of the process; BEAM_CACHE_MB sets the memory
+# ceiling and BEAM_CACHE_DIR enables the directory tier
+RESULT_CACHE = ResultCache(max_bytes=int(float(os.environ.get('BEAM_CACHE_MB', 64)) * 2**20),
+                           directory=os.environ.get('BEAM_CACHE_DIR') or None)
+
+@timed()
+def cached_beam_diagrams(params):
+    """calculate_beam_diagrams through the process-wide RESULT_CACHE."""
+    return RESULT_CACHE.get_or_compute(params, calculate_beam_diagrams)
@@ -0,0 +1,332 @@
+"""
+Catalog of every dice-generated beam problem with its answer key.
+
+interpret_dice_results only reads a few features of each dice group (the
+first die of a support group, sums, and the unordered span pair), so the
+generator has 2 x 11 x 11 x 16 x 16 x 21 x 2 = 2,601,984 distinct beams (EI
+does not change reactions, V or M). Each one gets an integer code in mixed
+radix over those groups. build_catalog solves all of them (or a stratified
+sample) with the vectorized batch solver in a process pool and stores the
+reactions, exact V/M extrema and breakpoints in a SQLite table indexed for
+range queries, so the app can look up a roll instead of solving it and an
+instructor can ask for e.g. every problem with 40 <= |M|max <= 60
+(V_abs_max and M_abs_max are stored as magnitudes, never negative).
+Catalogs written with another CATALOG_VERSION are ignored until rebuilt.
+
+Usage:
+    python -m apps.beam_diagrams.beam_catalog build [--sample N] [--workers W]
+    python -m apps.beam_diagrams.beam_catalog query --range M_abs_max 40 60
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .beam_batch import BeamBatch, REACTION_NAMES, batch_breakpoints, batch_extrema, solve_batch_reactions
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dice_catalog.sqlite')
+# Bumped whenever the stored columns change meaning (2: *_abs_max are magnitudes)
+CATALOG_VERSION = 2
+
+DICE_GROUPS = ('support_left', 'length', 'point_load_p_pos', 'point_load_p_mag',
+               'dist_load_w_mag', 'dist_load_w_span', 'support_right')
+RADICES = (2, 11, 11, 16, 16, 21, 2)
+N_OUTCOMES = int(np.prod(RADICES))
+
+# Unordered (low, high) pairs of the two span dice, in code order
+_SPAN_PAIRS = np.array([(i, j) for i in range(1, 7) for j in range(i, 7)])
+
+_EXTREMA_COLUMNS = [f'{prefix}{d}_{k}' for d in ('V', 'M') for k in ('max', 'min', 'abs_max')
+                    for prefix in ('', 'x_')]
+COLUMNS = (['code', 'probability', 'support_left', 'support_right', 'length', 'p_magnitude',
+            'p_position', 'w_magnitude', 'w_start', 'w_end', 'solved']
+           + list(REACTION_NAMES) + _EXTREMA_COLUMNS + ['breakpoints'])
+
+def _sum_probabilities(n_dice):
+    """Probability of every sum of n_dice dice, from the lowest sum up."""
+    p = np.ones(1)
+    for _ in range(n_dice):
+        p = np.convolve(p, np.full(6, 1 / 6))
+    return p
+
+_GROUP_PROBABILITIES = (
+    np.array([0.5, 0.5]),
+    _sum_probabilities(2),
+    _sum_probabilities(2),
+    _sum_probabilities(3),
+    _sum_probabilities(3),
+    np.where(_SPAN_PAIRS[:, 0] == _SPAN_PAIRS[:, 1], 1 / 36, 2 / 36),
+    np.array([0.5, 0.5]),
+)
+
+def encode_digits(digits):
+    """Codes of an (N, 7) array of per-group outcome indices."""
+    codes = np.zeros(len(digits), dtype=np.int64)
+    for i, radix in enumerate(RADICES):
+        codes = codes * radix + digits[:, i]
+    return codes
+
+def decode_digits(codes):
+    """Inverse of encode_digits."""
+    codes = np.asarray(codes, dtype=np.int64)
+    digits = np.zeros((len(codes), len(RADICES)), dtype=np.int64)
+    for i in range(len(RADICES) - 1, -1, -1):
+        codes, digits[:, i] = np.divmod(codes, RADICES[i])
+    return digits
+
+def outcome_code(dice_values):
+    """Catalog code of a roll, in the dice_values format of interpret_dice_results."""
+    low, high = sorted(dice_values['dist_load_w_span'][:2])
+    span = np.flatnonzero((_SPAN_PAIRS[:, 0] == low) & (_SPAN_PAIRS[:, 1] == high))[0]
+    digits = [
+        0 if dice_values['support_left'][0] <= 3 else 1,
+        sum(dice_values['length']) - 2,
+        sum(dice_values['point_load_p_pos']) - 2,
+        sum(dice_values['point_load_p_mag']) - 3,
+        sum(dice_values['dist_load_w_mag']) - 3,
+        span,
+        0 if dice_values['support_right'][0] <= 3 else 1,
+    ]
+    return int(encode_digits(np.array([digits]))[0])
+
+def representative_dice(code):
+    """One roll (dice_values dict) that produces the beam with this code."""
+    d = decode_digits([code])[0]
+
+    def dice_for_sum(total, n):
+        dice = [1] * n
+        for i in range(n):
+            dice[i] += min(5, total - sum(dice))
+        return dice
+
+    return {
+        'support_left': [1 + 3 * int(d[0])] * 3,
+        'length': dice_for_sum(d[1] + 2, 2),
+        'point_load_p_pos': dice_for_sum(d[2] + 2, 2),
+        'point_load_p_mag': dice_for_sum(d[3] + 3, 3),
+        'dist_load_w_mag': dice_for_sum(d[4] + 3, 3),
+        'dist_load_w_span': [int(v) for v in _SPAN_PAIRS[d[5]]],
+        'support_right': [1 + 3 * int(d[6])] * 3,
+        'EI': [1, 1, 1, 1],
+    }
+
+def decode_outcomes(codes):
+    """
+    Beam parameters of many codes as arrays, following interpret_dice_results
+    operation by operation so the values are bit-identical to a live roll.
+    """
+    d = decode_digits(codes)
+    L = (d[:, 1] + 2) / 2.0
+    start_fraction = _SPAN_PAIRS[d[:, 5], 0] / 6.0
+    end_fraction = _SPAN_PAIRS[d[:, 5], 1] / 6.0
+    tie = start_fraction == end_fraction
+    end_fraction = np.where(tie, np.minimum(1.0, start_fraction + 1 / 6.0), end_fraction)
+    probability = np.ones(len(d))
+    for i, p in enumerate(_GROUP_PROBABILITIES):
+        probability *= p[d[:, i]]
+    return {
+        'code': np.asarray(codes, dtype=np.int64),
+        'probability': probability,
+        'support_left': np.where(d[:, 0] == 0, 'Empotrado', 'Simple'),
+        'support_right': np.where(d[:, 6] == 0, 'Simple', 'Libre'),
+        'length': L,
+        'p_magnitude': (d[:, 3] + 3).astype(float),
+        'p_position': (d[:, 2] + 2) / 12.0 * L,
+        'w_magnitude': (d[:, 4] + 3).astype(float),
+        'w_start': start_fraction * L,
+        'w_end': end_fraction * L,
+    }
+
+def solve_outcomes(codes):
+    """Answer keys of many codes at once; one column array per entry of COLUMNS."""
+    rows = decode_outcomes(codes)
+    batch = BeamBatch(
+        lengths=rows['length'],
+        support_left=rows['support_left'],
+        support_right=rows['support_right'],
+        point_positions=rows['p_position'][:, None],
+        point_magnitudes=rows['p_magnitude'][:, None],
+        dist_starts=rows['w_start'][:, None],
+        dist_ends=rows['w_end'][:, None],
+        dist_start_magnitudes=rows['w_magnitude'][:, None],
+        dist_end_magnitudes=rows['w_magnitude'][:, None],
+    )
+    reactions, solved = solve_batch_reactions(batch)
+    rows['solved'] = solved
+    rows.update({name: reactions[:, i] for i, name in enumerate(REACTION_NAMES)})
+    rows.update(batch_extrema(batch, reactions))
+
+    bp = batch_breakpoints(batch)
+    distinct = np.ones_like(bp, dtype=bool)
+    distinct[:, 1:] = bp[:, 1:] > bp[:, :-1]
+    rows['breakpoints'] = [json.dumps(np.round(r[m], 6).tolist()) for r, m in zip(bp, distinct)]
+    return rows
+
+def outcome_codes(sample_size=None, seed=0):
+    """
+    Codes to solve: every outcome, or a stratified sample of about
+    `sample_size` with the same share for each (supports, length) stratum.
+    """
+    if sample_size is None or sample_size >= N_OUTCOMES:
+        return np.arange(N_OUTCOMES, dtype=np.int64)
+    strata = np.array([(left, length, right) for left in range(RADICES[0])
+                       for length in range(RADICES[1]) for right in range(RADICES[6])])
+    per_stratum = max(1, -(-sample_size // len(strata)))
+    rng = np.random.default_rng(seed)
+    digits = np.column_stack([rng.integers(0, radix, len(strata) * per_stratum) for radix in RADICES])
+    digits[:, [0, 1, 6]] = np.repeat(strata, per_stratum, axis=0)
+    return np.unique(encode_digits(digits))
+
+def build_catalog(path=CATALOG_PATH, sample_size=None, workers=None, chunk_size=50000, seed=0):
+    """
+    Solves the outcomes in parallel and writes them to a SQLite catalog at
+    `path` (replacing any previous one). Returns the number of rows written.
+    """
+    codes = outcome_codes(sample_size, seed)
+    chunks = [codes[i:i + chunk_size] for i in range(0, len(codes), chunk_size)]
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+
+    if os.path.exists(path):
+        os.remove(path)
+    connection = sqlite3.connect(path)
+    try:
+        text_columns = {'support_left', 'support_right', 'breakpoints'}
+        definitions = ', '.join(
+            f"{name} {'INTEGER PRIMARY KEY' if name == 'code' else 'INTEGER' if name == 'solved' else 'TEXT' if name in text_columns else 'REAL'}"
+            for name in COLUMNS)
+        connection.execute(f"CREATE TABLE outcomes ({definitions})")
+        connection.execute("CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT)")
+        insert = f"INSERT INTO outcomes VALUES ({', '.join('?' * len(COLUMNS))})"
+
+        def store(rows):
+            columns = [rows[name].tolist() if isinstance(rows[name], np.ndarray) else rows[name]
+                       for name in COLUMNS]
+            connection.executemany(insert, zip(*columns))
+
+        if workers == 1:
+            for chunk in chunks:
+                store(solve_outcomes(chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for rows in executor.map(solve_outcomes, chunks):
+                    store(rows)
+
+        for name in ('M_abs_max', 'V_abs_max', 'M_max', 'M_min'):
+            connection.execute(f"CREATE INDEX idx_{name} ON outcomes ({name})")
+        connection.executemany("INSERT INTO metadata VALUES (?, ?)", [
+            ('version', str(CATALOG_VERSION)),
+            ('mode', 'exhaustive' if len(codes) == N_OUTCOMES else 'stratified'),
+            ('n_rows', str(len(codes))),
+            ('build_seconds', f"{time.perf_counter() - start:.2f}"),
+        ])
+        connection.commit()
+    finally:
+        connection.close()
+    return len(codes)
+
+def _catalog_version(connection):
+    """CATALOG_VERSION a catalog was built with (None for catalogs older than the field)."""
+    try:
+        row = connection.execute("SELECT value FROM metadata WHERE key = 'version'").fetchone()
+    except sqlite3.DatabaseError:
+        return None
+    return int(row[0]) if row else None
+
+def _row_to_entry(row):
+    values = dict(zip(COLUMNS, row))
+    return {
+        'code': values['code'],
+        'probability': values['probability'],
+        'solved': bool(values['solved']),
+        'params': {
+            'support_left': values['support_left'],
+            'length': values['length'],
+            'point_load_p': {'magnitude': values['p_magnitude'], 'position': values['p_position']},
+            'dist_load_w': {'magnitude': values['w_magnitude'], 'start': values['w_start'], 'end': values['w_end']},
+            'support_right': values['support_right'],
+        },
+        'reactions': {name: values[name] for name in REACTION_NAMES},
+        'extrema': {name: values[name] for name in _EXTREMA_COLUMNS},
+        'breakpoints': json.loads(values['breakpoints']),
+    }
+
+def lookup_outcome(dice_values, path=CATALOG_PATH):
+    """
+    Catalog entry of a roll, or None when there is no current catalog (none
+    or an outdated CATALOG_VERSION) or the outcome was not sampled. The
+    entry's 'params' include EI from the roll.
+    """
+    if not os.path.exists(path):
+        return None
+    connection = sqlite3.connect(path)
+    try:
+        if _catalog_version(connection) != CATALOG_VERSION:
+            return None
+        row = connection.execute("SELECT * FROM outcomes WHERE code = ?", (outcome_code(dice_values),)).fetchone()
+    finally:
+        connection.close()
+    if row is None:
+        return None
+    entry = _row_to_entry(row)
+    entry['params']['EI'] = float(sum(dice_values['EI']))
+    return entry
+
+def query_catalog(ranges, path=CATALOG_PATH, solved_only=True, limit=100):
+    """
+    Entries whose columns fall inside the given ranges, e.g.
+    query_catalog({'M_abs_max': (40, 60)}). Columns must be in COLUMNS.
+    """
+    clauses, values = [], []
+    for name, (low, high) in ranges.items():
+        if name not in COLUMNS:
+            raise ValueError(f"Columna desconocida: {name}")
+        clauses.append(f"{name} BETWEEN ? AND ?")
+        values.extend([low, high])
+    if solved_only:
+        clauses.append("solved = 1")
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    connection = sqlite3.connect(path)
+    try:
+        if _catalog_version(connection) != CATALOG_VERSION:
+            raise ValueError(f"El catálogo {path} es de otra versión; vuelva a generarlo con "
+                             f"'python -m apps.beam_diagrams.beam_catalog build'")
+        rows = connection.execute(f"SELECT * FROM outcomes{where} ORDER BY code LIMIT ?", values + [limit]).fetchall()
+    finally:
+        connection.close()
+    return [_row_to_entry(row) for row in rows]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Catálogo de problemas de vigas generados con dados.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="Resuelve los resultados y escribe el catálogo.")
+    build.add_argument('--output', default=CATALOG_PATH)
+    build.add_argument('--sample', type=int, default=None, help="Tamaño de la muestra estratificada (por defecto, todos).")
+    build.add_argument('--workers', type=int, default=None)
+    build.add_argument('--seed', type=int, default=0)
+    query = commands.add_parser('query', help="Busca problemas por rango de resultados.")
+    query.add_argument('--catalog', default=CATALOG_PATH)
+    query.add_argument('--range', nargs=3, action='append', default=[], metavar=('COLUMNA', 'MIN', 'MAX'))
+    query.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        n = build_catalog(args.output, args.sample, args.workers, seed=args.seed)
+        print(f"{n} problemas en {time.perf_counter() - start:.1f} s -> {args.output}")
+    else:
+        ranges = {name: (float(low), float(high)) for name, low, high in args.range}
+        try:
+            entries = query_catalog(ranges, args.catalog, limit=args.limit)
+        except ValueError as e:
+            parser.error(str(e))
+        for entry in entries:
+            print(json.dumps(entry))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Continuous beams over any number of spans.
+
+The spans are laid end to end on supports at x_0 = 0 < x_1 < ... < x_n, and
+the loads use global positions. The support reactions come from the banded
+direct stiffness solver, whose cost is linear in the number of spans; the
+interior reactions then enter V(x) and M(x) as singularity terms like any
+other load, so the diagrams and the deflection of every span are a single
+PiecewisePoly each, evaluated in one vectorized call.
+
+Slope and deflection integrate EI·y'' = M and restart at every support
+from the exact nodal rotations and deflections of the stiffness solution,
+so round-off does not build up along hundreds of spans as it would in one
+cumulative integral from x = 0.
+"""
+
+import numpy as np
+
+from .beam_loads import BeamLoads
+from .beam_piecewise import PiecewisePoly, adaptive_samples
+from .beam_stiffness import solve_beam_stiffness
+
+def support_positions(span_lengths):
+    """Positions of the n + 1 supports of spans laid end to end."""
+    return np.concatenate(([0.0], np.cumsum(np.asarray(span_lengths, dtype=float))))
+
+def calculate_continuous_beam(params):
+    """
+    Reactions, V, M, slope and deflection of a continuous beam.
+
+    `params` holds 'spans' (span lengths), 'supports' (one support type per
+    span end, len(spans) + 1 entries), the load lists of BeamLoads with
+    global positions and 'EI'. Reactions are returned per support as 'R_i'
+    (upwards) and, for clamped supports, 'M_i' (counterclockwise), numbered
+    from 1. Raises ValueError for a mechanism or inconsistent input.
+    """
+    spans = np.asarray(params['spans'], dtype=float)
+    supports = list(params['supports'])
+    if len(spans) == 0 or np.any(spans <= 0):
+        raise ValueError("Todas las luces deben ser positivas.")
+    if len(supports) != len(spans) + 1:
+        raise ValueError("Se requiere un apoyo por cada extremo de tramo (número de tramos + 1).")
+    x_supports = support_positions(spans)
+    L = float(x_supports[-1])
+    loads = BeamLoads.from_params(params).clamped(L)
+    EI = float(params.get('EI') or 1.0)
+    support_map = dict(zip(x_supports.tolist(), supports))
+
+    solution = solve_beam_stiffness(L, loads, support_map, EI)
+    forces = np.array([solution['reactions'].get(x, (0.0, 0.0))[0] for x in x_supports.tolist()])
+    moments = np.array([solution['reactions'].get(x, (0.0, 0.0))[1] for x in x_supports.tolist()])
+
+    # Reactions are upward forces and counterclockwise couples: the opposite sign of the loads
+    shear_terms = [(-R, x, 0) for x, R in zip(x_supports, forces) if R != 0] + loads.shear_terms()
+    moment_terms = [(-c / (n + 1), a, n + 1) for c, a, n in shear_terms]
+    moment_terms += loads.moment_terms() + [(-M, x, 0) for x, M in zip(x_supports, moments) if M != 0]
+
+    # Segments that start at a mesh node restart the integrals from its exact values
+    nodes = solution['nodes']
+    breakpoints = np.union1d(nodes, loads.positions())
+    shear_poly = PiecewisePoly.from_singularity_terms(shear_terms, 0.0, L, breakpoints)
+    moment_poly = PiecewisePoly.from_singularity_terms(moment_terms, 0.0, L, breakpoints)
+    curvature = PiecewisePoly(moment_poly.breakpoints, moment_poly.coefficients / EI)
+    starts = curvature.breakpoints[:-1]
+    index = np.minimum(np.searchsorted(nodes, starts), len(nodes) - 1)
+    restart = nodes[index] == starts
+    slope_poly = curvature.integral(initial=np.where(restart, solution['rotations'][index], np.nan))
+    deflection_poly = slope_poly.integral(initial=np.where(restart, solution['deflections'][index], np.nan))
+
+    extrema = {'shear': shear_poly.extrema(), 'moment': moment_poly.extrema(),
+               'deflection': deflection_poly.extrema()}
+    x_vals, (shear_values, moment_values, slope_values, deflection_values) = adaptive_samples(
+        [shear_poly, moment_poly, slope_poly, deflection_poly])
+    reactions = {}
+    for i, (R, M, support) in enumerate(zip(forces, moments, supports), 1):
+        if support != 'Libre':
+            reactions[f'R_{i}'] = float(R)
+        if support == 'Empotrado':
+            reactions[f'M_{i}'] = float(M)
+    return {
+        'support_positions': x_supports,
+        'reactions': reactions,
+        'x_values': x_vals,
+        'shear_values': shear_values,
+        'moment_values': moment_values,
+        'slope_values': slope_values,
+        'deflection_values': deflection_values,
+        'shear_poly': shear_poly,
+        'moment_poly': moment_poly,
+        'slope_poly': slope_poly,
+        'deflection_poly': deflection_poly,
+        'extrema': extrema,
+    }
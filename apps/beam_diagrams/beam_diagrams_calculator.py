@@ -1,8 +1,12 @@
 import numpy as np
-import sympy
-from sympy import symbols, integrate, Piecewise, lambdify, DiracDelta, solve, Eq, Function, Heaviside, N
 import random
 
+from .beam_loads import BeamLoads
+from .beam_piecewise import PiecewisePoly, adaptive_samples
+from .beam_report import BeamReport
+from .beam_stiffness import solve_beam_stiffness
+from ..profiling import timed
+
 # --- Dice Rolling and Interpretation ---
 def roll_dice(num_dice=1):
     """Simulates rolling a specified number of dice."""
@@ -52,308 +56,210 @@ def interpret_dice_results(dice_values):
 
     return params
 
-# --- Core Calculation Function ---
-def calculate_beam_diagrams(params):
-    """Calculates reactions, shear, and moment diagrams using Sympy."""
-    L = params['length']
-    EI = params['EI'] # Although EI is passed, it's not used in V & M calculation itself
-    support_left = params['support_left']
-    support_right = params['support_right']
-    p_load = params['point_load_p']
-    w_load = params['dist_load_w']
-
-    # Ensure load positions are within beam length
-    p_load['position'] = min(max(0, p_load['position']), L)
-    w_load['start'] = min(max(0, w_load['start']), L)
-    w_load['end'] = min(max(w_load['start'], w_load['end']), L)
-
-
-    x = symbols('x')
-    R_A, R_B, M_A, M_B = symbols('R_A R_B M_A M_B') # Potential reactions
-
-    calculation_steps = []
-    calculation_steps.append(f"**1. Parámetros de Entrada:**")
-    calculation_steps.append(f"- Longitud (L): {L}")
-    calculation_steps.append(f"- Apoyo Izquierdo: {support_left}")
-    calculation_steps.append(f"- Apoyo Derecho: {support_right}")
-    calculation_steps.append(f"- Carga Puntual P: {p_load['magnitude']} @ x={p_load['position']:.2f}")
-    calculation_steps.append(f"- Carga Distribuida w: {w_load['magnitude']} de x={w_load['start']:.2f} a x={w_load['end']:.2f}")
-    # calculation_steps.append(f"- Rigidez (EI): {EI}") # EI not directly used for V, M
-
-    # --- Define Loading Function w(x) ---
-    w_expr = Piecewise(
-        (w_load['magnitude'], (x >= w_load['start']) & (x <= w_load['end'])),
-        (0, True)
-    )
-
-    calculation_steps.append(f"**2. Función de Carga Distribuida w(x):**")
-    calculation_steps.append(f"w(x) = {sympy.latex(w_expr)}")
-    calculation_steps.append(f"Carga puntual P = {p_load['magnitude']} en x = {p_load['position']:.2f}")
-
+# --- Singularity Functions ---
+# Each load or reaction is stored as a singularity term (c, a, n) = c * <x - a>^n.
+# V(x) and M(x) are plain sums of such terms (M from dM/dx = -V plus the jumps of
+# concentrated moments) and are turned into PiecewisePoly objects for evaluation.
 
-    # --- Calculate Reactions ---
-    reactions = {}
+# --- Reactions ---
+def reaction_unknowns(support_left, support_right):
+    """Names of the reactions provided by the supports."""
     unknowns = []
-    equations = []
-    boundary_conditions = {} # Store known reaction values based on supports
-
-    # Define equilibrium equations (symbolically)
-    eq_Fy_sym = R_A + R_B - p_load['magnitude'] - integrate(w_expr, (x, 0, L))
-    eq_MA_sym = M_A + R_B * L + M_B - p_load['magnitude'] * p_load['position'] - integrate(w_expr * x, (x, 0, L))
-
-    # Left Support Conditions
     if support_left == 'Simple':
-        boundary_conditions[M_A] = 0
-        unknowns.append(R_A)
+        unknowns.append('R_A')
     elif support_left == 'Empotrado':
-        # Deflection and slope are zero, but for V&M we need R_A, M_A
-        unknowns.extend([R_A, M_A])
-    else: # Free - Not physically realistic for stable left support in typical problems
-          # For calculation purposes, assume R_A=0, M_A=0 if truly free
-        boundary_conditions[R_A] = 0
-        boundary_conditions[M_A] = 0
-
-
-    # Right Support Conditions
+        unknowns.extend(['R_A', 'M_A'])
     if support_right == 'Simple':
-        boundary_conditions[M_B] = 0
-        unknowns.append(R_B)
+        unknowns.append('R_B')
     elif support_right == 'Empotrado':
-        unknowns.extend([R_B, M_B])
-    elif support_right == 'Libre':
-        boundary_conditions[R_B] = 0
-        boundary_conditions[M_B] = 0
-
-    # Substitute known boundary conditions into equilibrium equations
-    eq_Fy = eq_Fy_sym.subs(boundary_conditions)
-    eq_MA = eq_MA_sym.subs(boundary_conditions)
-
-    # Add equations to the list to be solved
-    if R_A in unknowns or R_B in unknowns: # Need Fy if any force is unknown
-        equations.append(eq_Fy)
-    if M_A in unknowns or M_B in unknowns or len(unknowns) > 1 : # Need MA if any moment is unknown, or if >1 force unknown
-        equations.append(eq_MA)
+        unknowns.extend(['R_B', 'M_B'])
+    return unknowns
+
+def solve_reactions(L, support_left, support_right, total_force, total_moment):
+    """
+    Solves the support reactions from static equilibrium.
+
+    The equations are ΣFy: R_A + R_B = F and ΣM_A: M_A + R_B·L + M_B = M_F, with
+    moments taken counterclockwise-positive. Raises ValueError when the beam is
+    statically indeterminate.
+    """
+    # Coefficients of each reaction in [ΣFy, ΣM_A]
+    coefficients = {'R_A': (1.0, 0.0), 'M_A': (0.0, 1.0), 'R_B': (1.0, L), 'M_B': (0.0, 1.0)}
+    unknowns = reaction_unknowns(support_left, support_right)
+
+    reactions = {'R_A': 0.0, 'R_B': 0.0, 'M_A': 0.0, 'M_B': 0.0}
+    if not unknowns:
+        return reactions, unknowns
+
+    rows = []
+    if 'R_A' in unknowns or 'R_B' in unknowns: # Need Fy if any force is unknown
+        rows.append(0)
+    if 'M_A' in unknowns or 'M_B' in unknowns or len(unknowns) > 1: # Need MA for moments or >1 unknown
+        rows.append(1)
+    if len(rows) < len(unknowns):
+        raise ValueError(f"Sistema indeterminado o inestable. Incógnitas: {len(unknowns)}, Ecuaciones: {len(rows)}")
+
+    A = np.array([[coefficients[u][r] for u in unknowns] for r in rows])
+    b = np.array([total_force, total_moment])[rows]
+    solution = np.linalg.solve(A, b)
+    reactions.update({u: float(v) for u, v in zip(unknowns, solution)})
+    return reactions, unknowns
+
+def solve_indeterminate_reactions(L, loads, support_left, support_right, EI=1.0):
+    """
+    Reactions of a statically indeterminate beam (Empotrado–Simple,
+    Simple–Empotrado, Empotrado–Empotrado) with the direct stiffness solver.
+    For a constant EI the reactions do not depend on its value.
+    """
+    solution = solve_beam_stiffness(L, loads, {0.0: support_left, L: support_right}, EI)
+    R_A, M_A = solution['reactions'].get(0.0, (0.0, 0.0))
+    R_B, M_B = solution['reactions'].get(float(L), (0.0, 0.0))
+    return {'R_A': R_A, 'R_B': R_B, 'M_A': M_A, 'M_B': M_B}
+
+def build_shear_terms(L, reactions, loads):
+    """Singularity terms of V(x) (positive loads act downward, V = -dM/dx)."""
+    terms = [(-reactions['R_A'], 0.0, 0)]
+    terms.extend(loads.shear_terms())
+    terms.append((-reactions['R_B'], L, 0))
+    return terms
+
+def build_moment_terms(L, reactions, shear_terms, loads):
+    """Singularity terms of M(x) = -M_A - ∫V dx - ΣC, closed by M_B at x = L."""
+    terms = [(-reactions['M_A'], 0.0, 0)]
+    terms.extend((-c / (n + 1), a, n + 1) for c, a, n in shear_terms)
+    terms.extend(loads.moment_terms())
+    terms.append((-reactions['M_B'], L, 0))
+    return terms
+
+# --- Slope and Deflection ---
+def solve_deflection(moment_poly, EI, support_left, support_right):
+    """
+    Slope θ(x) and deflection y(x) from EI·y'' = M(x), with y positive upwards.
+
+    θ and y are two cumulative integrals of the moment polynomial on its own
+    breakpoints; the integration constants come from the support conditions
+    (y = 0 at a 'Simple' support, y = θ = 0 at an 'Empotrado' one). Returns
+    (slope_poly, deflection_poly, conditions), or None when the supports do
+    not fix both constants (the beam is a mechanism).
+    """
+    curvature = PiecewisePoly(moment_poly.breakpoints, moment_poly.coefficients / EI)
+    slope_0 = curvature.integral()
+    deflection_0 = slope_0.integral()
+
+    # y(x) = y_0(x) + C1·x + C2 and θ(x) = θ_0(x) + C1
+    rows, rhs, conditions = [], [], []
+    for x0, support in ((moment_poly.breakpoints[0], support_left), (moment_poly.breakpoints[-1], support_right)):
+        if support in ('Simple', 'Empotrado'):
+            rows.append([x0, 1.0])
+            rhs.append(-float(deflection_0(x0)))
+            conditions.append(f"y({x0:g}) = 0")
+        if support == 'Empotrado':
+            rows.append([1.0, 0.0])
+            rhs.append(-float(slope_0(x0)))
+            conditions.append(f"θ({x0:g}) = 0")
+    if len(rows) < 2 or np.linalg.matrix_rank(np.array(rows)) < 2:
+        return None
+    # More conditions than constants only for indeterminate beams, where they are consistent
+    (C1, C2), *_ = np.linalg.lstsq(np.array(rows), np.array(rhs), rcond=None)
+    slope_poly = curvature.integral(initial=C1)
+    deflection_poly = slope_poly.integral(initial=C2)
+    return slope_poly, deflection_poly, conditions
+
+class BeamResults(dict):
+    """
+    Results dict of calculate_beam_diagrams. The memoria de cálculo keys it
+    used to carry at the top level ('calculation_steps', 'tramos_equations',
+    'shear_eq', 'moment_eq') are still readable, as results[key] or
+    results.get(key); they are taken from the lazy 'report' on access, so
+    they cost nothing until then. The equations are LaTeX strings.
+    """
+    REPORT_KEYS = ('calculation_steps', 'tramos_equations', 'shear_eq', 'moment_eq')
+
+    def __missing__(self, key):
+        if key in self.REPORT_KEYS and 'report' in self:
+            return getattr(self['report'], key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
 
+# --- Core Calculation Function ---
+@timed()
+def calculate_beam_diagrams(params):
+    """
+    Calculates reactions, shear, and moment diagrams with singularity functions in NumPy.
+
+    The memoria de cálculo is returned as a BeamReport under 'report': its
+    steps and equations are only formatted when they are read.
+    """
+    L = float(params['length'])
+    loads = BeamLoads.from_params(params).clamped(L)
+    support_left = params['support_left']
+    support_right = params['support_right']
 
-    calculation_steps.append("**3. Cálculo de Reacciones:**")
-    # Solve the system
-    if unknowns:
-        try:
-            # Ensure we have enough equations for the unknowns
-            if len(equations) < len(unknowns):
-                 # This might happen in statically indeterminate cases if not handled by BCs
-                 # Or if the support combination is unstable (e.g., Simple-Free)
-                 raise ValueError(f"Sistema indeterminado o inestable. Incógnitas: {len(unknowns)}, Ecuaciones: {len(equations)}")
-
-            sol = solve(equations, unknowns, dict=True) # Request dictionary output
-
-            # Check if solve returned a list (multiple solutions) or empty list (no solution)
-            if isinstance(sol, list):
-                if not sol: # Empty list means no solution found
-                    raise ValueError("No se encontró solución para las reacciones.")
-                sol = sol[0] # Take the first solution if multiple exist (shouldn't for determinate beams)
-
-
-            if not sol or not isinstance(sol, dict):
-                 raise ValueError("No se pudo resolver el sistema de ecuaciones para las reacciones.")
-
-            reactions = {**boundary_conditions, **sol} # Combine known and solved reactions
-            calculation_steps.append("Reacciones calculadas:")
-            for r, val in reactions.items():
-                 calculation_steps.append(f"- `{sympy.pretty(r)} = {N(val):.3f}`")
-
-        except Exception as e:
-            calculation_steps.append(f"Error al calcular reacciones: {e}")
-            # Provide default zero values for all potential reactions on error
-            reactions = {R_A: 0, R_B: 0, M_A: 0, M_B: 0}
-            # Update boundary conditions based on defaults if they were supposed to be calculated
-            for unk in unknowns:
-                if unk not in boundary_conditions:
-                    reactions[unk] = 0
-            calculation_steps.append("Usando reacciones por defecto (0).")
-    else:
-         calculation_steps.append("No hay incógnitas de reacción (viga estáticamente determinada por condiciones de contorno o libre).")
-         reactions = boundary_conditions # All reactions were determined by BCs
-
-    # Ensure all reaction values in the 'reactions' dict are numerical for substitution
-    reactions_numeric = {k: N(v) for k, v in reactions.items()}
-
-
-    # --- Define Shear V(x) using NUMERICAL reaction values ---
-    # V(x) = -R_A + integral(w(x)) dx + P*Heaviside(x-p_pos) + R_B*Heaviside(x-L)
-    # Note: Sign convention: positive V is downward on left face, upward on right face
-    V_expr_numeric = -reactions_numeric.get(R_A, 0)  # Left reaction (negative because upward reaction creates downward shear)
-    
-    # Add distributed load effect (positive w is downward)
-    if w_load['magnitude'] != 0:
-        # Integrate w(x) from 0 to x, but only within the loaded region
-        w_integral = integrate(w_expr, (x, 0, x))
-        V_expr_numeric = V_expr_numeric + w_integral
-
-    # Add point load effect (positive P is downward)
-    if p_load['magnitude'] != 0:
-        V_expr_numeric = V_expr_numeric + p_load['magnitude'] * Heaviside(x - p_load['position'])
-
-    # Add right reaction (if not free end)
-    if support_right != 'Libre':
-        V_expr_numeric = V_expr_numeric - reactions_numeric.get(R_B, 0) * Heaviside(x - L)
-
-    calculation_steps.append("**4. Ecuación de Fuerza Cortante V(x):**")
-    # Display the symbolic version
-    V_expr_symbolic = -reactions.get(R_A, 0)
-    if w_load['magnitude'] != 0:
-        V_expr_symbolic = V_expr_symbolic + integrate(w_expr, (x, 0, x))
-    if p_load['magnitude'] != 0:
-        V_expr_symbolic = V_expr_symbolic + p_load['magnitude'] * Heaviside(x - p_load['position'])
-    if support_right != 'Libre':
-        V_expr_symbolic = V_expr_symbolic - reactions.get(R_B, 0) * Heaviside(x - L)
-    calculation_steps.append(f"V(x) = {sympy.latex(V_expr_symbolic)}")
-
-    # --- Define Moment M(x) using NUMERICAL reaction values ---
-    # M(x) = M_A - integral(V(x)) dx
-    # Note: Sign convention: positive M is clockwise on left face, counterclockwise on right face
-    M_expr_numeric = reactions_numeric.get(M_A, 0) - integrate(V_expr_numeric, (x, 0, x))
-
-    calculation_steps.append("**5. Ecuación de Momento Flector M(x):**")
-    # Display the symbolic version
-    M_expr_symbolic = reactions.get(M_A, 0) - integrate(V_expr_symbolic, (x, 0, x))
-    calculation_steps.append(f"M(x) = {sympy.latex(M_expr_symbolic)}")
-
-
-    # --- Numerical Evaluation ---
-    x_vals = np.linspace(0, float(L), 500) # Ensure L is float for linspace
-    shear_values = []
-    moment_values = []
-
-    calculation_steps.append("**6. Evaluación Numérica:**")
+    # --- Reactions ---
+    total_force, total_moment = loads.resultants()
+    EI = float(params.get('EI') or 0.0)
+    unknowns = reaction_unknowns(support_left, support_right)
+    reaction_error = None
     try:
-        # Lambdify the expressions that used NUMERICAL reaction values
-        V_func = lambdify(x, V_expr_numeric, modules=['numpy', {'Heaviside': lambda x: np.heaviside(x, 1)}])
-        M_func = lambdify(x, M_expr_numeric, modules=['numpy', {'Heaviside': lambda x: np.heaviside(x, 1)}])
-
-        shear_values = V_func(x_vals)
-        moment_values = M_func(x_vals)
-
-        # Ensure results are numpy arrays of floats
-        # Ensure results are numpy arrays of floats, handle potential complex numbers if any intermediate step produced them
-        shear_values = np.array(shear_values, dtype=float)
-        moment_values = np.array(moment_values, dtype=float)
-
-        calculation_steps.append("- Evaluación numérica completada usando lambdify.")
-
-    except Exception as e_lambdify:
-        calculation_steps.append(f"- Falló Lambdify ({e_lambdify}), volviendo a la sustitución elemento por elemento.")
-        shear_values = [] # Reset lists
-        moment_values = []
-        # Fallback to element-wise substitution using the NUMERIC expressions
-        for x_val in x_vals:
-            try:
-                # Substitute into the expression with numerical reactions
-                v_val = V_expr_numeric.subs(x, x_val)
-                shear_values.append(float(N(v_val))) # Ensure float conversion
-            except (TypeError, ValueError, AttributeError) as eval_err_v: # Added AttributeError
-                 calculation_steps.append(f"- Advertencia: No se pudo evaluar V({x_val:.2f}) por sustitución: {eval_err_v}. Usando 0.")
-                 shear_values.append(0.0) # Default to 0 on error
-            try:
-                # Substitute into the expression with numerical reactions
-                m_val = M_expr_numeric.subs(x, x_val)
-                moment_values.append(float(N(m_val))) # Ensure float conversion
-            except (TypeError, ValueError, AttributeError) as eval_err_m: # Added AttributeError
-                 calculation_steps.append(f"- Advertencia: No se pudo evaluar M({x_val:.2f}) por sustitución: {eval_err_m}. Usando 0.")
-                 moment_values.append(0.0) # Default to 0 on error
-
-        # Ensure conversion to numpy arrays even in fallback
-        shear_values = np.array(shear_values, dtype=float)
-        moment_values = np.array(moment_values, dtype=float)
-        # Check for NaNs which might indicate issues
-        if not np.any(np.isnan(shear_values)) and not np.any(np.isnan(moment_values)):
-             calculation_steps.append("- Evaluación numérica por sustitución completada.")
+        if len(unknowns) > 2:
+            # Indeterminate: with a constant EI the reactions do not depend on its value
+            reactions = solve_indeterminate_reactions(L, loads, support_left, support_right, EI if EI > 0 else 1.0)
         else:
-             calculation_steps.append("- Advertencia: Se encontraron NaNs durante la evaluación por sustitución. Se convirtieron a 0.")
-             shear_values = np.nan_to_num(shear_values) # Convert NaNs to 0
-             moment_values = np.nan_to_num(moment_values) # Convert NaNs to 0
-
-
-    # Generate equations by tramos
-    tramos_equations = []
-    # First tramo: from x=0 to first distributed load or point load
-    x_points = []
-    if w_load['magnitude'] != 0:
-        x_points.extend([w_load['start'], w_load['end']])
-    if p_load['magnitude'] != 0:
-        x_points.append(p_load['position'])
-    x_points = sorted(list(set([0, L] + x_points)))  # Add 0 and L, remove duplicates, sort
-
-    for i in range(len(x_points) - 1):
-        start_x = x_points[i]
-        end_x = x_points[i+1]
-        tramo_info = {
-            'interval': f"{start_x:.2f} ≤ x ≤ {end_x:.2f}",
-            'V_eq': "",
-            'M_eq': ""
-        }
-
-        # Build V equation for this tramo
-        V_terms = []
-        # Add negative reaction at x=0 (upward reaction creates downward shear)
-        if start_x >= 0:
-            V_terms.append(f"-{reactions_numeric[R_A]:.2f}")
-
-        # Add distributed load effect (positive w is downward)
-        if w_load['magnitude'] != 0:
-            if start_x >= w_load['start']:
-                # Full effect of previous segment
-                prev_width = min(start_x, w_load['end']) - w_load['start']
-                if prev_width > 0:
-                    V_terms.append(f"+ {w_load['magnitude']:.2f}({prev_width:.2f})")
-            # Current segment effect
-            if start_x < w_load['end'] and end_x > w_load['start']:
-                V_terms.append(f"+ {w_load['magnitude']:.2f}(x - {max(start_x, w_load['start']):.2f})")
-
-        # Add point load if it's before this segment (positive P is downward)
-        if p_load['magnitude'] != 0 and start_x > p_load['position']:
-            V_terms.append(f"+ {p_load['magnitude']:.2f}")
-
-        tramo_info['V_eq'] = "V(x) = " + " ".join(V_terms)
-
-        # Build M equation for this tramo
-        M_terms = []
-        # Add initial moment
-        if M_A in reactions_numeric:
-            M_terms.append(f"{reactions_numeric[M_A]:.2f}")
-
-        # Add negative integral of shear (dM/dx = -V)
-        if start_x >= 0:
-            # Reaction contribution
-            M_terms.append(f"+ {reactions_numeric[R_A]:.2f}x")
-
-        # Add distributed load effect
-        if w_load['magnitude'] != 0:
-            if start_x >= w_load['start']:
-                # Full effect of previous segment
-                prev_width = min(start_x, w_load['end']) - w_load['start']
-                if prev_width > 0:
-                    M_terms.append(f"- {w_load['magnitude']:.2f}({prev_width:.2f})x")
-            # Current segment effect
-            if start_x < w_load['end'] and end_x > w_load['start']:
-                x0 = max(start_x, w_load['start'])
-                M_terms.append(f"- {w_load['magnitude']:.2f}(x - {x0:.2f})²/2")
-
-        # Add point load effect if it's before this segment
-        if p_load['magnitude'] != 0 and start_x > p_load['position']:
-            M_terms.append(f"- {p_load['magnitude']:.2f}(x - {p_load['position']:.2f})")
-
-        tramo_info['M_eq'] = "M(x) = " + " ".join(M_terms)
-        tramos_equations.append(tramo_info)
-
-    results = {
-        'reactions': {str(k): float(N(v)) for k, v in reactions.items()}, # Store original reactions as floats
-        'shear_eq': V_expr_symbolic, # Store the symbolic equation for display
-        'moment_eq': M_expr_symbolic, # Store the symbolic equation for display
+            reactions, unknowns = solve_reactions(L, support_left, support_right, total_force, total_moment)
+    except (ValueError, np.linalg.LinAlgError) as e:
+        reaction_error = str(e)
+        reactions = {'R_A': 0.0, 'R_B': 0.0, 'M_A': 0.0, 'M_B': 0.0}
+
+    # --- Shear and Moment as singularity functions ---
+    shear_terms = build_shear_terms(L, reactions, loads)
+    moment_terms = build_moment_terms(L, reactions, shear_terms, loads)
+
+    # --- Piecewise polynomials and numerical evaluation ---
+    # Both diagrams share the load positions as breakpoints (couples only jump M)
+    breakpoints = loads.positions()
+    shear_poly = PiecewisePoly.from_singularity_terms(shear_terms, 0.0, L, breakpoints)
+    moment_poly = PiecewisePoly.from_singularity_terms(moment_terms, 0.0, L, breakpoints)
+    extrema = {'shear': shear_poly.extrema(), 'moment': moment_poly.extrema()}
+
+    # --- Slope and deflection from EI ---
+    deflection = None
+    if EI > 0 and reaction_error is None:
+        deflection = solve_deflection(moment_poly, EI, support_left, support_right)
+    slope_poly = deflection_poly = slope_values = deflection_values = conditions = None
+    polys = [shear_poly, moment_poly]
+    scales = [abs(extrema['shear']['abs_max'][1]), abs(extrema['moment']['abs_max'][1])]
+    if deflection is not None:
+        slope_poly, deflection_poly, conditions = deflection
+        extrema['deflection'] = deflection_poly.extrema()
+        polys += [slope_poly, deflection_poly]
+        scales += [abs(slope_poly.extrema()['abs_max'][1]), abs(extrema['deflection']['abs_max'][1])]
+
+    # Adaptive samples for the plots: vertical jumps and points only where curvature needs them
+    x_vals, values = adaptive_samples(polys, scales=scales)
+    shear_values, moment_values = values[:2]
+    if deflection is not None:
+        slope_values, deflection_values = values[2:]
+
+    report = BeamReport(L, loads, support_left, support_right, unknowns, reactions, shear_terms, moment_terms,
+                        shear_poly, moment_poly, extrema, EI, reaction_error, conditions)
+
+    results = BeamResults({
+        'reactions': reactions,
         'x_values': x_vals,
-        'shear_values': shear_values, # Store the final numerical values
+        'shear_values': shear_values,
         'moment_values': moment_values,
-        'calculation_steps': calculation_steps,
-        'tramos_equations': tramos_equations # Add equations by tramos
-    }
+        'report': report, # Lazy memoria de cálculo: steps, w/V/M equations and tramos
+        'shear_poly': shear_poly,
+        'moment_poly': moment_poly,
+        'extrema': extrema, # (x, value) of max, min and max |value| for V, M (and y)
+        'slope_poly': slope_poly, # None when the deflection cannot be determined
+        'deflection_poly': deflection_poly,
+        'slope_values': slope_values,
+        'deflection_values': deflection_values
+    })
     return results
@@ -1,8 +1,14 @@
 import plotly.graph_objects as go
 import numpy as np
 
-def plot_diagram(x, y, title, y_label):
-    """Generates a Plotly figure for shear or moment."""
+from .beam_loads import BeamLoads
+from .beam_downsample import DIAGRAM_MAX_POINTS, downsample
+from ..profiling import timed
+
+@timed()
+def plot_diagram(x, y, title, y_label, max_points=DIAGRAM_MAX_POINTS):
+    """Generates a Plotly figure for shear or moment (downsampled to about max_points)."""
+    x, (y,) = downsample(x, [y], max_points)
     fig = go.Figure()
     fig.add_trace(go.Scatter(x=x, y=y, mode='lines', name=y_label, fill='tozeroy'))
     fig.update_layout(
@@ -15,133 +21,180 @@ def plot_diagram(x, y, title, y_label):
     fig.add_hline(y=0, line_width=1, line_dash="dash", line_color="grey")
     return fig
 
+@timed()
+def plot_deflection(x, deflection, slope, max_points=DIAGRAM_MAX_POINTS):
+    """Generates a Plotly figure of the deflection y(x) with the slope θ(x) on a second axis."""
+    x, (deflection, slope) = downsample(x, [deflection, slope], max_points)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=x, y=deflection, mode='lines', name='Deflexión y(x)', line=dict(color='royalblue', width=3)))
+    fig.add_trace(go.Scatter(x=x, y=slope, mode='lines', name='Pendiente θ(x)', line=dict(color='darkorange', dash='dot'), yaxis='y2'))
+    fig.update_layout(
+        title="Pendiente y Deflexión de la Viga",
+        xaxis_title="Posición (x)",
+        yaxis=dict(title="Deflexión (y)"),
+        yaxis2=dict(title="Pendiente (θ)", overlaying='y', side='right', showgrid=False),
+        hovermode="x unified",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    # Undeformed beam axis for reference
+    fig.add_hline(y=0, line_width=1, line_dash="dash", line_color="grey")
+    return fig
+
+@timed()
+def plot_envelope(x, upper, lower, title, y_label, static_x=None, static_y=None, max_points=DIAGRAM_MAX_POINTS):
+    """Generates a Plotly figure of a moving-load envelope, optionally over the static diagram."""
+    x, (upper, lower) = downsample(x, [upper, lower], max_points)
+    if static_x is not None and static_y is not None:
+        static_x, (static_y,) = downsample(static_x, [static_y], max_points)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=x, y=upper, mode='lines', name='Envolvente máx.', line=dict(color='firebrick')))
+    fig.add_trace(go.Scatter(x=x, y=lower, mode='lines', name='Envolvente mín.', line=dict(color='firebrick'),
+                             fill='tonexty', fillcolor='rgba(178,34,34,0.15)'))
+    if static_x is not None and static_y is not None:
+        fig.add_trace(go.Scatter(x=static_x, y=static_y, mode='lines', name='Cargas estáticas', line=dict(color='grey', dash='dash')))
+    fig.update_layout(
+        title=title,
+        xaxis_title="Posición (x)",
+        yaxis_title=y_label,
+        hovermode="x unified",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    fig.add_hline(y=0, line_width=1, line_dash="dash", line_color="grey")
+    return fig
+
+class _SchematicLayers:
+    """
+    Geometry of the schematic collected into a few batched traces: arrow
+    shafts as NaN-separated segments per colour, one marker trace (arrow
+    heads and supports) and one text trace, instead of one annotation each.
+    """
+    def __init__(self):
+        self.segments = {} # colour -> ([x], [y], width, legend name)
+        self.markers = {'x': [], 'y': [], 'symbol': [], 'color': [], 'size': []}
+        self.texts = {'x': [], 'y': [], 'text': [], 'color': [], 'position': []}
+
+    def segment(self, x0, y0, x1, y1, color, width=2, name=None):
+        xs, ys, _, _ = self.segments.setdefault(color, ([], [], width, name))
+        xs.extend((x0, x1, np.nan))
+        ys.extend((y0, y1, np.nan))
+
+    def marker(self, x, y, symbol, color, size):
+        for key, value in zip(('x', 'y', 'symbol', 'color', 'size'), (x, y, symbol, color, size)):
+            self.markers[key].append(value)
+
+    def arrow(self, x, y_from, y_to, color, width=2, head=10, name=None):
+        """Vertical arrow from y_from to y_to with its head at y_to."""
+        self.segment(x, y_from, x, y_to, color, width, name)
+        self.marker(x, y_to, 'triangle-up' if y_to > y_from else 'triangle-down', color, head)
+
+    def text(self, x, y, text, color, position='middle center'):
+        for key, value in zip(('x', 'y', 'text', 'color', 'position'), (x, y, text, color, position)):
+            self.texts[key].append(value)
+
+    def traces(self):
+        # Colours that share a name (e.g. both walls of a fixed-fixed beam) get one legend entry
+        traces, named = [], set()
+        for color, (xs, ys, width, name) in self.segments.items():
+            traces.append(go.Scatter(x=xs, y=ys, mode='lines', line=dict(color=color, width=width),
+                                     hoverinfo='skip', name=name, legendgroup=name,
+                                     showlegend=name is not None and name not in named))
+            named.add(name)
+        if self.markers['x']:
+            traces.append(go.Scatter(x=self.markers['x'], y=self.markers['y'], mode='markers', hoverinfo='skip',
+                                     marker=dict(symbol=self.markers['symbol'], color=self.markers['color'],
+                                                 size=self.markers['size']), showlegend=False))
+        if self.texts['x']:
+            traces.append(go.Scatter(x=self.texts['x'], y=self.texts['y'], mode='text', text=self.texts['text'],
+                                     textposition=self.texts['position'], hoverinfo='skip',
+                                     textfont=dict(color=self.texts['color'], size=10), showlegend=False))
+        return traces
+
+@timed()
 def plot_beam_schematic(params, results):
     """Generates a Plotly figure visualizing the beam, supports, and loads."""
     fig = go.Figure()
     L = params['length']
-    p_load = params['point_load_p']
-    w_load = params['dist_load_w']
+    loads = BeamLoads.from_params(params).clamped(L)
     support_left = params['support_left']
     support_right = params['support_right']
     reactions = results.get('reactions', {}) # Get calculated reactions
+    layers = _SchematicLayers()
+
+    # Vertical offsets, proportional to L
+    load_y_offset = 0.15 * L # Vertical offset for loads above the beam
+    reaction_y_offset = -0.15 * L # Vertical offset for reactions below the beam
+    moment_y_offset = -0.25 * L # Offset for moment text
 
     # Beam Line
     fig.add_trace(go.Scatter(x=[0, L], y=[0, 0], mode='lines', line=dict(color='black', width=5), name='Viga'))
 
     # --- Supports ---
     support_marker_size = 15
-    # Left Support
-    if support_left == 'Simple':
-        fig.add_trace(go.Scatter(x=[0], y=[0], mode='markers', marker=dict(symbol='triangle-up', size=support_marker_size, color='red'), name='Apoyo Simple (A)'))
-    elif support_left == 'Empotrado':
-        fig.add_trace(go.Scatter(x=[0, 0], y=[-0.5, 0.5], mode='lines', line=dict(color='red', width=3), name='Apoyo Empotrado (A)'))
-        fig.add_trace(go.Scatter(x=[0], y=[0], mode='markers', marker=dict(symbol='square', size=support_marker_size, color='red'), showlegend=False)) # Show marker at connection
-
-    # Right Support
-    if support_right == 'Simple':
-        fig.add_trace(go.Scatter(x=[L], y=[0], mode='markers', marker=dict(symbol='triangle-up', size=support_marker_size, color='blue'), name='Apoyo Simple (B)'))
-    elif support_right == 'Empotrado':
-        fig.add_trace(go.Scatter(x=[L, L], y=[-0.5, 0.5], mode='lines', line=dict(color='blue', width=3), name='Apoyo Empotrado (B)'))
-        fig.add_trace(go.Scatter(x=[L], y=[0], mode='markers', marker=dict(symbol='square', size=support_marker_size, color='blue'), showlegend=False))
+    for x, support, color in ((0, support_left, 'red'), (L, support_right, 'blue')):
+        if support == 'Simple':
+            layers.marker(x, 0, 'triangle-up', color, support_marker_size)
+        elif support == 'Empotrado':
+            layers.segment(x, -0.5, x, 0.5, color, width=3, name='Empotramiento') # Wall
+            layers.marker(x, 0, 'square', color, support_marker_size)
     # No marker for 'Libre'
 
     # --- Loads ---
-    # Adjust scale factors dynamically based on beam length L and potentially load magnitudes
-    # Find max absolute reaction or load magnitude for scaling, avoid division by zero
-    max_force_mag = max(abs(p_load['magnitude']), abs(w_load['magnitude'])*L, # Estimate total distributed load force
-                        abs(reactions.get('R_A', 0)), abs(reactions.get('R_B', 0)), 1.0) # Add 1.0 to prevent zero scale
-    max_moment_mag = max(abs(reactions.get('M_A', 0)), abs(reactions.get('M_B', 0)), 1.0)
-
-    # Base scale on length, but adjust slightly by force/moment magnitude?
-    # Let's keep it simpler for now, primarily based on L.
-    load_y_offset = 0.15 * L # Vertical offset for loads above the beam
-    reaction_y_offset = -0.15 * L # Vertical offset for reactions below the beam
-    moment_y_offset = -0.25 * L # Offset for moment text
-
-    # Point Load P
-    if p_load['magnitude'] != 0:
-        p_mag = p_load['magnitude']
-        p_pos = p_load['position']
+    # Point Loads P: arrows from above (downward loads) or below (upward loads)
+    for i, (p_pos, p_mag) in enumerate(zip(loads.point_positions, loads.point_magnitudes), 1):
+        if p_mag == 0:
+            continue
         p_dir = np.sign(p_mag) # +1 for positive (down), -1 for negative (up)
-        arrow_y_tip = 0 + p_dir * 0.02 * L # Tip slightly offset from beam
-        arrow_y_base = load_y_offset * p_dir # Base further away
-        text_y = load_y_offset * 1.1 * p_dir # Text slightly beyond base
-
-        # Draw the arrow for point load P
-        fig.add_annotation(
-            x=p_pos, y=arrow_y_tip,  # End point of the arrow near the beam
-            ax=p_pos, ay=arrow_y_base, # Start point of the arrow away from the beam
-            showarrow=True, arrowhead=3, arrowsize=2, arrowwidth=2, arrowcolor="purple",
-            # No text in this annotation, just the arrow
-        )
-        # Add text separately for better control
-        fig.add_annotation(
-            x=p_pos, y=text_y,
-            text=f"P={p_mag:.2f}", showarrow=False,
-            font=dict(color="purple", size=10), align="center", yshift=5*p_dir # Shift text slightly away from arrow
-        )
-
-
-    # Distributed Load w
-    if w_load['magnitude'] != 0:
-        w_mag = w_load['magnitude']
-        w_start = w_load['start']
-        w_end = w_load['end']
-        w_dir = np.sign(w_mag) # +1 for positive (down), -1 for negative (up)
-        rect_y0 = 0
-        rect_y1 = load_y_offset * 0.4 * w_dir # Rectangle extends up or down
-        arrow_y_base = rect_y1 # Arrows start/end at rectangle edge
-        arrow_y_tip = 0 + w_dir * 0.01 * L # Arrows point towards beam
-
-        # Draw rectangle for distributed load area
-        fig.add_shape(type="rect",
-            x0=w_start, y0=rect_y0, x1=w_end, y1=rect_y1,
-            line=dict(color="Orange"), fillcolor="rgba(255,165,0,0.2)", layer="below"
-        )
-        # Add arrows to indicate direction
-        num_arrows = max(3, int((w_end - w_start) / (L / 10))) # More arrows for longer spans
-        for i in np.linspace(w_start, w_end, num_arrows):
-             # Draw small arrows for distributed load w
-             fig.add_annotation(
-                x=i, y=arrow_y_tip, # End point near beam
-                ax=i, ay=arrow_y_base, # Start point at rectangle edge
-                showarrow=True, arrowhead=3, arrowsize=1.5, arrowwidth=1, arrowcolor="orange"
-                # No text in these annotations
-            )
-        # Add text label for w
-        text_y_w = load_y_offset * 0.5 * w_dir # Place text outside rectangle
-        fig.add_annotation(
-            x=(w_start + w_end) / 2, y=text_y_w,
-            text=f"w={w_mag:.2f}", showarrow=False, font=dict(color="orange", size=10),
-            yshift=5*w_dir # Shift text slightly away
-        )
-
-    # --- Reactions ---
-    # R_A
-    if 'R_A' in reactions and abs(reactions['R_A']) > 1e-6: # Check for non-zero
-         fig.add_annotation(
-            x=0, y=reaction_y_offset * 0.5, ax=0, ay=0, # Arrow pointing up from support
-            text=f"R_A={reactions['R_A']:.2f}",
-            showarrow=True, arrowhead=2, arrowsize=1, arrowwidth=2, arrowcolor="green", font=dict(color="green", size=10)
-         )
-    # M_A
-    if 'M_A' in reactions and abs(reactions['M_A']) > 1e-6:
-         fig.add_annotation(
-             x=0.05*L, y=moment_y_offset, text=f"↺ M_A={reactions['M_A']:.2f}", showarrow=False, font=dict(color="darkgreen", size=10)
-         )
-    # R_B
-    if 'R_B' in reactions and abs(reactions['R_B']) > 1e-6:
-         fig.add_annotation(
-            x=L, y=reaction_y_offset * 0.5, ax=L, ay=0, # Arrow pointing up from support
-            text=f"R_B={reactions['R_B']:.2f}",
-            showarrow=True, arrowhead=2, arrowsize=1, arrowwidth=2, arrowcolor="green", font=dict(color="green", size=10)
-         )
-     # M_B
-    if 'M_B' in reactions and abs(reactions['M_B']) > 1e-6:
-         fig.add_annotation(
-             x=0.95*L, y=moment_y_offset, text=f"↺ M_B={reactions['M_B']:.2f}", showarrow=False, font=dict(color="darkgreen", size=10)
-         )
+        label = "P" if len(loads.point_positions) == 1 else f"P{i}"
+        layers.arrow(p_pos, load_y_offset * p_dir, p_dir * 0.02 * L, 'purple', width=2, head=12, name='Cargas puntuales')
+        layers.text(p_pos, load_y_offset * 1.1 * p_dir, f"{label}={p_mag:.2f}", 'purple',
+                    'top center' if p_dir > 0 else 'bottom center')
+
+    # Distributed Loads w (uniform or linearly varying): outlines as one filled trace
+    outline_x, outline_y = [], []
+    for i, (w_start, w_end, w1, w2) in enumerate(zip(loads.dist_starts, loads.dist_ends,
+                                                     loads.dist_start_magnitudes, loads.dist_end_magnitudes), 1):
+        if (w1 == 0 and w2 == 0) or w_end <= w_start:
+            continue
+        w_ref = max(abs(w1), abs(w2))
+        # Outline heights follow the load intensity; arrows point towards the beam
+        y_start = load_y_offset * 0.4 * w1 / w_ref
+        y_end = load_y_offset * 0.4 * w2 / w_ref
+        outline_x.extend((w_start, w_start, w_end, w_end, w_start, np.nan))
+        outline_y.extend((0, y_start, y_end, 0, 0, np.nan))
 
+        num_arrows = max(3, int((w_end - w_start) / (L / 10))) # More arrows for longer spans
+        for xa in np.linspace(w_start, w_end, num_arrows):
+            arrow_y_base = y_start + (y_end - y_start) * (xa - w_start) / (w_end - w_start)
+            if arrow_y_base != 0:
+                layers.arrow(xa, arrow_y_base, np.sign(arrow_y_base) * 0.01 * L, 'orange', width=1, head=7)
+
+        label = "w" if len(loads.dist_starts) == 1 else f"w{i}"
+        magnitude = f"{w1:.2f}" if w1 == w2 else f"{w1:.2f}→{w2:.2f}"
+        w_dir = np.sign(w1 + w2) or np.sign(w1)
+        layers.text((w_start + w_end) / 2, load_y_offset * 0.5 * w_dir, f"{label}={magnitude}", 'orange',
+                    'top center' if w_dir > 0 else 'bottom center')
+    if outline_x:
+        fig.add_trace(go.Scatter(x=outline_x, y=outline_y, mode='lines', fill='toself', line=dict(color='orange'),
+                                 fillcolor='rgba(255,165,0,0.2)', hoverinfo='skip', name='Carga distribuida'))
+
+    # Concentrated Moments C
+    for i, (c_pos, c_mag) in enumerate(zip(loads.moment_positions, loads.moment_magnitudes), 1):
+        if c_mag == 0:
+            continue
+        symbol = "↺" if c_mag > 0 else "↻"
+        label = "C" if len(loads.moment_positions) == 1 else f"C{i}"
+        layers.text(c_pos, 0.06 * L, f"{symbol} {label}={abs(c_mag):.2f}", 'brown')
+
+    # --- Reactions: upward arrows below the supports and the clamping moments ---
+    for name, x in (('R_A', 0), ('R_B', L)):
+        if abs(reactions.get(name, 0)) > 1e-6:
+            layers.arrow(x, reaction_y_offset * 0.5, 0, 'green', name='Reacciones')
+            layers.text(x, reaction_y_offset * 0.5, f"{name}={reactions[name]:.2f}", 'green', 'bottom center')
+    for name, x in (('M_A', 0.05 * L), ('M_B', 0.95 * L)):
+        if abs(reactions.get(name, 0)) > 1e-6:
+            layers.text(x, moment_y_offset, f"↺ {name}={reactions[name]:.2f}", 'darkgreen')
+
+    fig.add_traces(layers.traces())
 
     # --- Layout ---
     # Determine appropriate y-range based on offsets
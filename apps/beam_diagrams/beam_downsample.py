@@ -0,0 +1,76 @@
+"""
+Visual downsampling of diagram samples before they are sent to the browser.
+
+Plotly ships every sample of a trace as JSON, so the payload of a diagram
+grows linearly with its resolution. downsample keeps at most about
+`max_points` samples with Largest-Triangle-Three-Buckets (LTTB): the series
+is split into equal buckets and from each one the point that spans the
+largest triangle with the previously kept point and the mean of the next
+bucket is kept, which follows peaks and bends instead of averaging them
+away. On top of that, the samples that make a diagram read correctly are
+always kept: both sides of every jump (duplicate x) and the maximum and
+minimum of every series.
+"""
+
+import numpy as np
+
+# Samples per diagram trace sent to the browser
+DIAGRAM_MAX_POINTS = 1500
+
+def lttb_indices(x, y, n_out):
+    """
+    Indices of the n_out samples kept by LTTB, always including the ends.
+
+    The triangle area of every candidate is affine in the previously kept
+    point, so all buckets are scored at once for a guess of those points and
+    the guess is replaced by the new selection until it stops changing. Each
+    pass fixes at least one more bucket, and the fixed point is exactly the
+    sequential LTTB selection (usually after a few passes).
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    # n_out - 2 buckets over the interior samples, padded into rows
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    index = edges[:-1, None] + np.arange(np.diff(edges).max())
+    valid = index < edges[1:, None]
+    index = np.minimum(index, n - 1)
+    # Mean of the following bucket; the last bucket looks at the last sample
+    counts = np.diff(edges)
+    mean_x = np.append(np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts, x[-1])[1:, None]
+    mean_y = np.append(np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts, y[-1])[1:, None]
+    # Twice the area with the kept point (xa, ya): |xa·dy + ya·dx + cross|
+    xs, ys = x[index], y[index]
+    dy, dx, cross = ys - mean_y, mean_x - xs, xs * mean_y - mean_x * ys
+    rows = np.arange(len(index))
+    selected = index[:, 0]
+    for _ in range(len(index)):
+        previous = np.concatenate(([0], selected[:-1]))
+        area = np.abs(x[previous, None] * dy + y[previous, None] * dx + cross)
+        area[~valid] = -1.0
+        chosen = index[rows, np.argmax(area, axis=1)]
+        if np.array_equal(chosen, selected):
+            break
+        selected = chosen
+    return np.concatenate(([0], selected, [n - 1]))
+
+def downsample(x, series, max_points=DIAGRAM_MAX_POINTS):
+    """
+    Common subset of samples of one or more series over the same x.
+
+    The LTTB budget is shared between the series; jumps and the extrema of
+    every series are added on top, so the result can slightly exceed
+    max_points. Returns (x, [each series]) unchanged when they are already
+    small enough.
+    """
+    x = np.asarray(x, dtype=float)
+    series = [np.asarray(y, dtype=float) for y in series]
+    if len(x) <= max_points:
+        return x, series
+    per_series = max(3, max_points // len(series))
+    keep = [lttb_indices(x, y, per_series) for y in series]
+    jumps = np.flatnonzero(x[1:] == x[:-1])
+    keep += [jumps, jumps + 1]
+    keep += [[np.nanargmax(y), np.nanargmin(y)] for y in series]
+    index = np.unique(np.concatenate(keep).astype(int))
+    return x[index], [y[index] for y in series]
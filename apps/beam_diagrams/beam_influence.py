@@ -0,0 +1,122 @@
+"""
+Influence lines and moving-load envelopes.
+
+The influence matrices hold V and M at a grid of sections for a unit
+downward load at each point of a grid of load positions. They depend only on
+the length and the supports, so influence_lines caches them per
+configuration, and they are computed at once as a BeamBatch with one beam
+per load position (any support combination the batch solver handles).
+
+A train of axle loads P_k at distances d_k behind the front axle gives, for
+the front axle at ξ, the response Σ_k P_k·I(x, ξ - d_k). On the uniform
+position grid that is a convolution of every row of I with a short kernel
+of axle weights (split between two grid points when d_k is not a multiple
+of the step), evaluated either as sliding-window sums or by FFT. The
+envelopes are its maximum and minimum over all truck positions, from the
+front axle entering the beam to the last axle leaving it.
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .beam_batch import BeamBatch, solve_batch_reactions, evaluate_batch, SUPPORT_CODES
+from ..profiling import timed
+
+@dataclass(frozen=True)
+class InfluenceLines:
+    """Influence matrices of V and M with shape (sections, positions)."""
+    length: float
+    sections: np.ndarray
+    positions: np.ndarray
+    shear: np.ndarray
+    moment: np.ndarray
+
+    @classmethod
+    def compute(cls, length, support_left, support_right, n_sections=201, n_positions=401):
+        """Solves one unit-load beam per position and samples it at every section."""
+        positions = np.linspace(0.0, length, n_positions)
+        sections = np.linspace(0.0, length, n_sections)
+        batch = BeamBatch(
+            lengths=np.full(n_positions, float(length)),
+            support_left=np.full(n_positions, SUPPORT_CODES[support_left]),
+            support_right=np.full(n_positions, SUPPORT_CODES[support_right]),
+            point_positions=positions[:, None],
+            point_magnitudes=np.ones((n_positions, 1)),
+        )
+        reactions, solved = solve_batch_reactions(batch)
+        if not solved.all():
+            raise ValueError("Sistema inestable: no hay líneas de influencia para estos apoyos.")
+        V, M = evaluate_batch(batch, reactions, np.broadcast_to(sections, (n_positions, n_sections)))
+        shear, moment = np.ascontiguousarray(V.T), np.ascontiguousarray(M.T)
+        for array in (positions, sections, shear, moment):
+            array.flags.writeable = False
+        return cls(float(length), sections, positions, shear, moment)
+
+    @property
+    def step(self):
+        return self.positions[1] - self.positions[0]
+
+    def axle_kernel(self, axle_loads, axle_spacings):
+        """
+        Weights of the train on the position grid: kernel[m] multiplies the
+        influence value m steps behind the front axle.
+        """
+        loads = np.asarray(axle_loads, dtype=float)
+        offsets = np.concatenate(([0.0], np.cumsum(np.asarray(axle_spacings, dtype=float)))) / self.step
+        if len(offsets) != len(loads):
+            raise ValueError("Se requiere una separación menos que el número de ejes.")
+        if np.any(offsets[1:] < offsets[:-1]):
+            raise ValueError("Las separaciones entre ejes no pueden ser negativas.")
+        whole = np.floor(offsets).astype(int)
+        fraction = offsets - whole
+        kernel = np.zeros(whole.max() + 2)
+        np.add.at(kernel, whole, loads * (1 - fraction))
+        np.add.at(kernel, whole + 1, loads * fraction)
+        return kernel
+
+    def train_response(self, influence, kernel, method='auto'):
+        """
+        Response at every section (rows) for every front-axle grid position
+        (columns), from 0 to L plus the train length.
+        """
+        n_positions = influence.shape[1]
+        n_columns = n_positions + len(kernel) - 1
+        taps = np.flatnonzero(kernel)
+        if method == 'auto':
+            method = 'fft' if len(taps) > 24 else 'direct'
+        if method == 'fft':
+            n_fft = 1 << (n_columns - 1).bit_length()
+            spectrum = np.fft.rfft(influence, n_fft, axis=1) * np.fft.rfft(kernel, n_fft)
+            return np.fft.irfft(spectrum, n_fft, axis=1)[:, :n_columns]
+        if method != 'direct':
+            raise ValueError(f"Método desconocido: {method}")
+        response = np.zeros((influence.shape[0], n_columns))
+        for m in taps:
+            response[:, m:m + n_positions] += kernel[m] * influence
+        return response
+
+    @timed('InfluenceLines.envelope')
+    def envelope(self, axle_loads, axle_spacings=(), method='auto'):
+        """
+        Max/min envelopes of V and M at every section as the train crosses.
+
+        Returns a dict with 'x_values', 'V_max', 'V_min', 'M_max', 'M_min' and,
+        for each of them, the front-axle position that produces it under
+        'front_<key>'.
+        """
+        kernel = self.axle_kernel(axle_loads, axle_spacings)
+        front = np.arange(len(self.positions) + len(kernel) - 1) * self.step
+        result = {'x_values': self.sections}
+        for name, influence in (('V', self.shear), ('M', self.moment)):
+            response = self.train_response(influence, kernel, method)
+            for key, index in (('max', np.argmax(response, axis=1)), ('min', np.argmin(response, axis=1))):
+                result[f'{name}_{key}'] = np.take_along_axis(response, index[:, None], axis=1)[:, 0]
+                result[f'front_{name}_{key}'] = front[index]
+        return result
+
+@lru_cache(maxsize=32)
+@timed()
+def influence_lines(length, support_left, support_right, n_sections=201, n_positions=401):
+    """Cached InfluenceLines of a support configuration."""
+    return InfluenceLines.compute(float(length), support_left, support_right, n_sections, n_positions)
@@ -0,0 +1,198 @@
+"""
+Load model for the beam diagrams app.
+
+A beam carries any number of point loads, distributed loads (uniform or
+linearly varying) and concentrated moments. Each group is stored as sorted
+NumPy arrays, so the loads turn into singularity terms and resultants with
+array operations instead of one symbolic term per load.
+
+Sign conventions: positive forces act downward, positive moments are
+counterclockwise (the same sense as the reactions M_A and M_B).
+"""
+
+import numpy as np
+from dataclasses import dataclass, field
+
+def _empty():
+    return np.zeros(0)
+
+def load_columns(params):
+    """
+    Unsorted float lists of a params dict, one per BeamLoads field (see
+    BeamLoads.from_params for the accepted formats).
+    """
+    points = list(params.get('point_loads', []))
+    dists = list(params.get('distributed_loads', []))
+    if 'point_load_p' in params:
+        points.append(params['point_load_p'])
+    if 'dist_load_w' in params:
+        dists.append(params['dist_load_w'])
+    moments = list(params.get('moments', []))
+
+    def column(items, key, default_key=None):
+        return [float(item.get(key, item.get(default_key, 0.0))) for item in items]
+
+    return {
+        'point_positions': column(points, 'position'),
+        'point_magnitudes': column(points, 'magnitude'),
+        'dist_starts': column(dists, 'start'),
+        'dist_ends': column(dists, 'end'),
+        'dist_start_magnitudes': column(dists, 'magnitude_start', 'magnitude'),
+        'dist_end_magnitudes': column(dists, 'magnitude_end', 'magnitude'),
+        'moment_positions': column(moments, 'position'),
+        'moment_magnitudes': column(moments, 'magnitude'),
+    }
+
+def clip_distributed(starts, ends, start_magnitudes, end_magnitudes, length):
+    """
+    Distributed loads (start <= end) cut to [0, length].
+
+    The magnitudes at the new ends are interpolated along the original ramp,
+    so the part of a load that stays on the beam keeps its intensity.
+    Broadcasts, so `length` may be a column of one length per beam.
+
+    Returns (starts, ends, start_magnitudes, end_magnitudes).
+    """
+    clipped_starts = np.clip(starts, 0.0, length)
+    clipped_ends = np.clip(ends, clipped_starts, length)
+    span = ends - starts
+    slope = np.divide(end_magnitudes - start_magnitudes, span, out=np.zeros(np.broadcast(span, length).shape),
+                      where=span > 0)
+    return (clipped_starts, clipped_ends, start_magnitudes + slope * (clipped_starts - starts),
+            start_magnitudes + slope * (clipped_ends - starts))
+
+@dataclass
+class BeamLoads:
+    """Loads on a beam, stored as sorted arrays per load type."""
+    point_positions: np.ndarray = field(default_factory=_empty)
+    point_magnitudes: np.ndarray = field(default_factory=_empty)
+    dist_starts: np.ndarray = field(default_factory=_empty)
+    dist_ends: np.ndarray = field(default_factory=_empty)
+    dist_start_magnitudes: np.ndarray = field(default_factory=_empty)
+    dist_end_magnitudes: np.ndarray = field(default_factory=_empty)
+    moment_positions: np.ndarray = field(default_factory=_empty)
+    moment_magnitudes: np.ndarray = field(default_factory=_empty)
+
+    def __post_init__(self):
+        for name in self.__dataclass_fields__:
+            setattr(self, name, np.array(getattr(self, name), dtype=float).ravel())
+        # Keep every distributed load oriented with start <= end
+        swap = self.dist_starts > self.dist_ends
+        self.dist_starts[swap], self.dist_ends[swap] = self.dist_ends[swap], self.dist_starts[swap]
+        self.dist_start_magnitudes[swap], self.dist_end_magnitudes[swap] = \
+            self.dist_end_magnitudes[swap], self.dist_start_magnitudes[swap]
+
+        order = np.argsort(self.point_positions, kind='stable')
+        self.point_positions, self.point_magnitudes = self.point_positions[order], self.point_magnitudes[order]
+        order = np.argsort(self.dist_starts, kind='stable')
+        self.dist_starts, self.dist_ends = self.dist_starts[order], self.dist_ends[order]
+        self.dist_start_magnitudes = self.dist_start_magnitudes[order]
+        self.dist_end_magnitudes = self.dist_end_magnitudes[order]
+        order = np.argsort(self.moment_positions, kind='stable')
+        self.moment_positions, self.moment_magnitudes = self.moment_positions[order], self.moment_magnitudes[order]
+
+    @classmethod
+    def from_params(cls, params):
+        """
+        Builds the loads from a beam params dict.
+
+        Reads the load lists 'point_loads', 'distributed_loads' and 'moments'
+        as well as the single 'point_load_p' / 'dist_load_w' entries produced
+        by the dice. Distributed loads take either 'magnitude' (uniform) or
+        'magnitude_start' and 'magnitude_end' (linearly varying).
+        """
+        return cls(**load_columns(params))
+
+    def to_params(self):
+        """Load lists in the params-dict format (inverse of from_params)."""
+        return {
+            'point_loads': [{'magnitude': m, 'position': x}
+                            for x, m in zip(self.point_positions.tolist(), self.point_magnitudes.tolist())],
+            'distributed_loads': [{'start': a, 'end': b, 'magnitude_start': w1, 'magnitude_end': w2}
+                                  for a, b, w1, w2 in zip(self.dist_starts.tolist(), self.dist_ends.tolist(),
+                                                          self.dist_start_magnitudes.tolist(),
+                                                          self.dist_end_magnitudes.tolist())],
+            'moments': [{'magnitude': m, 'position': x}
+                        for x, m in zip(self.moment_positions.tolist(), self.moment_magnitudes.tolist())],
+        }
+
+    def clamped(self, length):
+        """
+        Returns a copy with every position clipped to [0, length]; distributed
+        loads are cut at the ends (see clip_distributed) and dropped when
+        nothing of them is left on the beam.
+        """
+        starts, ends, w1, w2 = clip_distributed(self.dist_starts, self.dist_ends, self.dist_start_magnitudes,
+                                                self.dist_end_magnitudes, length)
+        kept = ends > starts
+        return BeamLoads(
+            np.clip(self.point_positions, 0.0, length), self.point_magnitudes,
+            starts[kept], ends[kept], w1[kept], w2[kept],
+            np.clip(self.moment_positions, 0.0, length), self.moment_magnitudes,
+        )
+
+    @property
+    def n_loads(self):
+        return len(self.point_positions) + len(self.dist_starts) + len(self.moment_positions)
+
+    def positions(self):
+        """Every position where a diagram can change its polynomial."""
+        return np.unique(np.concatenate((self.point_positions, self.dist_starts,
+                                         self.dist_ends, self.moment_positions)))
+
+    def resultants(self):
+        """
+        Total downward force and the clockwise moment of the loads about x = 0.
+
+        The moment is the right-hand side of ΣM_A: M_A + R_B·L + M_B = M_F.
+        """
+        a, b = self.dist_starts, self.dist_ends
+        w1, w2 = self.dist_start_magnitudes, self.dist_end_magnitudes
+        span = b - a
+        dist_force = span * (w1 + w2) / 2.0
+        dist_moment = span * (w1 * (2 * a + b) + w2 * (a + 2 * b)) / 6.0
+        total_force = self.point_magnitudes.sum() + dist_force.sum()
+        total_moment = (self.point_magnitudes * self.point_positions).sum() + dist_moment.sum() \
+            - self.moment_magnitudes.sum()
+        return float(total_force), float(total_moment)
+
+    def _dist_slopes(self):
+        span = self.dist_ends - self.dist_starts
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(span > 0, (self.dist_end_magnitudes - self.dist_start_magnitudes) / span, 0.0)
+
+    def load_terms(self):
+        """Singularity terms (c, a, n) of the distributed load w(x)."""
+        k = self._dist_slopes()
+        active = self.dist_ends > self.dist_starts
+        terms = []
+        for a, b, w1, w2, ki in zip(self.dist_starts[active], self.dist_ends[active],
+                                    self.dist_start_magnitudes[active], self.dist_end_magnitudes[active],
+                                    k[active]):
+            terms.extend([(w1, a, 0), (-w2, b, 0)])
+            if ki != 0:
+                terms.extend([(ki, a, 1), (-ki, b, 1)])
+        return [t for t in terms if t[0] != 0]
+
+    def shear_terms(self):
+        """Singularity terms (c, a, n) of the loads' contribution to V(x) = ∫ w dx + Σ P."""
+        terms = [(c / (n + 1), a, n + 1) for c, a, n in self.load_terms()]
+        terms.extend((m, x, 0) for x, m in zip(self.point_positions, self.point_magnitudes) if m != 0)
+        return terms
+
+    def moment_terms(self):
+        """Singularity terms of the concentrated moments' contribution to M(x)."""
+        return [(-m, x, 0) for x, m in zip(self.moment_positions, self.moment_magnitudes) if m != 0]
+
+    def describe(self):
+        """One markdown line per load, for the parameter summaries."""
+        lines = []
+        for i, (x, m) in enumerate(zip(self.point_positions, self.point_magnitudes), 1):
+            lines.append(f"Carga Puntual P{i}: {m:.2f} @ x={x:.2f}")
+        for i, (a, b, w1, w2) in enumerate(zip(self.dist_starts, self.dist_ends,
+                                               self.dist_start_magnitudes, self.dist_end_magnitudes), 1):
+            magnitude = f"{w1:.2f}" if w1 == w2 else f"{w1:.2f} → {w2:.2f}"
+            lines.append(f"Carga Distribuida w{i}: {magnitude} de x={a:.2f} a x={b:.2f}")
+        for i, (x, m) in enumerate(zip(self.moment_positions, self.moment_magnitudes), 1):
+            lines.append(f"Momento Concentrado C{i}: {m:.2f} @ x={x:.2f}")
+        return lines or ["Sin cargas aplicadas"]
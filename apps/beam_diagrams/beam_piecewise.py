@@ -0,0 +1,241 @@
+"""
+Piecewise-polynomial representation of beam diagrams.
+
+A PiecewisePoly stores the breakpoints x_0 < x_1 < ... < x_S and, for each
+segment, the coefficients of a polynomial in the local variable t = x - x_i
+(ascending powers). Evaluation is right-continuous at interior breakpoints and
+uses the left limit at the last breakpoint, so V(L) and M(L) are the values at
+the end of the beam rather than after the closing reaction.
+"""
+
+import numpy as np
+from math import comb
+
+class PiecewisePoly:
+    """Piecewise polynomial with per-segment local coefficients."""
+
+    def __init__(self, breakpoints, coefficients):
+        self.breakpoints = np.asarray(breakpoints, dtype=float)
+        self.coefficients = np.atleast_2d(np.asarray(coefficients, dtype=float))
+        if self.coefficients.shape[0] != len(self.breakpoints) - 1:
+            raise ValueError("Se requiere un juego de coeficientes por tramo.")
+
+    @classmethod
+    def from_singularity_terms(cls, terms, x_start, x_end, breakpoints=None):
+        """
+        Builds the polynomial of a sum of singularity terms [(c, a, n), ...] on [x_start, x_end].
+
+        Each term c<x-a>^n is expanded in global powers of x and the terms are
+        accumulated with a cumulative sum over their sorted positions, so the
+        cost is O(N log N) for N terms regardless of the number of segments.
+        By default the breakpoints are the term positions inside the domain;
+        pass `breakpoints` to share a common segmentation between diagrams.
+        """
+        if terms:
+            c, a, n = (np.array(col, dtype=float) for col in zip(*terms))
+        else:
+            c, a, n = np.zeros(1), np.array([x_start]), np.zeros(1)
+        n = n.astype(int)
+        degree = int(n.max())
+
+        order = np.argsort(a, kind='stable')
+        c, a, n = c[order], a[order], n[order]
+
+        # c (x - a)^n = Σ_k c C(n, k) (-a)^(n-k) x^k
+        k = np.arange(degree + 1)
+        binomials = np.array([[comb(int(ni), int(ki)) for ki in k] for ni in range(degree + 1)], dtype=float)
+        powers = np.clip(n[:, None] - k[None, :], 0, None)
+        global_coeffs = c[:, None] * binomials[n] * (-a[:, None]) ** powers
+        cumulative = np.cumsum(global_coeffs, axis=0)
+
+        if breakpoints is None:
+            breakpoints = a[(a > x_start) & (a < x_end)]
+        breakpoints = np.asarray(breakpoints, dtype=float)
+        inner = breakpoints[(breakpoints > x_start) & (breakpoints < x_end)]
+        breakpoints = np.unique(np.concatenate(([x_start, x_end], inner)))
+        active = np.searchsorted(a, breakpoints[:-1], side='right') - 1
+        segment_coeffs = np.where(active[:, None] >= 0, cumulative[np.clip(active, 0, None)], 0.0)
+        return cls(breakpoints, _shift_to_local(segment_coeffs, breakpoints[:-1]))
+
+    @property
+    def n_segments(self):
+        return self.coefficients.shape[0]
+
+    @property
+    def degree(self):
+        return self.coefficients.shape[1] - 1
+
+    def segment_index(self, x):
+        """Index of the segment that contains each x (clipped to the domain)."""
+        idx = np.searchsorted(self.breakpoints, x, side='right') - 1
+        return np.clip(idx, 0, self.n_segments - 1)
+
+    def __call__(self, x):
+        x = np.asarray(x, dtype=float)
+        idx = self.segment_index(x)
+        return _horner(self.coefficients[idx], x - self.breakpoints[idx])
+
+    def __neg__(self):
+        return PiecewisePoly(self.breakpoints, -self.coefficients)
+
+    def start_values(self):
+        """Values at the left end of every segment (right limits)."""
+        return self.coefficients[:, 0].copy()
+
+    def end_values(self):
+        """Values at the right end of every segment (left limits)."""
+        return _horner(self.coefficients, np.diff(self.breakpoints))
+
+    def derivative(self):
+        """Analytic derivative, segment by segment."""
+        if self.degree == 0:
+            return PiecewisePoly(self.breakpoints, np.zeros_like(self.coefficients))
+        k = np.arange(1, self.degree + 1)
+        return PiecewisePoly(self.breakpoints, self.coefficients[:, 1:] * k)
+
+    def integral(self, initial=0.0):
+        """
+        Antiderivative F. A scalar `initial` gives the continuous F with
+        F(x_0) = initial; an array gives F at the start of every segment,
+        which avoids accumulating round-off when those values are known. NaN
+        entries (never the first) continue F from the previous segment.
+        """
+        k = np.arange(1, self.degree + 2)
+        coeffs = np.zeros((self.n_segments, self.degree + 2))
+        coeffs[:, 1:] = self.coefficients / k
+        if np.ndim(initial) == 0:
+            starts = np.full(self.n_segments, np.nan)
+            starts[0] = initial
+        else:
+            starts = np.asarray(initial, dtype=float)
+        known = ~np.isnan(starts)
+        if not known.all():
+            # Continue F across segments from the last known start of every run
+            increments = _horner(coeffs, np.diff(self.breakpoints))
+            cumulative = np.concatenate(([0.0], np.cumsum(increments)[:-1]))
+            run_start = np.maximum.accumulate(np.where(known, np.arange(self.n_segments), 0))
+            starts = starts[run_start] + cumulative - cumulative[run_start]
+        coeffs[:, 0] = starts
+        return PiecewisePoly(self.breakpoints, coeffs)
+
+    def roots(self, tol=1e-12):
+        """
+        Real roots inside the segments; identically zero segments are skipped.
+
+        Segments are grouped by their effective degree and every group is
+        solved at once through the eigenvalues of stacked companion matrices.
+        """
+        widths = np.diff(self.breakpoints)
+        coeffs = self.coefficients.copy()
+        # Drop coefficients that are round-off noise on each segment's scale
+        magnitudes = np.abs(coeffs) * np.maximum(widths, 1.0)[:, None] ** np.arange(self.degree + 1)
+        coeffs[magnitudes <= tol * np.maximum(magnitudes.max(axis=1, keepdims=True), 1.0)] = 0.0
+        nonzero = coeffs != 0
+        effective_degree = np.where(nonzero.any(axis=1), self.degree - np.argmax(nonzero[:, ::-1], axis=1), 0)
+
+        found_x = []
+        for d in range(1, self.degree + 1):
+            segs = np.flatnonzero(effective_degree == d)
+            if len(segs) == 0:
+                continue
+            monic = coeffs[segs, :d] / coeffs[segs, d:d + 1]
+            companion = np.zeros((len(segs), d, d))
+            companion[:, np.arange(1, d), np.arange(d - 1)] = 1.0
+            companion[:, :, -1] = -monic
+            r = np.linalg.eigvals(companion)
+            seg = np.repeat(segs, d)
+            r = r.ravel()
+            keep = (np.abs(r.imag) <= 1e-9 * np.maximum(widths[seg], 1.0)) & (r.real > 0) & (r.real < widths[seg])
+            found_x.append(self.breakpoints[seg[keep]] + r.real[keep])
+        if not found_x:
+            return np.array([])
+        return np.sort(np.concatenate(found_x))
+
+    def extrema(self):
+        """
+        Exact extrema: candidates are both sides of every breakpoint and the
+        stationary points (roots of the derivative) inside each segment.
+
+        Returns a dict with 'max', 'min' and 'abs_max' as (x, value) tuples.
+        """
+        stationary = self.derivative().roots()
+        xs = np.concatenate((self.breakpoints[:-1], self.breakpoints[1:], stationary))
+        values = np.concatenate((self.start_values(), self.end_values(), self(stationary)))
+        i_max, i_min = np.argmax(values), np.argmin(values)
+        i_abs = np.argmax(np.abs(values))
+        return {
+            'max': (float(xs[i_max]), float(values[i_max])),
+            'min': (float(xs[i_min]), float(values[i_min])),
+            'abs_max': (float(xs[i_abs]), float(values[i_abs])),
+        }
+
+    def global_coefficients(self):
+        """Per-segment coefficients in powers of the global x (for display)."""
+        return _shift_to_local(self.coefficients, -self.breakpoints[:-1])
+
+def adaptive_samples(polys, rel_tol=1e-3, scales=None, max_points_per_segment=200):
+    """
+    Common sample points for piecewise polynomials with shared breakpoints.
+
+    Each segment gets just enough evenly spaced points for straight lines
+    between them to stay within rel_tol of every polynomial's peak |value|
+    (the chord error is at most h²·max|f''|/8), so segments where all of them
+    are linear keep only their ends. Segment ends are evaluated from their
+    own side; at a breakpoint where some polynomial jumps both samples are
+    kept, an exact duplicate x that draws the jump as a vertical line.
+
+    `scales` overrides the peak values (e.g. from precomputed extrema).
+    Returns (x, [values of each polynomial]).
+    """
+    breakpoints = polys[0].breakpoints
+    widths = np.diff(breakpoints)
+    if scales is None:
+        scales = [abs(p.extrema()['abs_max'][1]) for p in polys]
+    intervals = np.ones(len(widths), dtype=int)
+    for p, scale in zip(polys, scales):
+        if not np.array_equal(p.breakpoints, breakpoints):
+            raise ValueError("Los polinomios deben compartir los puntos de quiebre.")
+        if p.degree < 2 or scale == 0:
+            continue
+        # Exact max |f''| per segment: its ends and its own stationary points
+        second = p.derivative().derivative()
+        curvature = np.maximum(np.abs(second.start_values()), np.abs(second.end_values()))
+        stationary = second.derivative().roots()
+        np.maximum.at(curvature, second.segment_index(stationary), np.abs(second(stationary)))
+        needed = np.ceil(widths * np.sqrt(curvature / (8 * rel_tol * scale)))
+        intervals = np.maximum(intervals, needed.astype(int))
+    intervals = np.minimum(intervals, max_points_per_segment - 1)
+
+    counts = intervals + 1
+    starts = np.cumsum(counts) - counts
+    seg = np.repeat(np.arange(len(widths)), counts)
+    j = np.arange(len(seg)) - starts[seg]
+    t = widths[seg] * j / intervals[seg]
+    # Segment ends take the breakpoint itself so duplicates are exact
+    x = np.where(j == intervals[seg], breakpoints[seg + 1], breakpoints[seg] + t)
+    values = [_horner(p.coefficients[seg], t) for p in polys]
+
+    # Drop the left-limit copy of interior breakpoints where nothing jumps
+    left, right = starts[1:] - 1, starts[1:]
+    continuous = np.ones(len(left), dtype=bool)
+    for v, scale in zip(values, scales):
+        continuous &= np.abs(v[left] - v[right]) <= 1e-12 * max(scale, 1.0)
+    keep = np.ones(len(x), dtype=bool)
+    keep[left[continuous]] = False
+    return x[keep], [v[keep] for v in values]
+
+def _horner(coeffs, t):
+    """Evaluates rows of ascending coefficients at t (one t per row)."""
+    result = coeffs[..., -1].copy()
+    for k in range(coeffs.shape[-1] - 2, -1, -1):
+        result = result * t + coeffs[..., k]
+    return result
+
+def _shift_to_local(coeffs, origins):
+    """Re-expands p(x) = Σ g_j x^j as Σ c_k (x - x0)^k for one x0 per row."""
+    degree = coeffs.shape[1] - 1
+    local = np.zeros_like(coeffs)
+    for k in range(degree + 1):
+        for j in range(k, degree + 1):
+            local[:, k] += comb(j, k) * coeffs[:, j] * origins ** (j - k)
+    return local
@@ -0,0 +1,146 @@
+"""
+Memoria de cálculo of the beam app, built on demand.
+
+calculate_beam_diagrams returns a BeamReport with the numbers of the
+solution (loads, reactions, singularity terms, polynomials). The Markdown
+and LaTeX of each section are only formatted when the app reads them,
+usually when their expander is opened, and are then cached on the report,
+so a rerun with the sections collapsed never formats an equation.
+"""
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional
+
+from .beam_loads import BeamLoads
+from .beam_piecewise import PiecewisePoly
+from ..profiling import timed
+
+def format_singularity_latex(terms, decimals=2):
+    """Formats singularity terms as LaTeX using Macaulay brackets."""
+    parts = []
+    for c, a, n in terms:
+        if abs(c) < 10**(-decimals) / 2:
+            continue
+        if a == 0 and n == 0:
+            body = f"{abs(c):.{decimals}f}"
+        else:
+            inner = "x" if a == 0 else f"x - {a:.{decimals}f}"
+            body = f"{abs(c):.{decimals}f}\\langle {inner} \\rangle^{{{n}}}"
+        parts.append(("- " if c < 0 else "+ ") + body)
+    if not parts:
+        return "0"
+    latex = " ".join(parts)
+    return latex[2:] if latex.startswith("+ ") else "-" + latex[2:]
+
+def format_polynomial_latex(coefficients, decimals=2):
+    """Formats ascending polynomial coefficients in x as LaTeX."""
+    parts = []
+    for k, c in enumerate(coefficients):
+        if abs(c) < 10**(-decimals) / 2:
+            continue
+        power = "" if k == 0 else ("x" if k == 1 else f"x^{{{k}}}")
+        parts.append(("- " if c < 0 else "+ ") + f"{abs(c):.{decimals}f}{power}")
+    if not parts:
+        return "0"
+    latex = " ".join(parts)
+    return latex[2:] if latex.startswith("+ ") else "-" + latex[2:]
+
+
+@dataclass
+class BeamReport:
+    """Numbers of a beam solution; every text section is a cached property."""
+    length: float
+    loads: BeamLoads
+    support_left: str
+    support_right: str
+    unknowns: list
+    reactions: dict
+    shear_terms: list
+    moment_terms: list
+    shear_poly: PiecewisePoly
+    moment_poly: PiecewisePoly
+    extrema: dict
+    EI: float = 0.0
+    reaction_error: Optional[str] = None # Message when the reactions could not be solved
+    conditions: Optional[list] = None # Support conditions of the deflection, None if not solved
+
+    @cached_property
+    def load_eq(self):
+        """LaTeX of w(x) in singularity notation."""
+        return format_singularity_latex(self.loads.load_terms())
+
+    @cached_property
+    def shear_eq(self):
+        """LaTeX of V(x) in singularity notation."""
+        return format_singularity_latex(self.shear_terms)
+
+    @cached_property
+    def moment_eq(self):
+        """LaTeX of M(x) in singularity notation."""
+        return format_singularity_latex(self.moment_terms)
+
+    @cached_property
+    @timed()
+    def tramos_equations(self):
+        """V and M of every tramo, read from the same polynomials used for the diagrams."""
+        V_global = self.shear_poly.global_coefficients()
+        M_global = self.moment_poly.global_coefficients()
+        breakpoints = self.shear_poly.breakpoints
+        return [{
+            'interval': f"{breakpoints[i]:.2f} ≤ x ≤ {breakpoints[i + 1]:.2f}",
+            'V_eq': "V(x) = " + format_polynomial_latex(V_global[i]),
+            'M_eq': "M(x) = " + format_polynomial_latex(M_global[i]),
+        } for i in range(self.shear_poly.n_segments)]
+
+    @cached_property
+    @timed()
+    def calculation_steps(self):
+        """Markdown and LaTeX lines of the memoria de cálculo, in order."""
+        steps = ["**1. Parámetros de Entrada:**",
+                 f"- Longitud (L): {self.length}",
+                 f"- Apoyo Izquierdo: {self.support_left}",
+                 f"- Apoyo Derecho: {self.support_right}"]
+        steps.extend(f"- {line}" for line in self.loads.describe())
+
+        steps.append("**2. Función de Carga Distribuida w(x):**")
+        steps.append(f"w(x) = {self.load_eq}")
+
+        steps.append("**3. Cálculo de Reacciones:**")
+        if len(self.unknowns) > 2:
+            steps.append(f"Viga hiperestática de grado {len(self.unknowns) - 2}: reacciones por el método de "
+                         "rigidez directa (elementos de Euler–Bernoulli).")
+            if self.EI <= 0:
+                steps.append("Con EI constante las reacciones no dependen de su valor; se usa EI = 1.")
+        if self.reaction_error is not None:
+            steps.append(f"Error al calcular reacciones: {self.reaction_error}")
+            steps.append("Usando reacciones por defecto (0).")
+        elif self.unknowns:
+            steps.append("Reacciones calculadas:")
+            steps.extend(f"- `{name} = {val:.3f}`" for name, val in self.reactions.items())
+        else:
+            steps.append("No hay incógnitas de reacción (viga estáticamente determinada por condiciones de contorno o libre).")
+
+        steps.append("**4. Ecuación de Fuerza Cortante V(x):**")
+        steps.append(f"V(x) = {self.shear_eq}")
+        steps.append("**5. Ecuación de Momento Flector M(x):**")
+        steps.append(f"M(x) = {self.moment_eq}")
+
+        x_m, m_max = self.extrema['moment']['abs_max']
+        steps.append("**6. Evaluación Numérica:**")
+        steps.append("- Evaluación numérica completada con polinomios por tramos (NumPy).")
+        steps.append(f"- Momento máximo |M|: {m_max:.3f} en x = {x_m:.3f}")
+
+        steps.append("**7. Pendiente y Deflexión:**")
+        if self.EI <= 0:
+            steps.append("- Se requiere EI > 0 para calcular la deflexión.")
+        elif self.reaction_error is not None:
+            steps.append("- No se calcula la deflexión sin reacciones válidas.")
+        elif self.conditions is None:
+            steps.append("- Los apoyos no fijan las constantes de integración (viga inestable).")
+        else:
+            x_y, y_max = self.extrema['deflection']['abs_max']
+            steps.append(f"- EI·y''(x) = M(x), con EI = {self.EI:g}")
+            steps.append(f"- Condiciones de contorno: {', '.join(self.conditions)}")
+            steps.append(f"- Deflexión máxima |y|: {abs(y_max):.4g} en x = {x_y:.3f}")
+        return steps
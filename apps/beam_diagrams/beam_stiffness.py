@@ -0,0 +1,215 @@
+"""
+Direct-stiffness solver for beams with Euler–Bernoulli elements.
+
+Used for statically indeterminate beams, where equilibrium alone does not
+give the reactions. The beam is meshed with a node at both ends and at every
+support only; each load enters the element that holds it as consistent
+(work-equivalent) nodal loads from the Hermite shape functions. For a
+uniform beam those elements reproduce the exact homogeneous solution, so
+the nodal displacements and reactions are exact wherever the loads sit, and
+loads a hair apart never create the tiny, stiff elements that would ruin
+the conditioning of the system.
+
+With two DOFs per node (deflection v, positive upwards, and rotation θ,
+counterclockwise) the global stiffness matrix has half-bandwidth 3. It is
+assembled directly in banded storage and factorized with a banded Cholesky
+decomposition, so the cost grows linearly with the number of elements.
+
+Load signs follow BeamLoads: positive forces act downward and positive
+moments are counterclockwise.
+"""
+
+import numpy as np
+
+from .beam_loads import BeamLoads
+
+BANDWIDTH = 3 # Half-bandwidth of the global matrix with DOFs ordered (v0, θ0, v1, θ1, ...)
+
+def element_stiffness(EI, lengths):
+    """(n, 4, 4) stiffness matrices of beam elements with DOFs (v1, θ1, v2, θ2)."""
+    l = np.asarray(lengths, dtype=float)
+    k = np.empty((len(l), 4, 4))
+    k[:] = [[12, 6, -12, 6], [6, 4, -6, 2], [-12, -6, 12, -6], [6, 2, -6, 4]]
+    # Scale the rotation rows and columns by l, then the whole matrix by EI / l^3
+    scale = np.ones((len(l), 4))
+    scale[:, [1, 3]] = l[:, None]
+    return k * scale[:, :, None] * scale[:, None, :] * (EI / l**3)[:, None, None]
+
+def cholesky_banded(ab, rtol=1e-12):
+    """
+    Cholesky factorization of a symmetric positive definite banded matrix
+    stored by lower diagonals: ab[i - j, j] = A[i, j] for i >= j. Returns the
+    factor in the same layout.
+
+    The band is only a few entries wide, so the sweep works on Python floats:
+    per column that is far cheaper than a handful of tiny NumPy operations.
+    Raises ValueError when a pivot collapses below `rtol` times its original
+    diagonal entry, i.e. the matrix is singular (a mechanism).
+    """
+    p, n = ab.shape[0] - 1, ab.shape[1]
+    band = ab.tolist()
+    diagonal = band[0][:]
+    for j in range(n):
+        pivot = band[0][j]
+        if pivot <= rtol * diagonal[j]:
+            raise ValueError("Sistema inestable: la matriz de rigidez es singular (mecanismo).")
+        pivot = pivot ** 0.5
+        band[0][j] = pivot
+        m = min(p, n - 1 - j)
+        column = [band[k][j] / pivot for k in range(1, m + 1)]
+        for k in range(1, m + 1):
+            band[k][j] = column[k - 1]
+            l_k = column[k - 1]
+            for i in range(m + 1 - k):
+                band[i][j + k] -= column[k - 1 + i] * l_k
+    return np.array(band)
+
+def solve_cholesky_banded(factor, b):
+    """Solves A x = b given the banded Cholesky factor of A."""
+    p, n = factor.shape[0] - 1, factor.shape[1]
+    band = factor.tolist()
+    x = [float(v) for v in b]
+    for j in range(n): # L y = b
+        x[j] /= band[0][j]
+        for k in range(1, min(p, n - 1 - j) + 1):
+            x[j + k] -= band[k][j] * x[j]
+    for j in range(n - 1, -1, -1): # L^T x = y
+        total = x[j]
+        for k in range(1, min(p, n - 1 - j) + 1):
+            total -= band[k][j] * x[j + k]
+        x[j] = total / band[0][j]
+    return np.array(x)
+
+def beam_mesh(length, support_positions=(), min_elements=0):
+    """
+    Node coordinates: both ends and the supports, with every interval split
+    evenly so the mesh has at least `min_elements` elements.
+
+    Refining does not improve the nodal results, which are already exact,
+    and the condition number grows as the fourth power of the element count;
+    it only adds nodes where intermediate deflections are wanted.
+    """
+    nodes = np.unique(np.concatenate(([0.0, length], np.asarray(support_positions, dtype=float))))
+    nodes = nodes[(nodes >= 0) & (nodes <= length)]
+    if min_elements > len(nodes) - 1:
+        widths = np.diff(nodes)
+        splits = np.maximum(1, np.ceil(widths / (length / min_elements))).astype(int)
+        nodes = np.concatenate([np.linspace(a, b, s, endpoint=False) for a, b, s in
+                                zip(nodes[:-1], nodes[1:], splits)] + [[length]])
+    return nodes
+
+def hermite_shape(xi, l):
+    """
+    Hermite shape functions (..., 4) of an element of length l at the local
+    coordinates xi in [0, 1], and their derivatives d/dx.
+    """
+    xi, l = np.broadcast_arrays(np.asarray(xi, dtype=float), np.asarray(l, dtype=float))
+    N = np.stack((1 - 3 * xi**2 + 2 * xi**3, l * (xi - 2 * xi**2 + xi**3),
+                  3 * xi**2 - 2 * xi**3, l * (xi**3 - xi**2)), axis=-1)
+    dN = np.stack(((6 * xi**2 - 6 * xi) / l, 1 - 4 * xi + 3 * xi**2,
+                   (6 * xi - 6 * xi**2) / l, 3 * xi**2 - 2 * xi), axis=-1)
+    return N, dN
+
+# 3-point Gauss–Legendre rule on [0, 1]: exact for the quartic w(x)·N(x)
+_GAUSS_POINTS = 0.5 + 0.5 * np.array([-np.sqrt(0.6), 0.0, np.sqrt(0.6)])
+_GAUSS_WEIGHTS = np.array([5.0, 8.0, 5.0]) / 18.0
+
+def nodal_loads(nodes, loads):
+    """
+    Global load vector (2 DOFs per node) in the FE sign convention (v up, θ ccw).
+
+    Point loads P and couples C inside an element give P·N and C·dN/dx at
+    their position; a distributed load gives ∫ w N dx over the part of the
+    element it covers.
+    """
+    f = np.zeros(2 * len(nodes))
+    l = np.diff(nodes)
+
+    def element_of(x):
+        return np.clip(np.searchsorted(nodes, x, side='right') - 1, 0, len(l) - 1)
+
+    def scatter(elements, values):
+        np.add.at(f, 2 * elements[:, None] + np.arange(4), values)
+
+    e = element_of(loads.point_positions)
+    N, _ = hermite_shape((loads.point_positions - nodes[e]) / l[e], l[e])
+    scatter(e, -loads.point_magnitudes[:, None] * N)
+    e = element_of(loads.moment_positions)
+    _, dN = hermite_shape((loads.moment_positions - nodes[e]) / l[e], l[e])
+    scatter(e, loads.moment_magnitudes[:, None] * dN)
+
+    # Overlap of every (element, distributed load) pair, integrated by Gauss
+    x1, x2 = nodes[:-1, None], nodes[1:, None]
+    lo = np.maximum(x1, loads.dist_starts[None, :])
+    hi = np.minimum(x2, loads.dist_ends[None, :])
+    span = np.maximum(hi - lo, 0.0)
+    x = lo[..., None] + span[..., None] * _GAUSS_POINTS # (elements, loads, 3)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k = np.where(loads.dist_ends > loads.dist_starts, (loads.dist_end_magnitudes - loads.dist_start_magnitudes)
+                     / (loads.dist_ends - loads.dist_starts), 0.0)
+    w = loads.dist_start_magnitudes[None, :, None] + k[None, :, None] * (x - loads.dist_starts[None, :, None])
+    N, _ = hermite_shape((x - x1[..., None]) / l[:, None, None], l[:, None, None])
+    element_f = -np.einsum('elg,g,elgi->ei', w * span[..., None], _GAUSS_WEIGHTS, N)
+    scatter(np.arange(len(l)), element_f)
+    return f
+
+def solve_beam_stiffness(length, loads, supports, EI=1.0, min_elements=0):
+    """
+    Solves a beam on any number of supports by the direct stiffness method.
+
+    `supports` maps a position to 'Simple' (v = 0) or 'Empotrado' (v = θ = 0);
+    'Libre' entries are ignored. Returns a dict with the 'nodes', the nodal
+    'deflections' and 'rotations', and 'reactions' as {x: (force, moment)}
+    with forces positive upwards and moments counterclockwise. Raises
+    ValueError when the supports allow a rigid-body motion.
+    """
+    if not isinstance(loads, BeamLoads):
+        loads = BeamLoads.from_params(loads)
+    loads = loads.clamped(length)
+    supports = {float(x): s for x, s in supports.items() if s in ('Simple', 'Empotrado')}
+    nodes = beam_mesh(length, list(supports), min_elements)
+    n_dofs = 2 * len(nodes)
+
+    # Assemble the lower band: entry (r, c) of element e goes to ab[r - c, 2e + c]
+    ke = element_stiffness(EI, np.diff(nodes))
+    r, c = np.tril_indices(4)
+    ab = np.zeros((BANDWIDTH + 1, n_dofs))
+    np.add.at(ab, (r - c, 2 * np.arange(len(ke))[:, None] + c), ke[:, r, c])
+    f = nodal_loads(nodes, loads)
+
+    restrained = []
+    for x, support in supports.items():
+        node = int(np.searchsorted(nodes, x))
+        restrained.append(2 * node)
+        if support == 'Empotrado':
+            restrained.append(2 * node + 1)
+    restrained = np.array(sorted(restrained), dtype=int)
+
+    # Zero the rows and columns of restrained DOFs and put 1 on their diagonal
+    for d in restrained:
+        ab[:, d] = 0.0
+        for offset in range(1, BANDWIDTH + 1):
+            if d - offset >= 0:
+                ab[offset, d - offset] = 0.0
+        ab[0, d] = 1.0
+    rhs = f.copy()
+    rhs[restrained] = 0.0
+    u = solve_cholesky_banded(cholesky_banded(ab), rhs)
+
+    # Reactions: R = K u - f on the restrained DOFs, with K u from the elements
+    ku = np.zeros(n_dofs)
+    element_dofs = 2 * np.arange(len(ke))[:, None] + np.arange(4)
+    np.add.at(ku, element_dofs, np.einsum('eij,ej->ei', ke, u[element_dofs]))
+    residual = ku - f
+    reactions = {}
+    for x, support in supports.items():
+        node = int(np.searchsorted(nodes, x))
+        moment = residual[2 * node + 1] if support == 'Empotrado' else 0.0
+        reactions[x] = (float(residual[2 * node]), float(moment))
+
+    return {
+        'nodes': nodes,
+        'deflections': u[0::2],
+        'rotations': u[1::2],
+        'reactions': reactions,
+    }
@@ -0,0 +1,171 @@
+"""
+Symbolic beam equations, derived once per topology.
+
+The symbolic path is for teaching: it writes V(x), M(x) and the reactions as
+formulas in the load symbols (P_1 at a_1, w_1 from b_1 to c_1, C_1 at d_1,
+...). Their form depends only on the supports and on how many loads of each
+kind there are, not on the numbers, so symbolic_beam derives it once per
+topology (the equilibrium solve, the LaTeX and the lambdified term
+coefficients) and keeps it in a process-wide LRU cache. A rerun with other
+values only evaluates those plain-arithmetic functions.
+
+SymPy is imported lazily, so the numerical engine never pays for it.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable
+
+from .beam_loads import BeamLoads
+from .beam_diagrams_calculator import reaction_unknowns
+from .beam_report import format_singularity_latex
+from ..profiling import stage, timed
+
+@dataclass(frozen=True)
+class SymbolicBeam:
+    """Symbolic V(x), M(x) and reactions of one beam topology."""
+    shear_latex: str
+    moment_latex: str
+    reactions_latex: dict # Solved reactions as LaTeX formulas (empty when indeterminate)
+    free_reactions: tuple # Reactions kept as symbols, taken from the numerical solution
+    shear_orders: tuple
+    moment_orders: tuple
+    terms: Callable # (argument values) -> [shear c, shear a, moment c, moment a, reactions]
+
+    def evaluate(self, L, loads, reactions):
+        """
+        Substitutes the numbers of a beam: returns the singularity terms
+        (c, a, n) of V and M and the reaction values, in the order of
+        reactions_latex.
+        """
+        values = [L]
+        values += loads.point_magnitudes.tolist() + loads.point_positions.tolist()
+        for a, b, w1, w2 in _active_distributed(loads):
+            values += [w1, a, b] if w1 == w2 else [w1, w2, a, b]
+        values += loads.moment_magnitudes.tolist() + loads.moment_positions.tolist()
+        values += [reactions[name] for name in self.free_reactions]
+        shear_c, shear_a, moment_c, moment_a, solved = self.terms(*values)
+        return (list(zip(shear_c, shear_a, self.shear_orders)),
+                list(zip(moment_c, moment_a, self.moment_orders)),
+                solved)
+
+def _active_distributed(loads):
+    """Distributed loads with a nonzero span, as (start, end, w_start, w_end)."""
+    return [(a, b, w1, w2) for a, b, w1, w2 in zip(loads.dist_starts.tolist(), loads.dist_ends.tolist(),
+                                                   loads.dist_start_magnitudes.tolist(),
+                                                   loads.dist_end_magnitudes.tolist()) if b > a]
+
+def beam_topology(params):
+    """Cache key of a beam: supports and the kind of every load."""
+    loads = BeamLoads.from_params(params).clamped(float(params['length']))
+    distributed = tuple('uniforme' if w1 == w2 else 'variable' for *_, w1, w2 in _active_distributed(loads))
+    return (params['support_left'], params['support_right'], len(loads.point_positions),
+            distributed, len(loads.moment_positions))
+
+@lru_cache(maxsize=64)
+@timed()
+def symbolic_beam(support_left, support_right, n_points, distributed, n_moments):
+    """
+    Derives the symbolic equations of a topology (see beam_topology).
+
+    Uses the same singularity terms and sign conventions as the numerical
+    engine. Reactions are solved from ΣFy and ΣM_A when the beam is
+    statically determinate; otherwise they stay as symbols.
+    """
+    import sympy
+
+    x, L = sympy.symbols('x L')
+    P = sympy.symbols(f'P_1:{n_points + 1}')
+    a = sympy.symbols(f'a_1:{n_points + 1}')
+    C = sympy.symbols(f'C_1:{n_moments + 1}')
+    d = sympy.symbols(f'd_1:{n_moments + 1}')
+    arguments = [L, *P, *a]
+    magnitudes = [*P, *C]
+    load_shear = []
+    total_force = sum(P, sympy.Integer(0))
+    total_moment = sum((Pi * ai for Pi, ai in zip(P, a)), sympy.Integer(0))
+    for i, kind in enumerate(distributed, 1):
+        b, c = sympy.symbols(f'b_{i} c_{i}')
+        if kind == 'uniforme':
+            w1 = w2 = sympy.Symbol(f'w_{i}')
+            arguments += [w1, b, c]
+            magnitudes.append(w1)
+            load_shear += [(w1, b, 1), (-w1, c, 1)]
+        else:
+            w1, w2 = sympy.symbols(f'w_{{{i}A}} w_{{{i}B}}')
+            arguments += [w1, w2, b, c]
+            magnitudes += [w1, w2]
+            k = (w2 - w1) / (c - b)
+            load_shear += [(w1, b, 1), (-w2, c, 1), (k / 2, b, 2), (-k / 2, c, 2)]
+        total_force += (c - b) * (w1 + w2) / 2
+        total_moment += (c - b) * (w1 * (2 * b + c) + w2 * (b + 2 * c)) / 6
+    load_shear += [(Pi, ai, 0) for Pi, ai in zip(P, a)]
+    arguments += [*C, *d]
+    total_moment -= sum(C, sympy.Integer(0))
+
+    # Equilibrium: ΣFy: R_A + R_B = F and ΣM_A: M_A + R_B·L + M_B = M_F
+    unknowns = reaction_unknowns(support_left, support_right)
+    R = {name: sympy.Symbol(name) if name in unknowns else sympy.Integer(0) for name in ('R_A', 'M_A', 'R_B', 'M_B')}
+    solution = {}
+    if len(unknowns) == 2:
+        equations = [R['R_A'] + R['R_B'] - total_force, R['M_A'] + R['R_B'] * L + R['M_B'] - total_moment]
+        with stage('sympy.solve'):
+            solution = sympy.solve(equations, [R[name] for name in unknowns], dict=True)
+        solution = solution[0] if solution else {}
+    # Grouped by load magnitude: the coefficient of each P_i, w_i, C_i is its influence
+    reactions = {name: sympy.collect(sympy.expand(solution[R[name]]), magnitudes) for name in unknowns if R[name] in solution}
+    solved = list(reactions)
+    free = [name for name in unknowns if name not in reactions]
+    arguments += [R[name] for name in free]
+
+    # V and M are written with the reaction symbols; the numbers use the solved formulas
+    shear = [(-R['R_A'], sympy.Integer(0), 0), *load_shear, (-R['R_B'], L, 0)]
+    moment = [(-R['M_A'], sympy.Integer(0), 0)]
+    moment += [(-c / (n + 1), p, n + 1) for c, p, n in shear]
+    moment += [(-Ci, di, 0) for Ci, di in zip(C, d)]
+    moment.append((-R['M_B'], L, 0))
+
+    def to_latex(terms):
+        expr = sympy.Add(*[c * sympy.SingularityFunction(x, p, n) for c, p, n in terms])
+        return sympy.latex(expr, order='none')
+
+    def coefficients(terms):
+        return [sympy.sympify(c).subs(solution) for c, _, _ in terms]
+
+    with stage('sympy.lambdify'):
+        terms = sympy.lambdify(arguments, [coefficients(shear), [p for _, p, _ in shear],
+                                           coefficients(moment), [p for _, p, _ in moment],
+                                           [reactions[name] for name in solved]], modules='math')
+    with stage('sympy.latex'):
+        shear_latex, moment_latex = to_latex(shear), to_latex(moment)
+        reactions_latex = {name: sympy.latex(reactions[name]) for name in solved}
+    return SymbolicBeam(
+        shear_latex=shear_latex,
+        moment_latex=moment_latex,
+        reactions_latex=reactions_latex,
+        free_reactions=tuple(free),
+        shear_orders=tuple(n for *_, n in shear),
+        moment_orders=tuple(n for *_, n in moment),
+        terms=terms,
+    )
+
+@timed()
+def build_symbolic_equations(params, reactions):
+    """
+    Symbolic and substituted equations of a beam for LaTeX rendering.
+
+    Returns a dict with the symbolic 'shear_latex' and 'moment_latex', the
+    solved 'reactions' as (name, formula, value) and the substituted
+    'shear_eq' and 'moment_eq'.
+    """
+    L = float(params['length'])
+    loads = BeamLoads.from_params(params).clamped(L)
+    beam = symbolic_beam(*beam_topology(params))
+    shear_terms, moment_terms, values = beam.evaluate(L, loads, reactions)
+    return {
+        'shear_latex': beam.shear_latex,
+        'moment_latex': beam.moment_latex,
+        'reactions': [(name, formula, value) for (name, formula), value in zip(beam.reactions_latex.items(), values)],
+        'shear_eq': format_singularity_latex(shear_terms),
+        'moment_eq': format_singularity_latex(moment_terms),
+    }
@@ -1,7 +1,9 @@
 import streamlit as st
 from apps.flexion.flexion_calculator import calculate_flexion
 from apps.flexion.flexion_visualizer import visualize_flexion
+from apps.profiling import profiled_page, stage
 
+@profiled_page('flexion')
 def main():
     st.title("‿ Simulador de flexión pura")
     st.write("Esta aplicación calcula flexión pura en distintos casos.")
@@ -38,7 +40,8 @@ def main():
 
         st.header("Visualización del esfuerzo de flexión")
         fig = visualize_flexion(moment, area_moment_of_inertia, beam_length)
-        st.pyplot(fig)
+        with stage('st.pyplot'):
+            st.pyplot(fig)
 
 if __name__ == "__main__":
     main()
@@ -1,3 +1,6 @@
+from apps.profiling import timed
+
+@timed()
 def calculate_flexion(moment, area_moment_of_inertia, distance_from_neutral_axis):
     """
     Calculates the bending stress due to pure flexion.
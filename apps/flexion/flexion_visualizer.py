@@ -1,6 +1,8 @@
-import matplotlib.pyplot as plt
 import numpy as np
 
+from apps.profiling import timed
+
+@timed()
 def visualize_flexion(moment, area_moment_of_inertia, beam_length, num_points=100):
     """
     Visualizes the bending stress distribution along a beam under pure flexion.
@@ -11,6 +13,7 @@ def visualize_flexion(moment, area_moment_of_inertia, beam_length, num_points=10
         beam_length (float): Length of the beam (m).
         num_points (int): Number of points to discretize the beam for visualization.
     """
+    import matplotlib.pyplot as plt # Imported on first use, not with the page
     x = np.linspace(-beam_length / 2, beam_length / 2, num_points)  # Beam length centered at 0
     stress = (moment * x) / area_moment_of_inertia  # Bending stress calculation
 
@@ -23,6 +26,7 @@ def visualize_flexion(moment, area_moment_of_inertia, beam_length, num_points=10
     return plt.gcf()  # Return the figure
 
 if __name__ == '__main__':
+    import matplotlib.pyplot as plt
     # Example usage:
     moment = 1000  # Nm
     area_moment_of_inertia = 0.0001  # m^4
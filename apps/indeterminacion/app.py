@@ -2,6 +2,7 @@ import streamlit as st
 import numpy as np
 from apps.indeterminacion.indeterminacion_calculator import IndeterminacionCalculator, CableParameters, MaterialProperties
 from apps.indeterminacion.indeterminacion_visualizer import IndeterminacionVisualizer
+from apps.profiling import profiled_page, stage
 
 def format_scientific(value: float, unit: str) -> str:
     """Formatea un valor científico con unidades."""
@@ -9,6 +10,7 @@ def format_scientific(value: float, unit: str) -> str:
         return f"{value:.2e} {unit}"
     return f"{value:.3f} {unit}"
 
+@profiled_page('indeterminacion')
 def render_indeterminacion_app():
     # Inicializar calculadora y visualizador
     if 'indeterminacion_calculator' not in st.session_state:
@@ -150,7 +152,8 @@ def render_indeterminacion_app():
             
             # Mostrar visualización
             fig = visualizer.create_figure(length1, length2, load, results)
-            st.pyplot(fig)
+            with stage('st.pyplot'):
+                st.pyplot(fig)
             
             # Mostrar resultados
             st.subheader("Resultados")
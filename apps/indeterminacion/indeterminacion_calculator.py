@@ -7,6 +7,8 @@ import numpy as np
 from dataclasses import dataclass
 from typing import Dict, Tuple, List
 
+from apps.profiling import timed
+
 @dataclass
 class MaterialProperties:
     """Predefined material properties."""
@@ -37,6 +39,7 @@ class IndeterminacionCalculator:
             "Titanio": MaterialProperties.TITANIUM
         }
 
+    @timed()
     def calculate_forces(self, cable1: CableParameters, cable2: CableParameters, 
                         load: float) -> Dict[str, float]:
         """
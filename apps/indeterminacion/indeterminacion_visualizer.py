@@ -4,9 +4,12 @@ It creates matplotlib figures showing the initial and deformed states of the sys
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle, Arrow
-from typing import Dict, Tuple
+from typing import Dict, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
+from apps.profiling import timed
 
 class IndeterminacionVisualizer:
     """Visualizer for the two-cable system using matplotlib."""
@@ -28,8 +31,9 @@ class IndeterminacionVisualizer:
             'arrow_color': '#2ecc71'
         }
 
+    @timed()
     def create_figure(self, L1: float, L2: float, load: float, 
-                     results: Dict[str, float] = None) -> plt.Figure:
+                     results: Dict[str, float] = None) -> 'plt.Figure':
         """
         Create a matplotlib figure showing the system configuration.
         
@@ -42,6 +46,10 @@ class IndeterminacionVisualizer:
         Returns:
             Matplotlib figure object
         """
+        # matplotlib is imported on first use, not with the page
+        import matplotlib.pyplot as plt
+        from matplotlib.patches import Arrow
+
         # Create figure and axis
         fig, ax = plt.subplots(figsize=(10, 6))
         
@@ -100,7 +108,7 @@ class IndeterminacionVisualizer:
         
         return fig
 
-    def _draw_configuration(self, ax: plt.Axes, 
+    def _draw_configuration(self, ax: 'plt.Axes', 
                           top_left: Tuple[float, float], bottom_left: Tuple[float, float],
                           top_right: Tuple[float, float], bottom_right: Tuple[float, float],
                           bar_width: float, bar_height: float,
@@ -115,6 +123,7 @@ class IndeterminacionVisualizer:
                 linewidth=style['linewidth'])
         
         # Draw bar
+        from matplotlib.patches import Rectangle
         bar = Rectangle((bottom_left[0], bottom_left[1] - bar_height/2),
                        bar_width, bar_height,
                        fill=False,
@@ -129,7 +138,7 @@ class IndeterminacionVisualizer:
                    color=style['color'],
                    markersize=6)
 
-    def _add_labels(self, ax: plt.Axes,
+    def _add_labels(self, ax: 'plt.Axes',
                    L1: float, L2: float, load: float,
                    top_left: Tuple[float, float], top_right: Tuple[float, float],
                    bottom_left: Tuple[float, float], bottom_right: Tuple[float, float]):
@@ -2,6 +2,7 @@ import streamlit as st
 import numpy as np
 from apps.mohr.mohr_calculator import MohrCalculator
 from apps.mohr.mohr_visualizer import MohrVisualizer
+from apps.profiling import profiled_page, stage
 
 def format_scientific(value: float, unit: str) -> str:
     """Formatea un valor científico con unidades."""
@@ -9,6 +10,7 @@ def format_scientific(value: float, unit: str) -> str:
         return f"{value:.2e} {unit}"
     return f"{value:.3f} {unit}"
 
+@profiled_page('mohr')
 def main():
     # Inicializar calculadora y visualizador
     if 'mohr_calculator' not in st.session_state:
@@ -114,7 +116,8 @@ def main():
             
             # Mostrar visualización
             fig = visualizer.create_figure(params, calculator)
-            st.plotly_chart(fig, use_container_width=True)
+            with stage('st.plotly_chart'):
+                st.plotly_chart(fig, use_container_width=True)
             
             # Mostrar resultados en una fila
             st.subheader("Resultados")
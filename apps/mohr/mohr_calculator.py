@@ -1,5 +1,7 @@
 import numpy as np
 
+from apps.profiling import timed
+
 class MohrCalculator:
     """
     Clase para realizar cálculos relacionados con el Círculo de Mohr.
@@ -11,6 +13,7 @@ class MohrCalculator:
         """Inicializa el calculador del Círculo de Mohr."""
         pass
     
+    @timed()
     def calculate_results(self, params):
         """
         Calcula los resultados basados en los parámetros de entrada.
@@ -73,6 +76,7 @@ class MohrCalculator:
         
         return results
     
+    @timed()
     def calculate_circle_points(self, params, num_points=100):
         """
         Calcula los puntos para graficar el Círculo de Mohr.
@@ -2,6 +2,8 @@ import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from apps.profiling import timed
+
 class MohrVisualizer:
     """
     Clase para visualizar el Círculo de Mohr y el elemento de esfuerzo.
@@ -38,6 +40,7 @@ class MohrVisualizer:
         if 'show_annotations' in options:
             self.show_annotations = options['show_annotations']
     
+    @timed()
     def create_figure(self, params, calculator):
         """
         Crea una figura con el Círculo de Mohr.
@@ -0,0 +1,145 @@
+"""
+Lightweight per-stage timing of the simulators.
+
+The calculator and visualizer entry points are marked with @timed (or a
+`with stage(name):` block, e.g. around a Streamlit chart call, which is
+where the figure is serialized) and the main function of every page with
+@profiled_page. Timings are collected per page run, in a context variable,
+so concurrent sessions never mix; while timing is off a marked function
+costs a single ContextVar lookup.
+
+Timing is on for every session when the SIM_PROFILE environment variable
+is set, and for one session when its URL has ?rendimiento=1, which also
+shows a collapsible "Rendimiento" panel at the end of the page. Each timed
+run is logged as one JSON object (page, session, total and every stage with
+its nesting depth) through the 'apps.profiling' logger, to the file named
+by SIM_PROFILE_LOG or to stderr.
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import time
+from contextlib import nullcontext
+
+logger = logging.getLogger(__name__)
+
+_current_run = contextvars.ContextVar('profiling_run', default=None)
+_NO_STAGE = nullcontext()
+
+class _Run:
+    """Stages of one page run, in the order they started."""
+    def __init__(self):
+        self.stages = []
+        self.depth = 0
+
+class _Stage:
+    """Context manager that records one stage of a run."""
+    __slots__ = ('run', 'entry', 'start')
+
+    def __init__(self, run, name):
+        self.run = run
+        self.entry = {'stage': name, 'depth': run.depth, 'ms': None}
+
+    def __enter__(self):
+        self.run.stages.append(self.entry)
+        self.run.depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.entry['ms'] = (time.perf_counter() - self.start) * 1e3
+        self.run.depth -= 1
+        return False
+
+def stage(name):
+    """Context manager timing a block as stage `name` (a no-op while timing is off)."""
+    run = _current_run.get()
+    return _NO_STAGE if run is None else _Stage(run, name)
+
+def timed(name=None):
+    """Decorator timing every call as a stage (named after the function by default)."""
+    def decorate(function):
+        label = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            run = _current_run.get()
+            if run is None:
+                return function(*args, **kwargs)
+            with _Stage(run, label):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def _configure_logger():
+    """JSON lines to SIM_PROFILE_LOG or stderr, unless handlers were set elsewhere."""
+    if logger.handlers:
+        return
+    path = os.environ.get('SIM_PROFILE_LOG')
+    handler = logging.FileHandler(path, encoding='utf-8') if path else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+def _session_id():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else None
+
+def log_run(page, run, total_ms, completed=True):
+    """Writes the structured record of a page run."""
+    _configure_logger()
+    logger.info(json.dumps({
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'page': page,
+        'session': _session_id(),
+        'completed': completed,
+        'total_ms': round(total_ms, 3),
+        'stages': [{**entry, 'ms': None if entry['ms'] is None else round(entry['ms'], 3)} for entry in run.stages],
+    }, ensure_ascii=False))
+
+def show_panel(run, total_ms):
+    """Collapsible "Rendimiento" panel with the stages of the run."""
+    import streamlit as st
+    with st.expander("⏱️ Rendimiento", expanded=False):
+        st.caption(f"Ejecución de la página: {total_ms:.1f} ms (sin contar el envío al navegador)")
+        st.dataframe([{
+            'Etapa': ' ' * (entry['depth'] - 1) + '↳ ' * (entry['depth'] > 0) + entry['stage'],
+            'Tiempo [ms]': round(entry['ms'], 2),
+            '% de la página': round(100 * entry['ms'] / total_ms, 1) if total_ms else 0.0,
+        } for entry in run.stages if entry['ms'] is not None], hide_index=True, use_container_width=True)
+
+def profiled_page(page):
+    """
+    Decorator for the main function of a page: times the run when profiling
+    is on for the session, logs it and, for ?rendimiento=1, shows the panel.
+    """
+    def decorate(main):
+        @functools.wraps(main)
+        def wrapper(*args, **kwargs):
+            import streamlit as st
+            panel = st.query_params.get('rendimiento') == '1'
+            if not (panel or os.environ.get('SIM_PROFILE')):
+                return main(*args, **kwargs)
+            run = _Run()
+            token = _current_run.set(run)
+            start = time.perf_counter()
+            try:
+                result = main(*args, **kwargs)
+            except BaseException:
+                # Also st.rerun() and st.stop(), which end the run early
+                _current_run.reset(token)
+                log_run(page, run, (time.perf_counter() - start) * 1e3, completed=False)
+                raise
+            _current_run.reset(token)
+            total_ms = (time.perf_counter() - start) * 1e3
+            log_run(page, run, total_ms)
+            if panel:
+                show_panel(run, total_ms)
+            return result
+        return wrapper
+    return decorate
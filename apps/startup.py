@@ -0,0 +1,185 @@
+"""
+Cold-start helpers of the multipage app.
+
+The heavy libraries are imported where they are first used (matplotlib by
+the visualizers that draw with it, pandas by the editable load tables,
+SymPy by the symbolic derivation), so opening a page only pays for what it
+shows. What is left to pay on the first visit is done ahead of time by
+start_warm_up: a daemon thread that imports those libraries, builds and
+serializes a throwaway figure with each plotting backend and fills the
+caches of the beam simulator (the symbolic derivation of every topology the
+dice can produce and the result of the manual-entry defaults).
+
+Streamlit has no server-start hook, so every page script calls
+start_warm_up() and only the first call of the process starts the thread.
+SIM_WARMUP=0 disables it. Each step is timed and logged through the
+'apps.startup' logger; a failing step is logged and skipped.
+
+`python -m apps.startup [--json]` measures the cold import time of every
+page module, each in a fresh interpreter after streamlit (which the pages
+import anyway), and lists the heavy libraries it pulls in.
+"""
+
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Modules of the pages and the heavy libraries they may pull in
+APP_MODULES = (
+    'apps.torsion.app',
+    'apps.traccion.app',
+    'apps.indeterminacion.app',
+    'apps.flexion.app',
+    'apps.mohr.app',
+    'apps.beam_diagrams.app',
+)
+HEAVY_MODULES = ('numpy', 'pandas', 'plotly.graph_objects', 'matplotlib', 'matplotlib.pyplot', 'sympy')
+
+_warm_up_lock = threading.Lock()
+_warm_up_thread = None
+
+# --- Import-time report ---
+_IMPORT_PROBE = """
+import json, sys, time
+import streamlit
+before = set(sys.modules)
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules and name not in before]
+print(json.dumps({{'seconds': elapsed, 'heavy': heavy}}))
+"""
+
+def import_time(module, heavy=HEAVY_MODULES):
+    """Cold import of `module` in a fresh interpreter: {'seconds', 'heavy'} (libraries it loaded)."""
+    import json
+    import subprocess
+    import sys
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    completed = subprocess.run([sys.executable, '-c', _IMPORT_PROBE.format(module=module, heavy=tuple(heavy))],
+                               cwd=root, capture_output=True, text=True, check=False)
+    if completed.returncode != 0:
+        raise ValueError(f"No se pudo importar {module}: {completed.stderr.strip().splitlines()[-1:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def import_report(modules=APP_MODULES + HEAVY_MODULES):
+    """Cold import time of every module, slowest first."""
+    report = [{'module': module, **import_time(module)} for module in modules]
+    return sorted(report, key=lambda entry: entry['seconds'], reverse=True)
+
+# --- Warm-up ---
+def _warm_imports():
+    import numpy # noqa: F401
+    import pandas # noqa: F401
+
+def _warm_plotly():
+    """First figure of the process: validators and the JSON encoder are built lazily by plotly."""
+    import numpy as np
+    import plotly.graph_objects as go
+    x = np.linspace(0.0, 1.0, 8)
+    fig = go.Figure([go.Scatter(x=x, y=x), go.Surface(z=np.outer(x, x)), go.Scatter3d(x=x, y=x, z=x)])
+    fig.to_json()
+
+def _warm_matplotlib():
+    """Loads matplotlib, its fonts and the Agg renderer without touching pyplot's global state."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(2, 2))
+    ax = fig.add_subplot()
+    ax.plot([0, 1], [0, 1], label='x')
+    ax.set_title('x')
+    ax.legend()
+    FigureCanvasAgg(fig).draw()
+
+def _dice_topologies():
+    """Topologies of every dice roll: only the supports change the symbolic problem."""
+    from .beam_diagrams.beam_diagrams_calculator import interpret_dice_results
+    from .beam_diagrams.beam_symbolic import beam_topology
+    topologies = []
+    for left in (1, 4): # Empotrado, Simple
+        for right in (1, 4): # Simple, Libre
+            rolls = {'support_left': [left], 'length': [3, 3], 'point_load_p_pos': [3, 3],
+                     'point_load_p_mag': [2, 2, 2], 'dist_load_w_mag': [2, 2, 2], 'dist_load_w_span': [2, 5],
+                     'support_right': [right], 'EI': [3, 3, 3]}
+            topologies.append(beam_topology(interpret_dice_results(rolls)))
+    return topologies
+
+def _manual_defaults_params():
+    """The params the beam page computes when the manual entry is first opened."""
+    from .beam_diagrams.app import MANUAL_DEFAULTS
+    from .beam_diagrams.beam_loads import BeamLoads
+    return {
+        'length': MANUAL_DEFAULTS['length'],
+        'support_left': MANUAL_DEFAULTS['support_left'],
+        'support_right': MANUAL_DEFAULTS['support_right'],
+        **BeamLoads.from_params(MANUAL_DEFAULTS).to_params(),
+        'EI': MANUAL_DEFAULTS['EI'],
+    }
+
+def _warm_symbolic():
+    from .beam_diagrams.beam_symbolic import beam_topology, symbolic_beam
+    for topology in _dice_topologies() + [beam_topology(_manual_defaults_params())]:
+        symbolic_beam(*topology)
+
+def _warm_beam_results():
+    from .beam_diagrams.beam_cache import cached_beam_diagrams
+    cached_beam_diagrams(_manual_defaults_params())
+
+WARM_UP_STEPS = (
+    ('imports', _warm_imports),
+    ('plotly', _warm_plotly),
+    ('matplotlib', _warm_matplotlib),
+    ('beam.symbolic', _warm_symbolic),
+    ('beam.results', _warm_beam_results),
+)
+
+def warm_up(steps=WARM_UP_STEPS):
+    """Runs the warm-up steps in order; returns {step: seconds} of the ones that succeeded."""
+    timings = {}
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            logger.exception("Warm-up step %s failed", name)
+            continue
+        timings[name] = time.perf_counter() - start
+        logger.info("Warm-up step %s: %.3f s", name, timings[name])
+    return timings
+
+def start_warm_up(delay=1.0):
+    """
+    Starts warm_up in a daemon thread, once per process (later calls are
+    no-ops). The delay lets the page that triggered it render first.
+    """
+    global _warm_up_thread
+    if os.environ.get('SIM_WARMUP', '1') == '0':
+        return None
+    with _warm_up_lock:
+        if _warm_up_thread is None:
+            def run():
+                time.sleep(delay)
+                warm_up()
+            _warm_up_thread = threading.Thread(target=run, name='sim-warm-up', daemon=True)
+            _warm_up_thread.start()
+        return _warm_up_thread
+
+def main(argv=None):
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description="Tiempo de importación en frío de los módulos de la aplicación.")
+    parser.add_argument('--json', action='store_true', help="Imprime el informe en JSON.")
+    args = parser.parse_args(argv)
+    report = import_report()
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{'módulo':<28} {'tiempo [s]':>10}  librerías pesadas que carga")
+    for entry in report:
+        print(f"{entry['module']:<28} {entry['seconds']:>10.3f}  {', '.join(entry['heavy']) or '-'}")
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,48 @@
 import streamlit as st
 import numpy as np
-from apps.torsion.torsion_calculator import TorsionCalculator
-from apps.torsion.torsion_visualizer import TorsionVisualizer
+from apps.torsion.torsion_calculator import QUADRATURE_METHODS, TorsionCalculator
+from apps.torsion.torsion_shaft import SUPPORTS, SteppedShaft, TaperedShaft
+from apps.torsion.torsion_visualizer import LEVELS_OF_DETAIL, MAX_DEFORMATION_SCALE, TorsionVisualizer
+from apps.profiling import profiled_page, stage
+
+SHAFT_TYPES = ('Uniforme', 'Escalonado', 'Variable')
+
+# Tablas iniciales del eje escalonado y sus columnas (claves de SteppedShaft.from_tables)
+SHAFT_DEFAULTS = {
+    'segments': [
+        {'length': 0.5, 'outer_diameter': 0.1, 'inner_diameter': 0.0, 'shear_modulus': 80.0},
+        {'length': 0.5, 'outer_diameter': 0.06, 'inner_diameter': 0.0, 'shear_modulus': 80.0},
+    ],
+    'torques': [
+        {'position': 0.5, 'magnitude': 2000.0},
+        {'position': 1.0, 'magnitude': -800.0},
+    ],
+}
+
+# Perfil inicial del eje de sección variable y sus columnas (claves de TaperedShaft.from_table)
+PROFILE_DEFAULTS = [
+    {'position': 0.0, 'outer_diameter': 0.1, 'inner_diameter': 0.0},
+    {'position': 0.4, 'outer_diameter': 0.1, 'inner_diameter': 0.0},
+    {'position': 0.6, 'outer_diameter': 0.07, 'inner_diameter': 0.0},
+    {'position': 1.0, 'outer_diameter': 0.05, 'inner_diameter': 0.0},
+]
+PROFILE_COLUMNS = {
+    'position': st.column_config.NumberColumn("Posición x (m)", min_value=0.0, format="%.3f"),
+    'outer_diameter': st.column_config.NumberColumn("d exterior (m)", min_value=0.0, format="%.3f"),
+    'inner_diameter': st.column_config.NumberColumn("d interior (m)", min_value=0.0, format="%.3f"),
+}
+SHAFT_TABLE_COLUMNS = {
+    'segments': {
+        'length': st.column_config.NumberColumn("Longitud (m)", min_value=0.0, format="%.3f"),
+        'outer_diameter': st.column_config.NumberColumn("d exterior (m)", min_value=0.0, format="%.3f"),
+        'inner_diameter': st.column_config.NumberColumn("d interior (m)", min_value=0.0, format="%.3f"),
+        'shear_modulus': st.column_config.NumberColumn("G (GPa)", min_value=0.0, format="%.1f"),
+    },
+    'torques': {
+        'position': st.column_config.NumberColumn("Posición x (m)", min_value=0.0, format="%.3f"),
+        'magnitude': st.column_config.NumberColumn("Momento T (N⋅m)", format="%.1f"),
+    },
+}
 
 def format_scientific(value: float, unit: str) -> str:
     """Formatea un valor científico con unidades."""
@@ -9,6 +50,216 @@ def format_scientific(value: float, unit: str) -> str:
         return f"{value:.2e} {unit}"
     return f"{value:.3f} {unit}"
 
+def visualization_inputs(visualizer: TorsionVisualizer, animation: bool = True) -> bool:
+    """
+    Controles de visualización (compartidos por los dos tipos de eje); aplica
+    las opciones al visualizador y devuelve si se anima la escala.
+    """
+    with st.expander("Visualización", expanded=True):
+        animate_scale = animation and st.checkbox("Animar la escala en el gráfico",
+                                                  value=False,
+                                                  help="Precalcula la deformación para varias escalas: el control "
+                                                       "deslizante del gráfico las recorre sin volver a calcular.",
+                                                  key='animate_scale')
+        deformation_scale = st.slider("Escala de deformación", 
+                                    min_value=0.0, 
+                                    max_value=MAX_DEFORMATION_SCALE, 
+                                    value=1.0, 
+                                    step=0.1,
+                                    disabled=animate_scale,
+                                    key='deformation_scale')
+        
+        show_original = st.checkbox("Mostrar estado original", 
+                                  value=True,
+                                  key='show_original')
+        show_deformed = st.checkbox("Mostrar estado deformado", 
+                                  value=True,
+                                  key='show_deformed')
+        show_stress = st.checkbox("Mostrar distribución de esfuerzos", 
+                                value=True,
+                                key='show_stress')
+        show_grid = st.checkbox("Mostrar malla de referencia", 
+                              value=True,
+                              key='show_grid')
+        show_wireframe = st.checkbox("Mostrar malla del modelo", 
+                                   value=False,
+                                   key='show_wireframe')
+        level_of_detail = st.selectbox("Nivel de detalle",
+                                     list(LEVELS_OF_DETAIL),
+                                     index=list(LEVELS_OF_DETAIL).index('Medio'),
+                                     help="Limita las secciones y los puntos de la malla enviados al navegador.",
+                                     key='level_of_detail')
+        
+        if st.button("Reiniciar visualización", key='reset_btn'):
+            st.session_state.deformation_scale = 1.0
+            st.rerun()
+
+    visualizer.set_visualization_options(
+        show_original=show_original,
+        show_deformed=show_deformed,
+        show_stress=show_stress,
+        show_grid=show_grid,
+        show_wireframe=show_wireframe
+    )
+    visualizer.set_deformation_scale(deformation_scale)
+    visualizer.set_level_of_detail(level_of_detail)
+    return animate_scale
+
+def stepped_shaft_page(calculator: TorsionCalculator, visualizer: TorsionVisualizer):
+    """Eje de varios tramos con momentos torsores en cualquier posición."""
+    col1, col2 = st.columns([1, 2])
+
+    with col1:
+        st.subheader("Parámetros de Entrada")
+        supports = st.selectbox("Apoyos", list(SUPPORTS), key='shaft_supports')
+
+        # Las tablas se crean una vez y después son de los editores
+        if 'shaft_tables' not in st.session_state:
+            import pandas as pd # Solo las tablas editables necesitan pandas
+            st.session_state.shaft_tables = {
+                name: pd.DataFrame(SHAFT_DEFAULTS[name], columns=list(columns))
+                for name, columns in SHAFT_TABLE_COLUMNS.items()
+            }
+        tables = {}
+        for name, title in (('segments', "Tramos (de izquierda a derecha)"),
+                            ('torques', "Momentos torsores (+: regla de la mano derecha sobre +x)")):
+            st.markdown(f"**{title}**")
+            tables[name] = st.data_editor(
+                st.session_state.shaft_tables[name], num_rows="dynamic", hide_index=True,
+                column_config=SHAFT_TABLE_COLUMNS[name], key=f'shaft_{name}'
+            ).dropna(subset=[column for column in SHAFT_TABLE_COLUMNS[name] if column != 'inner_diameter'])
+
+        visualization_inputs(visualizer, animation=False)
+
+    with col2:
+        try:
+            shaft = SteppedShaft.from_tables(tables['segments'].to_dict('records'),
+                                             tables['torques'].to_dict('records'), supports)
+            results = calculator.calculate_shaft(shaft)
+
+            fig = visualizer.create_shaft_figure(shaft, results)
+            with stage('st.plotly_chart'):
+                st.plotly_chart(fig, use_container_width=True)
+
+            st.subheader("Resultados")
+            col_res1, col_res2 = st.columns(2)
+            with col_res1:
+                st.metric("Reacción T_A (x = 0)", format_scientific(results['reactions']['T_A'], "N⋅m"))
+                st.metric("Reacción T_B (x = L)", format_scientific(results['reactions']['T_B'], "N⋅m"))
+            with col_res2:
+                st.metric("Ángulo de torsión total", format_scientific(results['total_twist_degrees'], "°"))
+                st.metric("Esfuerzo cortante máximo", format_scientific(results['max_shear_stress_overall']/1e6, "MPa"))
+
+            nodes = results['nodes']
+            st.dataframe({
+                'Tramo': results['segment'] + 1,
+                'Desde x (m)': nodes[:-1],
+                'Hasta x (m)': nodes[1:],
+                'T (N⋅m)': results['internal_torque'],
+                'J (m⁴)': results['polar_moment_of_inertia'],
+                'τ máx (MPa)': results['max_shear_stress'] / 1e6,
+                'φ (°)': np.degrees(results['twist_angle']),
+            }, hide_index=True, use_container_width=True)
+
+            with stage('st.plotly_chart'):
+                st.plotly_chart(visualizer.create_torque_diagram(results), use_container_width=True)
+
+            st.subheader("Ecuaciones Fundamentales")
+            st.latex(r"T_A + T_B + \sum_i T_i = 0")
+            st.latex(r"\tau_{max,j} = \frac{T_j r_j}{J_j} \qquad \varphi_j = \frac{T_j L_j}{G_j J_j}")
+            st.latex(r"\varphi_{total} = \sum_j \varphi_j \quad (= 0 \text{ si ambos extremos están empotrados})")
+        except Exception as e:
+            st.error(f"Error en la simulación: {str(e)}")
+            st.error("Por favor, verifique los tramos y los momentos torsores.")
+
+def tapered_shaft_page(calculator: TorsionCalculator, visualizer: TorsionVisualizer):
+    """Eje de sección variable (troncocónico o con un perfil muestreado) con un momento en el extremo libre."""
+    col1, col2 = st.columns([1, 2])
+
+    with col1:
+        st.subheader("Parámetros de Entrada")
+        with st.expander("Geometría", expanded=True):
+            profile = st.radio("Perfil de diámetros", ('Cónico', 'Perfil muestreado'), horizontal=True,
+                               key='tapered_profile')
+            if profile == 'Cónico':
+                length = st.number_input("Longitud (m)", min_value=0.1, value=1.0, step=0.1, key='tapered_length')
+                outer_start = st.number_input("Diámetro exterior en x = 0 (m)", min_value=0.01, value=0.1,
+                                              step=0.01, key='tapered_outer_start')
+                outer_end = st.number_input("Diámetro exterior en x = L (m)", min_value=0.01, value=0.05,
+                                            step=0.01, key='tapered_outer_end')
+                inner_start = st.number_input("Diámetro interior en x = 0 (m)", min_value=0.0, value=0.0,
+                                              step=0.01, key='tapered_inner_start')
+                inner_end = st.number_input("Diámetro interior en x = L (m)", min_value=0.0, value=0.0,
+                                            step=0.01, key='tapered_inner_end')
+            else:
+                st.markdown("Diámetros en cada punto (lineales entre puntos; el primero en x = 0 y el último en x = L)")
+                if 'tapered_points_table' not in st.session_state:
+                    import pandas as pd # Solo las tablas editables necesitan pandas
+                    st.session_state.tapered_points_table = pd.DataFrame(PROFILE_DEFAULTS, columns=list(PROFILE_COLUMNS))
+                points = st.data_editor(
+                    st.session_state.tapered_points_table, num_rows="dynamic", hide_index=True,
+                    column_config=PROFILE_COLUMNS, key='tapered_points'
+                ).dropna(subset=['position', 'outer_diameter'])
+
+        with st.expander("Material y carga", expanded=True):
+            shear_modulus = st.number_input("Módulo de corte (GPa)", min_value=1.0, value=80.0, step=1.0,
+                                            key='tapered_shear_modulus')
+            torque = st.number_input("Momento torsor en el extremo libre (N⋅m)", value=1000.0, step=10.0,
+                                     key='tapered_torque')
+
+        with st.expander("Integración numérica", expanded=False):
+            method = st.selectbox("Método", QUADRATURE_METHODS, key='tapered_method',
+                                  help="Gauss-Legendre o Simpson compuesto sobre subintervalos iguales.")
+            order = st.slider("Puntos de Gauss por subintervalo", min_value=1, max_value=8, value=3,
+                              disabled=method != 'Gauss', key='tapered_order')
+            intervals = st.slider("Subintervalos", min_value=4, max_value=512, value=64, key='tapered_intervals')
+            refine = st.checkbox("Refinar hasta una tolerancia", value=False, key='tapered_refine',
+                                 help="Duplica los subintervalos hasta que el giro total cambia menos que la tolerancia.")
+            rtol = st.number_input("Tolerancia relativa", min_value=1e-14, max_value=1e-2, value=1e-8,
+                                   format="%.1e", disabled=not refine, key='tapered_rtol')
+
+        visualization_inputs(visualizer, animation=False)
+
+    with col2:
+        try:
+            if profile == 'Cónico':
+                shaft = TaperedShaft.conical(length, outer_start, outer_end, inner_start, inner_end,
+                                             shear_modulus, torque)
+            else:
+                shaft = TaperedShaft.from_table(points.to_dict('records'), shear_modulus, torque)
+            results = calculator.calculate_tapered(shaft, intervals, method, order, rtol if refine else None)
+
+            fig = visualizer.create_tapered_figure(shaft, results)
+            with stage('st.plotly_chart'):
+                st.plotly_chart(fig, use_container_width=True)
+
+            st.subheader("Resultados")
+            col_res1, col_res2 = st.columns(2)
+            with col_res1:
+                st.metric("Ángulo de torsión", format_scientific(results['twist_angle_degrees'], "°"))
+                st.metric("Subintervalos usados", results['intervals'])
+            with col_res2:
+                st.metric("Esfuerzo cortante máximo", format_scientific(results['max_shear_stress_overall']/1e6, "MPa"))
+                if results['estimated_error'] is not None:
+                    st.metric("Error estimado del giro", format_scientific(np.degrees(results['estimated_error']), "°"))
+            if profile == 'Cónico' and inner_start == 0 and inner_end == 0:
+                # Solución cerrada del cono macizo, como referencia de la integración
+                exact = (32 * torque * length / (3 * np.pi * shear_modulus * 1e9)
+                         * (outer_start**2 + outer_start * outer_end + outer_end**2) / (outer_start * outer_end)**3)
+                st.caption(f"Solución exacta del cono macizo: {np.degrees(exact):.6g}° "
+                           f"(diferencia relativa {abs(results['twist_angle'] - exact) / abs(exact or 1):.1e})")
+
+            with stage('st.plotly_chart'):
+                st.plotly_chart(visualizer.create_twist_diagram(results), use_container_width=True)
+
+            st.subheader("Ecuaciones Fundamentales")
+            st.latex(r"\varphi(x) = \int_0^x \frac{T}{G\,J(s)}\,ds")
+            st.latex(r"J(x) = \frac{\pi}{32}\left(d_o(x)^4 - d_i(x)^4\right) \qquad \tau_{max}(x) = \frac{T\,d_o(x)}{2\,J(x)}")
+        except Exception as e:
+            st.error(f"Error en la simulación: {str(e)}")
+            st.error("Por favor, verifique el perfil de diámetros.")
+
+@profiled_page('torsion')
 def main():
     # Inicializar calculadora y visualizador
     if 'torsion_calculator' not in st.session_state:
@@ -25,6 +276,16 @@ def main():
     Esta aplicación simula la deformación torsional en elementos cilíndricos, 
     permitiendo visualizar la distribución de esfuerzos y calcular parámetros clave.
     """)
+    shaft_type = st.radio("Tipo de eje", SHAFT_TYPES, horizontal=True,
+                          help="Escalonado: varios tramos y momentos torsores, con el diagrama de momento torsor. "
+                               "Variable: diámetro que cambia a lo largo del eje (cónico o por puntos).",
+                          key='shaft_type')
+    if shaft_type == 'Escalonado':
+        stepped_shaft_page(calculator, visualizer)
+        return
+    if shaft_type == 'Variable':
+        tapered_shaft_page(calculator, visualizer)
+        return
     
     # Layout de dos columnas
     col1, col2 = st.columns([1, 2])
@@ -84,33 +345,7 @@ def main():
                                    key='torque')
         
         # Visualización
-        with st.expander("Visualización", expanded=True):
-            deformation_scale = st.slider("Escala de deformación", 
-                                        min_value=0.0, 
-                                        max_value=10.0, 
-                                        value=1.0, 
-                                        step=0.1,
-                                        key='deformation_scale')
-            
-            show_original = st.checkbox("Mostrar estado original", 
-                                      value=True,
-                                      key='show_original')
-            show_deformed = st.checkbox("Mostrar estado deformado", 
-                                      value=True,
-                                      key='show_deformed')
-            show_stress = st.checkbox("Mostrar distribución de esfuerzos", 
-                                    value=True,
-                                    key='show_stress')
-            show_grid = st.checkbox("Mostrar malla de referencia", 
-                                  value=True,
-                                  key='show_grid')
-            show_wireframe = st.checkbox("Mostrar malla del modelo", 
-                                       value=False,
-                                       key='show_wireframe')
-            
-            if st.button("Reiniciar visualización", key='reset_btn'):
-                st.session_state.deformation_scale = 1.0
-                st.rerun()
+        animate_scale = visualization_inputs(visualizer)
     
     # Panel de visualización y resultados (columna derecha)
     with col2:
@@ -127,22 +362,13 @@ def main():
                 'torque': torque
             }
             
-            # Actualizar opciones de visualización
-            visualizer.set_visualization_options(
-                show_original=show_original,
-                show_deformed=show_deformed,
-                show_stress=show_stress,
-                show_grid=show_grid,
-                show_wireframe=show_wireframe
-            )
-            visualizer.set_deformation_scale(deformation_scale)
-            
             # Calcular resultados
             results = calculator.calculate_results(params)
             
             # Mostrar visualización 3D
-            fig = visualizer.create_figure(params)
-            st.plotly_chart(fig, use_container_width=True)
+            fig = visualizer.create_figure(params, results, animate=animate_scale)
+            with stage('st.plotly_chart'):
+                st.plotly_chart(fig, use_container_width=True)
             
             # Mostrar resultados
             st.subheader("Resultados")
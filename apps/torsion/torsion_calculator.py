@@ -1,4 +1,49 @@
 import numpy as np
+from functools import lru_cache
+
+from apps.profiling import timed
+from apps.torsion.torsion_shaft import SUPPORTS, SteppedShaft, TaperedShaft
+
+# Reglas de integración del giro de los ejes de sección variable
+QUADRATURE_METHODS = ('Gauss', 'Simpson')
+# Límite de subintervalos al refinar hasta la tolerancia pedida
+MAX_INTERVALS = 2**14
+
+@lru_cache(maxsize=16)
+def gauss_legendre(order: int):
+    """Nodos y pesos de Gauss-Legendre en [-1, 1] (de solo lectura)."""
+    nodes, weights = np.polynomial.legendre.leggauss(order)
+    nodes.flags.writeable = False
+    weights.flags.writeable = False
+    return nodes, weights
+
+def integrate_intervals(function, edges: np.ndarray, method: str = 'Gauss', order: int = 3) -> np.ndarray:
+    """
+    Integral de una función vectorizada en cada subintervalo [edges[k], edges[k+1]].
+
+    Todos los puntos de integración se evalúan en una sola llamada a function
+    (un array de subintervalos × puntos).
+
+    Args:
+        function: Función vectorizada f(x)
+        edges: Extremos de los subintervalos, crecientes
+        method: 'Gauss' (Gauss-Legendre de order puntos, exacta para
+            polinomios de grado 2·order − 1) o 'Simpson'
+        order: Puntos de Gauss por subintervalo
+
+    Returns:
+        Array con la integral de cada subintervalo
+    """
+    start, width = edges[:-1], np.diff(edges)
+    if method == 'Simpson':
+        values = function(np.concatenate((edges, start + width / 2)))
+        ends, middle = values[:len(edges)], values[len(edges):]
+        return width / 6 * (ends[:-1] + 4 * middle + ends[1:])
+    if method != 'Gauss':
+        raise ValueError(f"Método de integración desconocido: {method}")
+    nodes, weights = gauss_legendre(order)
+    points = (start + width / 2)[:, None] + (width / 2)[:, None] * nodes
+    return width / 2 * (function(points) @ weights)
 
 class TorsionCalculator:
     def __init__(self):
@@ -69,6 +114,7 @@ class TorsionCalculator:
         """
         return (angle * segment_index) / total_segments
 
+    @timed()
     def calculate_results(self, params: dict) -> dict:
         """
         Calcula todos los resultados relevantes.
@@ -109,3 +155,142 @@ class TorsionCalculator:
             'twist_angle_degrees': np.degrees(twist_angle),
             'max_shear_stress': max_shear_stress
         }
+
+    @timed()
+    def calculate_shaft(self, shaft: SteppedShaft) -> dict:
+        """
+        Calcula un eje escalonado con varios momentos torsores.
+
+        Los tramos se subdividen en los puntos de aplicación de los momentos
+        (piezas de momento interno constante). El momento interno de todas las
+        piezas sale de una suma acumulada de los momentos aplicados y las
+        reacciones T_A y T_B de un sistema 2×2: equilibrio
+        T_A + T_B + ΣT_i = 0 y la condición de apoyo; con los dos extremos
+        empotrados, compatibilidad: el giro relativo entre extremos
+        Σ T_j L_j / (G_j J_j) es nulo.
+
+        Args:
+            shaft: Eje escalonado (ver SteppedShaft)
+
+        Returns:
+            Diccionario con los resultados calculados; los arrays por pieza
+            tienen un valor por pieza y 'rotation' uno por nodo
+        """
+        nodes, segment = shaft.pieces()
+        lengths = np.diff(nodes)
+        outer = shaft.outer_diameters[segment]
+        inner = shaft.inner_diameters[segment]
+        G = shaft.shear_moduli[segment] * 1e9 # Convertir GPa a Pa
+        J = self.calculate_polar_moment_of_inertia(outer, inner)
+        flexibility = lengths / (G * J)
+
+        # Momentos aplicados en cada nodo y suma acumulada hasta el inicio de cada pieza
+        node_torques = np.zeros(len(nodes))
+        at_node = np.abs(nodes[:, None] - shaft.torque_positions).argmin(axis=0)
+        np.add.at(node_torques, at_node, shaft.torque_magnitudes)
+        applied_left = np.cumsum(node_torques)[:-1]
+
+        # T_j = -(T_A + Σ T_i a la izquierda); reacciones del sistema [equilibrio; apoyo]
+        left_fixed, right_fixed = SUPPORTS[shaft.supports]
+        if left_fixed and right_fixed:
+            support_row, support_rhs = [flexibility.sum(), 0.0], -(applied_left * flexibility).sum()
+        elif left_fixed:
+            support_row, support_rhs = [0.0, 1.0], 0.0 # T_B = 0
+        else:
+            support_row, support_rhs = [1.0, 0.0], 0.0 # T_A = 0
+        T_A, T_B = np.linalg.solve([[1.0, 1.0], support_row], [-node_torques.sum(), support_rhs])
+        internal_torque = -(T_A + applied_left)
+
+        twist = internal_torque * flexibility
+        rotation = np.concatenate(([0.0], np.cumsum(twist)))
+        if not left_fixed:
+            rotation -= rotation[-1] # Giro nulo en el empotramiento derecho
+        elif right_fixed:
+            rotation[-1] = 0.0 # Ya lo impone la compatibilidad; se descarta el error de redondeo
+        max_shear_stress = internal_torque * (outer / 2) / J
+
+        return {
+            'nodes': nodes,
+            'segment': segment,
+            'internal_torque': internal_torque,
+            'polar_moment_of_inertia': J,
+            'max_shear_stress': max_shear_stress,
+            'twist_angle': twist,
+            'rotation': rotation,
+            'total_twist': float(rotation[-1] - rotation[0]),
+            'total_twist_degrees': float(np.degrees(rotation[-1] - rotation[0])),
+            'max_shear_stress_overall': float(np.abs(max_shear_stress).max()),
+            'reactions': {'T_A': float(T_A), 'T_B': float(T_B)},
+        }
+
+    @timed()
+    def calculate_tapered(self, shaft: TaperedShaft, intervals: int = 64, method: str = 'Gauss',
+                          order: int = 3, rtol: float = None) -> dict:
+        """
+        Calcula un eje de sección variable integrando φ(x) = ∫ T / (G J(x)) dx.
+
+        La integral se acumula subintervalo a subintervalo, de modo que se
+        obtiene el giro en todos los extremos de los subintervalos y no solo
+        el total. Los subintervalos se reparten entre los quiebres del perfil
+        (TaperedShaft.breakpoints) en proporción a su longitud, así el
+        integrando es suave en cada uno. Con rtol, el número de subintervalos
+        se duplica hasta que el giro total cambia menos que rtol (relativo)
+        entre dos pasadas.
+
+        Args:
+            shaft: Eje de sección variable (ver TaperedShaft)
+            intervals: Subintervalos iniciales (iguales) a lo largo del eje
+            method: Uno de QUADRATURE_METHODS
+            order: Puntos de Gauss por subintervalo
+            rtol: Tolerancia relativa del giro total (None: sin refinar)
+
+        Returns:
+            Diccionario con los resultados calculados; los arrays tienen un
+            valor por posición de 'x'
+        """
+        if intervals < 1 or order < 1:
+            raise ValueError("Los subintervalos y los puntos de Gauss deben ser al menos 1.")
+        G = shaft.shear_modulus * 1e9 # Convertir GPa a Pa
+
+        def flexibility(x):
+            return 1 / (G * self.calculate_polar_moment_of_inertia(*shaft.diameters(x)))
+
+        breakpoints = shaft.breakpoints
+        spans = np.diff(breakpoints)
+        increments = None
+        estimated_error = None
+        while True:
+            # Subintervalos iguales dentro de cada tramo entre quiebres
+            counts = np.maximum(1, np.rint(intervals * spans / shaft.length).astype(int))
+            span = np.repeat(np.arange(len(counts)), counts)
+            step = np.arange(counts.sum()) - (np.cumsum(counts) - counts)[span]
+            edges = np.append(breakpoints[span] + spans[span] * step / counts[span], shaft.length)
+            refined = shaft.torque * integrate_intervals(flexibility, edges, method, order)
+            if increments is not None:
+                estimated_error = abs(refined.sum() - increments.sum())
+            increments = refined
+            if rtol is None or (estimated_error is not None and
+                                estimated_error <= rtol * abs(increments.sum())):
+                break
+            if intervals * 2 > MAX_INTERVALS:
+                break
+            intervals *= 2
+
+        rotation = np.concatenate(([0.0], np.cumsum(increments)))
+        outer, inner = shaft.diameters(edges)
+        J = self.calculate_polar_moment_of_inertia(outer, inner)
+        max_shear_stress = shaft.torque * (outer / 2) / J
+
+        return {
+            'x': edges,
+            'rotation': rotation,
+            'outer_diameter': outer,
+            'polar_moment_of_inertia': J,
+            'max_shear_stress': max_shear_stress,
+            'twist_angle': float(rotation[-1]),
+            'twist_angle_degrees': float(np.degrees(rotation[-1])),
+            'max_shear_stress_overall': float(np.abs(max_shear_stress).max()),
+            'intervals': len(edges) - 1,
+            'estimated_error': estimated_error,
+        }
+
@@ -0,0 +1,217 @@
+"""
+Modelos de ejes escalonados y de sección variable para el simulador de torsión.
+
+Un eje está formado por tramos prismáticos consecutivos (longitud, diámetros
+exterior e interior y módulo de corte de cada uno) y soporta cualquier número
+de momentos torsores aplicados en posiciones a lo largo del eje. Los datos se
+guardan como arrays de NumPy, de modo que el momento interno, J, τ y φ de
+todos los tramos se calculan con operaciones vectorizadas (ver
+TorsionCalculator.calculate_shaft).
+
+Convenciones: x se mide desde el extremo izquierdo; los momentos son
+positivos según la regla de la mano derecha alrededor de +x y el momento
+interno T(x) es el de la parte del eje a la derecha del corte, por lo que un
+momento positivo en el extremo libre de un voladizo produce T > 0 y φ > 0.
+
+Un eje de sección variable (TaperedShaft) describe los diámetros como
+funciones de x: un valor constante, una función vectorizada d(x) o un perfil
+muestreado (posiciones, diámetros) que se interpola linealmente. Su giro se
+obtiene integrando T / (G J(x)) (ver TorsionCalculator.calculate_tapered).
+"""
+
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Callable, Union
+
+# Condiciones de apoyo: (extremo izquierdo empotrado, extremo derecho empotrado)
+SUPPORTS = {
+    'Empotrado - Libre': (True, False),
+    'Libre - Empotrado': (False, True),
+    'Empotrado - Empotrado': (True, True),
+}
+
+def _empty():
+    return np.zeros(0)
+
+@dataclass
+class SteppedShaft:
+    """Eje de tramos prismáticos con momentos torsores aplicados."""
+    lengths: np.ndarray
+    outer_diameters: np.ndarray
+    inner_diameters: np.ndarray
+    shear_moduli: np.ndarray # GPa
+    torque_positions: np.ndarray = field(default_factory=_empty)
+    torque_magnitudes: np.ndarray = field(default_factory=_empty)
+    supports: str = 'Empotrado - Libre'
+
+    def __post_init__(self):
+        for name in ('lengths', 'outer_diameters', 'inner_diameters', 'shear_moduli',
+                     'torque_positions', 'torque_magnitudes'):
+            setattr(self, name, np.array(getattr(self, name), dtype=float).ravel())
+        n = len(self.lengths)
+        if n == 0:
+            raise ValueError("El eje debe tener al menos un tramo.")
+        if not len(self.outer_diameters) == len(self.inner_diameters) == len(self.shear_moduli) == n:
+            raise ValueError("Cada tramo debe tener longitud, diámetros y módulo de corte.")
+        if len(self.torque_positions) != len(self.torque_magnitudes):
+            raise ValueError("Cada momento torsor debe tener posición y magnitud.")
+        if np.any(self.lengths <= 0) or np.any(self.outer_diameters <= 0) or np.any(self.shear_moduli <= 0):
+            raise ValueError("Las longitudes, los diámetros exteriores y los módulos de corte deben ser positivos.")
+        if np.any(self.inner_diameters < 0) or np.any(self.inner_diameters >= self.outer_diameters):
+            raise ValueError("El diámetro interior de cada tramo debe estar entre 0 y el diámetro exterior.")
+        if np.any(self.torque_positions < 0) or np.any(self.torque_positions > self.length * (1 + 1e-12)):
+            raise ValueError(f"Los momentos torsores deben aplicarse entre 0 y L = {self.length:g} m.")
+        if self.supports not in SUPPORTS:
+            raise ValueError(f"Condición de apoyo desconocida: {self.supports}")
+        self.torque_positions = np.minimum(self.torque_positions, self.length)
+        order = np.argsort(self.torque_positions, kind='stable')
+        self.torque_positions, self.torque_magnitudes = self.torque_positions[order], self.torque_magnitudes[order]
+
+    @classmethod
+    def from_tables(cls, segments, torques, supports='Empotrado - Libre'):
+        """
+        Construye el eje a partir de listas de diccionarios (las tablas de la página).
+
+        Args:
+            segments: Tramos con 'length' (m), 'outer_diameter' (m),
+                'inner_diameter' (m, 0 si es macizo) y 'shear_modulus' (GPa)
+            torques: Momentos con 'position' (m) y 'magnitude' (N⋅m)
+            supports: Una de las claves de SUPPORTS
+
+        Returns:
+            SteppedShaft
+        """
+        def column(items, key, default=None):
+            values = [item.get(key) for item in items]
+            # Una celda vacía llega como None o NaN (tablas de pandas)
+            return [float(default if value is None or value != value else value) for value in values]
+
+        return cls(column(segments, 'length'), column(segments, 'outer_diameter'),
+                   column(segments, 'inner_diameter', 0.0), column(segments, 'shear_modulus'),
+                   column(torques, 'position'), column(torques, 'magnitude'), supports)
+
+    @property
+    def length(self) -> float:
+        return float(self.lengths.sum())
+
+    @property
+    def boundaries(self) -> np.ndarray:
+        """Posiciones de los extremos de los tramos, de 0 a L."""
+        return np.concatenate(([0.0], np.cumsum(self.lengths)))
+
+    def pieces(self):
+        """
+        Subdivide los tramos en los puntos de aplicación de los momentos.
+
+        Returns:
+            Tupla (nodes, segment): posiciones de los extremos de las piezas
+            (de 0 a L, sin repetir) y el tramo al que pertenece cada pieza
+        """
+        boundaries = self.boundaries
+        nodes = np.unique(np.concatenate((boundaries, self.torque_positions)))
+        # Puntos que solo difieren por redondeo (p. ej. 0.1 + 0.2 y 0.3) son el mismo nodo
+        nodes = nodes[np.concatenate(([True], np.diff(nodes) > 1e-9 * self.length))]
+        nodes[-1] = boundaries[-1]
+        midpoints = (nodes[:-1] + nodes[1:]) / 2
+        segment = np.searchsorted(boundaries, midpoints, side='right') - 1
+        return nodes, np.minimum(segment, len(self.lengths) - 1)
+
+def _samples(spec):
+    """Posiciones y diámetros de un perfil muestreado, o None si spec es un valor o una función."""
+    if callable(spec) or np.ndim(spec) == 0:
+        return None
+    positions, diameters = (np.asarray(column, dtype=float) for column in spec)
+    if positions.shape != diameters.shape or positions.ndim != 1 or len(positions) < 2:
+        raise ValueError("Un perfil muestreado necesita al menos dos posiciones, cada una con su diámetro.")
+    if np.any(np.diff(positions) <= 0):
+        raise ValueError("Las posiciones del perfil deben ser crecientes.")
+    return positions, diameters
+
+def _profile(spec) -> Callable[[np.ndarray], np.ndarray]:
+    """Función vectorizada d(x) a partir de un valor, una función o un perfil (posiciones, diámetros)."""
+    if callable(spec):
+        return lambda x: np.broadcast_to(np.asarray(spec(x), dtype=float), np.shape(x))
+    if np.ndim(spec) == 0:
+        value = float(spec)
+        return lambda x: np.full(np.shape(x), value)
+    positions, diameters = _samples(spec)
+    return lambda x: np.interp(x, positions, diameters)
+
+@dataclass
+class TaperedShaft:
+    """Eje de sección variable empotrado en x = 0 con un momento torsor en el extremo libre."""
+    length: float
+    outer_diameter: Union[float, Callable, tuple]
+    inner_diameter: Union[float, Callable, tuple] = 0.0
+    shear_modulus: float = 80.0 # GPa
+    torque: float = 0.0
+
+    def __post_init__(self):
+        self.length = float(self.length)
+        if self.length <= 0 or self.shear_modulus <= 0:
+            raise ValueError("La longitud y el módulo de corte deben ser positivos.")
+        self._outer = _profile(self.outer_diameter)
+        self._inner = _profile(self.inner_diameter)
+        # Comprobación temprana del perfil; diameters() vuelve a comprobar cada evaluación
+        self.diameters(np.linspace(0, self.length, 201))
+
+    @property
+    def breakpoints(self) -> np.ndarray:
+        """
+        Posiciones de 0 a L donde el perfil puede tener un quiebre (los puntos
+        de los perfiles muestreados); el integrando es suave entre ellas.
+        """
+        points = [np.array([0.0, self.length])]
+        for spec in (self.outer_diameter, self.inner_diameter):
+            samples = _samples(spec)
+            if samples is not None:
+                points.append(samples[0])
+        points = np.unique(np.clip(np.concatenate(points), 0.0, self.length))
+        return points[np.concatenate(([True], np.diff(points) > 1e-9 * self.length))]
+
+    @classmethod
+    def conical(cls, length, outer_start, outer_end, inner_start=0.0, inner_end=0.0,
+                shear_modulus=80.0, torque=0.0):
+        """Eje troncocónico: diámetros que varían linealmente de x = 0 a x = L."""
+        return cls(length, ((0.0, length), (outer_start, outer_end)), ((0.0, length), (inner_start, inner_end)),
+                   shear_modulus, torque)
+
+    @classmethod
+    def from_table(cls, rows, shear_modulus=80.0, torque=0.0):
+        """
+        Construye el eje a partir de un perfil muestreado (la tabla de la página).
+
+        Args:
+            rows: Puntos del perfil con 'position' (m, el primero en 0 y el
+                último en L), 'outer_diameter' (m) e 'inner_diameter' (m, 0
+                si es macizo); entre puntos el diámetro varía linealmente
+            shear_modulus: Módulo de corte (GPa)
+            torque: Momento torsor en el extremo libre (N⋅m)
+
+        Returns:
+            TaperedShaft
+        """
+        rows = sorted(rows, key=lambda row: row['position'])
+        if len(rows) < 2 or rows[0]['position'] != 0:
+            raise ValueError("El perfil necesita al menos dos puntos y el primero debe estar en x = 0.")
+        positions = [float(row['position']) for row in rows]
+        outer = [float(row['outer_diameter']) for row in rows]
+        # Una celda vacía llega como None o NaN (tablas de pandas)
+        inner = [0.0 if row.get('inner_diameter') is None or row['inner_diameter'] != row['inner_diameter']
+                 else float(row['inner_diameter']) for row in rows]
+        return cls(positions[-1], (positions, outer), (positions, inner), shear_modulus, torque)
+
+    def diameters(self, x: np.ndarray):
+        """
+        Diámetros exterior e interior en las posiciones x.
+
+        Returns:
+            Tupla (d_o, d_i) con la forma de x
+        """
+        outer, inner = self._outer(x), self._inner(x)
+        invalid = (outer <= 0) | (inner < 0) | (inner >= outer) | ~np.isfinite(outer) | ~np.isfinite(inner)
+        if np.any(invalid):
+            raise ValueError(f"Perfil de diámetros no válido en x = {np.asarray(x)[invalid].flat[0]:.4g} m: "
+                             "el diámetro exterior debe ser positivo y mayor que el interior.")
+        return outer, inner
+
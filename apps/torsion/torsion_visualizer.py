@@ -1,7 +1,82 @@
 import numpy as np
 import plotly.graph_objects as go
+from functools import lru_cache
 from typing import Dict, List, Tuple
 
+from apps.beam_diagrams.beam_downsample import DIAGRAM_MAX_POINTS, downsample
+from apps.profiling import timed
+from apps.torsion.torsion_calculator import TorsionCalculator
+from apps.torsion.torsion_shaft import SteppedShaft, TaperedShaft
+
+# Puntos de la malla en cada circunferencia
+ANGULAR_RESOLUTION = 36
+
+# Nivel de detalle de la vista 3D: (secciones máximas, puntos por circunferencia)
+# enviados al navegador. La torsión es lineal a lo largo del eje, así que menos
+# secciones siguen estando sobre la superficie deformada.
+LEVELS_OF_DETAIL = {
+    'Bajo': (10, 18),
+    'Medio': (25, ANGULAR_RESOLUTION),
+    'Alto': (50, ANGULAR_RESOLUTION),
+}
+
+# Escala de deformación máxima y cuadros de la animación en el navegador
+# (escalas igualmente espaciadas de 0 a MAX_DEFORMATION_SCALE)
+MAX_DEFORMATION_SCALE = 10.0
+ANIMATION_FRAMES = 21
+
+@lru_cache(maxsize=64)
+def unit_cylinder(segments: int, resolution: int = ANGULAR_RESOLUTION) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Geometría del cilindro unitario, compartida entre sesiones (de solo lectura).
+
+    Args:
+        segments: Número de secciones a lo largo del eje
+        resolution: Puntos en cada circunferencia
+
+    Returns:
+        Tupla (cos θ, sin θ, altura relativa): las dos primeras como fila
+        (1, resolution) y la altura relativa de cada sección, de 0 a 1, como
+        columna (segments, 1)
+    """
+    theta = np.linspace(0, 2*np.pi, resolution)
+    tables = (np.cos(theta)[None, :], np.sin(theta)[None, :], np.linspace(0, 1, segments)[:, None])
+    for table in tables:
+        table.flags.writeable = False
+    return tables
+
+def twist(cos_theta: np.ndarray, sin_theta: np.ndarray, rotation: np.ndarray, radius,
+          out: Tuple[np.ndarray, np.ndarray, np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rota las secciones del cilindro unitario.
+
+    Args:
+        cos_theta, sin_theta: Tablas de unit_cylinder, forma (1, resolution)
+        rotation: Ángulo de cada sección en radianes, forma (..., secciones)
+        radius: Radio exterior (un valor, o uno por sección como rotation)
+        out: Arrays (x, y, scratch) donde escribir el resultado
+
+    Returns:
+        Tupla (x, y) de forma (..., secciones, resolution)
+    """
+    cos_phi = (radius * np.cos(rotation))[..., None]
+    sin_phi = (radius * np.sin(rotation))[..., None]
+    # x = r (cos θ cos φ − sin θ sin φ), y = r (cos θ sin φ + sin θ cos φ)
+    if out is None:
+        return cos_theta * cos_phi - sin_theta * sin_phi, cos_theta * sin_phi + sin_theta * cos_phi
+    x, y, scratch = out
+    np.multiply(cos_theta, cos_phi, out=x)
+    x -= np.multiply(sin_theta, sin_phi, out=scratch)
+    np.multiply(cos_theta, sin_phi, out=y)
+    y += np.multiply(sin_theta, cos_phi, out=scratch)
+    return x, y
+
+def _polylines(grid: np.ndarray) -> np.ndarray:
+    """Filas y columnas de una malla como polilíneas separadas por NaN (una sola traza)."""
+    rows = np.hstack([grid, np.full((grid.shape[0], 1), np.nan, dtype=grid.dtype)])
+    columns = np.hstack([grid.T, np.full((grid.shape[1], 1), np.nan, dtype=grid.dtype)])
+    return np.concatenate([rows.ravel(), columns.ravel()])
+
 class TorsionVisualizer:
     def __init__(self):
         self.show_original = True
@@ -10,80 +85,98 @@ class TorsionVisualizer:
         self.show_grid = True
         self.show_wireframe = False
         self.deformation_scale = 1.0
+        self.level_of_detail = 'Medio'
+        self.calculator = TorsionCalculator()
+        self._buffers = {}
+
+    def _mesh_buffers(self, role: str, shape: Tuple[int, int]) -> List[np.ndarray]:
+        """
+        Arrays (x, y, z, colors, scratch) reutilizados entre llamadas, uno por
+        malla ('original' o 'deformed'). Plotly copia los datos al crear cada
+        traza, por lo que la figura anterior no se ve afectada.
+        """
+        buffers = self._buffers.get(role)
+        if buffers is None or buffers[0].shape != shape:
+            buffers = self._buffers[role] = [np.empty(shape) for _ in range(5)]
+        return buffers
 
-    def create_cylinder_mesh(self, params: Dict, deformation: float = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    def create_cylinder_mesh(self, params: Dict, deformation: float = 0, results: Dict = None,
+                             sections: int = None, resolution: int = ANGULAR_RESOLUTION
+                             ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
         """
         Crea la malla del cilindro con deformación por torsión.
-        
+
+        Toma la geometría del cilindro unitario de la caché (unit_cylinder) y
+        aplica la torsión como una rotación de cada sección; solo se evalúan
+        el seno y el coseno del ángulo de cada sección.
+
         Args:
             params: Diccionario con parámetros geométricos
             deformation: Factor de deformación
-            
+            results: Resultados de TorsionCalculator.calculate_results
+                (se calculan si no se dan)
+            sections: Secciones de la malla (por defecto params['segments'])
+            resolution: Puntos en cada circunferencia
+
         Returns:
-            Tupla de arrays (x, y, z, colors, angles) para la visualización
+            Tupla de arrays (x, y, z, colors, angles) para la visualización;
+            los arrays se reutilizan en la siguiente llamada
         """
+        if results is None:
+            results = self.calculator.calculate_results(params)
         length = params['length']
-        outer_diameter = params['outer_diameter']
-        segments = params['segments']
-        torque = params['torque']
-        shear_modulus = params['shear_modulus'] * 1e9  # Convertir de GPa a Pa
-        
-        radius = outer_diameter / 2
-        
-        # Crear malla cilíndrica
-        theta = np.linspace(0, 2*np.pi, 36)
-        z = np.linspace(-length/2, length/2, segments)
-        theta, z = np.meshgrid(theta, z)
-        
-        # Calcular altura relativa para la deformación
-        height_ratio = (z - np.min(z)) / length
-
-        # Coordenadas base
-        x = radius * np.cos(theta)
-        y = radius * np.sin(theta)
-
-        # Calcular ángulos de torsión para cada segmento
-        angles = np.zeros_like(z)
-        if deformation != 0:
-            # Calcular el ángulo de torsión real
-            J = (np.pi / 32) * (outer_diameter**4 - params['inner_diameter']**4)
-            max_angle = (torque * length) / (shear_modulus * J)
-            
-            # Aplicar la escala de deformación
-            twist_angle = max_angle * deformation
-            rotation = twist_angle * height_ratio
+        radius = params['outer_diameter'] / 2
+        cos_theta, sin_theta, height_ratio = unit_cylinder(sections or params['segments'], resolution)
+        shape = (height_ratio.shape[0], cos_theta.shape[1])
+        x, y, z, colors, scratch = self._mesh_buffers('deformed' if deformation != 0 else 'original', shape)
+
+        np.multiply(height_ratio, length, out=z)
+        z -= length / 2
+
+        # Rotación de cada sección: φ = θ_total · escala · z/L
+        rotation = results['twist_angle'] * deformation * height_ratio[:, 0]
+        twist(cos_theta, sin_theta, rotation, radius, out=(x, y, scratch))
+        angles = np.broadcast_to(np.degrees(rotation)[:, None], shape)
+
+        # Colores basados en el esfuerzo cortante (τ = Tr/J); no dependen de la
+        # escala de deformación, así que la animación puede partir de 0
+        np.multiply(height_ratio, abs(results['max_shear_stress']), out=colors)
 
-            x_twisted = x * np.cos(rotation) - y * np.sin(rotation)
-            y_twisted = x * np.sin(rotation) + y * np.cos(rotation)
-            
-            x = x_twisted
-            y = y_twisted
-            angles = np.degrees(rotation)
-
-        # Calcular colores basados en el esfuerzo cortante
-        if deformation != 0:
-            # τ = Tr/J
-            colors = np.abs(torque * radius * height_ratio / J)
-        else:
-            colors = np.zeros_like(z)
-        
         return x, y, z, colors, angles
 
-    def create_figure(self, params: Dict) -> go.Figure:
+    @staticmethod
+    def _angle_labels(x: np.ndarray, y: np.ndarray, z: np.ndarray, angles: np.ndarray) -> Dict:
+        """Posición (primer punto de cada sección, en el radio exterior) y texto de las etiquetas de ángulo."""
+        labelled = np.flatnonzero(angles[1:, 0] != 0) + 1
+        return dict(x=x[labelled, 0], y=y[labelled, 0], z=z[labelled, 0],
+                    text=[f'{angle:.3f}°' for angle in angles[labelled, 0]])
+
+    @timed()
+    def create_figure(self, params: Dict, results: Dict = None, animate: bool = False,
+                      n_frames: int = ANIMATION_FRAMES) -> go.Figure:
         """
         Crea la figura 3D completa con todas las visualizaciones.
         
         Args:
             params: Diccionario con parámetros de la simulación
+            results: Resultados de TorsionCalculator.calculate_results
+                (se calculan si no se dan)
+            animate: Añade n_frames cuadros de la escala de deformación con
+                un control deslizante que los recorre en el navegador
+            n_frames: Número de cuadros de la animación
             
         Returns:
             Figura de Plotly
         """
+        if results is None:
+            results = self.calculator.calculate_results(params)
+        max_sections, resolution = LEVELS_OF_DETAIL[self.level_of_detail]
+        mesh = dict(sections=min(params['segments'], max_sections), resolution=resolution)
         fig = go.Figure()
 
         # Crear malla original
         if self.show_original:
-            x, y, z, _, _ = self.create_cylinder_mesh(params, 0)
+            x, y, z, _, _ = self.create_cylinder_mesh(params, 0, results, **mesh)
             fig.add_trace(go.Surface(
                 x=x, y=y, z=z,
                 opacity=0.3,
@@ -93,10 +186,12 @@ class TorsionVisualizer:
             ))
 
         # Crear malla deformada
+        animated = {} # Índice de cada traza que cambia con la escala
         if self.show_deformed:
-            x, y, z, colors, angles = self.create_cylinder_mesh(params, self.deformation_scale)
+            x, y, z, colors, angles = self.create_cylinder_mesh(params, self.deformation_scale, results, **mesh)
             
             # Superficie principal
+            animated['surface'] = len(fig.data)
             fig.add_trace(go.Surface(
                 x=x, y=y, z=z,
                 surfacecolor=colors if self.show_stress else None,
@@ -111,40 +206,36 @@ class TorsionVisualizer:
                 name='Deformado'
             ))
             
-            # Añadir wireframe si está activado
+            # Añadir wireframe si está activado: filas y columnas en una sola traza
             if self.show_wireframe:
-                for i in range(x.shape[0]):
-                    fig.add_trace(go.Scatter3d(
-                        x=x[i, :], y=y[i, :], z=z[i, :],
-                        mode='lines',
-                        line=dict(color='black', width=1),
-                        showlegend=False
-                    ))
-                for j in range(x.shape[1]):
-                    fig.add_trace(go.Scatter3d(
-                        x=x[:, j], y=y[:, j], z=z[:, j],
-                        mode='lines',
-                        line=dict(color='black', width=1),
-                        showlegend=False
-                    ))
-
-            # Añadir etiquetas de ángulo
-            if self.deformation_scale > 0:
-                for i in range(1, len(z)):
-                    # Tomar un punto en el radio exterior para la etiqueta
-                    angle = angles[i, 0]  # Tomar el ángulo del primer punto del segmento
-                    if angle != 0:
-                        fig.add_trace(go.Scatter3d(
-                            x=[x[i, 0]],
-                            y=[y[i, 0]],
-                            z=[z[i, 0]],
-                            mode='text',
-                            text=[f'{angle:.3f}°'],
-                            textposition='middle right',
-                            showlegend=False
-                        ))
-
-        # Configuración de la visualización
+                animated['wireframe'] = len(fig.data)
+                fig.add_trace(go.Scatter3d(
+                    x=_polylines(x), y=_polylines(y), z=_polylines(z),
+                    mode='lines',
+                    line=dict(color='black', width=1),
+                    hoverinfo='skip',
+                    showlegend=False
+                ))
+
+            # Añadir etiquetas de ángulo (una traza de texto para todas las secciones)
+            labels = self._angle_labels(x, y, z, angles)
+            if len(labels['text']) or animate:
+                animated['labels'] = len(fig.data)
+                fig.add_trace(go.Scatter3d(
+                    **labels,
+                    mode='text',
+                    textposition='middle right',
+                    showlegend=False
+                ))
+
+            if animate:
+                self._add_animation(fig, params, results, mesh, animated, n_frames)
+
+        self._update_scene(fig)
+        return fig
+
+    def _update_scene(self, fig: go.Figure):
+        """Cámara, ejes y tamaño comunes a las vistas 3D."""
         camera = dict(
             up=dict(x=0, y=1, z=0),
             center=dict(x=0, y=0, z=0),
@@ -164,6 +255,250 @@ class TorsionVisualizer:
             height=600
         )
 
+    def _add_animation(self, fig: go.Figure, params: Dict, results: Dict, mesh: Dict,
+                       animated: Dict, n_frames: int):
+        """
+        Añade a la figura los cuadros de la escala de deformación y los
+        controles que los recorren en el navegador, sin volver al servidor.
+
+        Las rotaciones de todos los cuadros se calculan de una vez, como un
+        array (cuadros, secciones, resolución); cada cuadro solo lleva las
+        coordenadas x, y que cambian (en float32, que basta para dibujar).
+        """
+        cos_theta, sin_theta, height_ratio = unit_cylinder(mesh['sections'], mesh['resolution'])
+        radius = params['outer_diameter'] / 2
+        length = params['length']
+        z = np.broadcast_to(height_ratio * length - length / 2, (height_ratio.shape[0], cos_theta.shape[1]))
+        scales = np.linspace(0, MAX_DEFORMATION_SCALE, n_frames)
+        rotation = results['twist_angle'] * scales[:, None] * height_ratio[:, 0]
+        xs, ys = (frame.astype(np.float32) for frame in twist(cos_theta, sin_theta, rotation, radius))
+        angles = np.degrees(rotation)
+
+        frames = []
+        for k, scale in enumerate(scales):
+            data = {animated['surface']: go.Surface(x=xs[k], y=ys[k])}
+            if 'wireframe' in animated:
+                data[animated['wireframe']] = go.Scatter3d(x=_polylines(xs[k]), y=_polylines(ys[k]))
+            data[animated['labels']] = go.Scatter3d(
+                **self._angle_labels(xs[k], ys[k], z, np.broadcast_to(angles[k][:, None], z.shape)))
+            frames.append(go.Frame(name=f'{scale:g}', data=list(data.values()), traces=list(data)))
+        fig.frames = frames
+
+        def playback(duration):
+            return dict(mode='immediate', fromcurrent=True, frame=dict(duration=duration, redraw=True),
+                        transition=dict(duration=0))
+
+        fig.update_layout(
+            sliders=[dict(
+                active=int(np.abs(scales - self.deformation_scale).argmin()),
+                currentvalue=dict(prefix='Escala de deformación: '),
+                pad=dict(t=10),
+                steps=[dict(method='animate', label=frame.name, args=[[frame.name], playback(0)])
+                       for frame in frames]
+            )],
+            updatemenus=[dict(
+                type='buttons', direction='left', x=0, y=0, xanchor='right', yanchor='top', pad=dict(t=10, r=10),
+                buttons=[dict(label='▶', method='animate', args=[None, playback(100)]),
+                         dict(label='⏸', method='animate', args=[[None], playback(0)])]
+            )]
+        )
+
+    @timed()
+    def create_shaft_figure(self, shaft: SteppedShaft, results: Dict = None) -> go.Figure:
+        """
+        Crea la figura 3D de un eje escalonado.
+
+        Cada pieza (tramo entre nodos, ver SteppedShaft.pieces) recibe secciones
+        en proporción a su longitud, al menos sus dos extremos; en cada nodo se
+        repite la sección, así que los cambios de diámetro se dibujan como una
+        cara anular. El giro varía linealmente dentro de cada pieza y el color
+        es el esfuerzo cortante máximo de la pieza.
+
+        Args:
+            shaft: Eje escalonado
+            results: Resultados de TorsionCalculator.calculate_shaft
+                (se calculan si no se dan)
+
+        Returns:
+            Figura de Plotly
+        """
+        if results is None:
+            results = self.calculator.calculate_shaft(shaft)
+        max_sections, resolution = LEVELS_OF_DETAIL[self.level_of_detail]
+        nodes, segment = results['nodes'], results['segment']
+        length = nodes[-1]
+
+        # Secciones de cada pieza y posición relativa t (de 0 a 1) de cada sección en su pieza
+        counts = np.maximum(2, np.rint(max_sections * np.diff(nodes) / length).astype(int))
+        piece = np.repeat(np.arange(len(counts)), counts)
+        starts = np.cumsum(counts) - counts
+        t = (np.arange(counts.sum()) - starts[piece]) / (counts[piece] - 1)
+
+        radius = shaft.outer_diameters[segment][piece] / 2
+        rotation = (1 - t) * results['rotation'][piece] + t * results['rotation'][piece + 1]
+        z = nodes[piece] + t * np.diff(nodes)[piece]
+        # Etiquetas de ángulo en los nodos (última sección de cada pieza y la primera del eje)
+        labelled = np.concatenate(([0], starts + counts - 1))
+        return self._sections_figure(z - length / 2, radius, rotation, results['max_shear_stress'][piece],
+                                     labelled, resolution)
+
+    @timed()
+    def create_tapered_figure(self, shaft: TaperedShaft, results: Dict = None) -> go.Figure:
+        """
+        Crea la figura 3D de un eje de sección variable.
+
+        Las secciones se reparten uniformemente a lo largo del eje, más una en
+        cada quiebre del perfil; el radio y el esfuerzo de cada una salen del
+        perfil de diámetros y su giro del campo φ(x) integrado (no de un giro
+        lineal en x).
+
+        Args:
+            shaft: Eje de sección variable
+            results: Resultados de TorsionCalculator.calculate_tapered
+                (se calculan si no se dan)
+
+        Returns:
+            Figura de Plotly
+        """
+        if results is None:
+            results = self.calculator.calculate_tapered(shaft)
+        max_sections, resolution = LEVELS_OF_DETAIL[self.level_of_detail]
+        z = np.union1d(np.linspace(0, shaft.length, max_sections), shaft.breakpoints)
+        outer, inner = shaft.diameters(z)
+        stress = shaft.torque * (outer / 2) / self.calculator.calculate_polar_moment_of_inertia(outer, inner)
+        rotation = np.interp(z, results['x'], results['rotation'])
+        return self._sections_figure(z - shaft.length / 2, outer / 2, rotation, stress,
+                                     np.arange(len(z)), resolution)
+
+    def _sections_figure(self, z: np.ndarray, radius: np.ndarray, rotation: np.ndarray, stress: np.ndarray,
+                         labelled: np.ndarray, resolution: int) -> go.Figure:
+        """
+        Figura 3D de un eje descrito sección a sección.
+
+        Args:
+            z: Posición de cada sección, centrada en el origen
+            radius: Radio exterior de cada sección
+            rotation: Giro de cada sección en radianes (sin escalar)
+            stress: Esfuerzo cortante máximo de cada sección en Pa
+            labelled: Índices de las secciones con etiqueta de ángulo
+            resolution: Puntos en cada circunferencia
+
+        Returns:
+            Figura de Plotly
+        """
+        cos_theta, sin_theta, _ = unit_cylinder(2, resolution)
+        z = np.broadcast_to(z[:, None], (len(z), cos_theta.shape[1]))
+        fig = go.Figure()
+
+        if self.show_original:
+            x, y = twist(cos_theta, sin_theta, np.zeros(len(z)), radius)
+            fig.add_trace(go.Surface(
+                x=x, y=y, z=z,
+                opacity=0.3,
+                showscale=False,
+                colorscale='Blues',
+                name='Original'
+            ))
+
+        if self.show_deformed:
+            rotation = rotation * self.deformation_scale
+            x, y = twist(cos_theta, sin_theta, rotation, radius)
+            colors = np.broadcast_to(np.abs(stress)[:, None], z.shape)
+            fig.add_trace(go.Surface(
+                x=x, y=y, z=z,
+                surfacecolor=colors if self.show_stress else None,
+                colorscale=[[0, 'blue'], [1, 'red']] if self.show_stress else 'Blues',
+                cmin=0 if self.show_stress else None,
+                showscale=self.show_stress,
+                colorbar=dict(
+                    title=dict(
+                        text='Esfuerzo Cortante (Pa)',
+                        side='right'
+                    )
+                ) if self.show_stress else None,
+                name='Deformado'
+            ))
+
+            if self.show_wireframe:
+                fig.add_trace(go.Scatter3d(
+                    x=_polylines(x), y=_polylines(y), z=_polylines(np.ascontiguousarray(z)),
+                    mode='lines',
+                    line=dict(color='black', width=1),
+                    hoverinfo='skip',
+                    showlegend=False
+                ))
+
+            rows = labelled[rotation[labelled] != 0]
+            if len(rows):
+                fig.add_trace(go.Scatter3d(
+                    x=x[rows, 0], y=y[rows, 0], z=z[rows, 0],
+                    text=[f'{angle:.3f}°' for angle in np.degrees(rotation[rows])],
+                    mode='text',
+                    textposition='middle right',
+                    showlegend=False
+                ))
+
+        self._update_scene(fig)
+        return fig
+
+    @timed()
+    def create_torque_diagram(self, results: Dict) -> go.Figure:
+        """
+        Diagrama del momento torsor interno T(x) con el ángulo de giro φ(x)
+        en un segundo eje.
+
+        Args:
+            results: Resultados de TorsionCalculator.calculate_shaft
+
+        Returns:
+            Figura de Plotly
+        """
+        nodes = results['nodes']
+        torque = np.append(results['internal_torque'], results['internal_torque'][-1])
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=nodes, y=torque, mode='lines', line_shape='hv', fill='tozeroy',
+                                 name='Momento torsor T(x)', line=dict(color='royalblue', width=3)))
+        fig.add_trace(go.Scatter(x=nodes, y=np.degrees(results['rotation']), mode='lines+markers',
+                                 name='Ángulo de giro φ(x)', line=dict(color='darkorange', dash='dot'), yaxis='y2'))
+        fig.update_layout(
+            title="Momento Torsor Interno y Ángulo de Giro",
+            xaxis_title="Posición x (m)",
+            yaxis=dict(title="Momento torsor (N⋅m)"),
+            yaxis2=dict(title="Ángulo de giro (°)", overlaying='y', side='right', showgrid=False),
+            hovermode="x unified",
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
+        fig.add_hline(y=0, line_width=1, line_dash="dash", line_color="grey")
+        return fig
+
+    @timed()
+    def create_twist_diagram(self, results: Dict, max_points: int = DIAGRAM_MAX_POINTS) -> go.Figure:
+        """
+        Diagrama del ángulo de giro φ(x) de un eje de sección variable con el
+        esfuerzo cortante máximo τ(x) en un segundo eje.
+
+        Args:
+            results: Resultados de TorsionCalculator.calculate_tapered
+            max_points: Puntos enviados al navegador por curva (aprox.)
+
+        Returns:
+            Figura de Plotly
+        """
+        x, (rotation, stress) = downsample(results['x'], [np.degrees(results['rotation']),
+                                                          results['max_shear_stress'] / 1e6], max_points)
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=x, y=rotation, mode='lines',
+                                 name='Ángulo de giro φ(x)', line=dict(color='royalblue', width=3)))
+        fig.add_trace(go.Scatter(x=x, y=stress, mode='lines',
+                                 name='Esfuerzo cortante τ(x)', line=dict(color='darkorange', dash='dot'), yaxis='y2'))
+        fig.update_layout(
+            title="Ángulo de Giro y Esfuerzo Cortante",
+            xaxis_title="Posición x (m)",
+            yaxis=dict(title="Ángulo de giro (°)"),
+            yaxis2=dict(title="Esfuerzo cortante (MPa)", overlaying='y', side='right', showgrid=False),
+            hovermode="x unified",
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
         return fig
 
     def set_visualization_options(self, show_original: bool, show_deformed: bool, 
@@ -182,3 +517,11 @@ class TorsionVisualizer:
         Actualiza la escala de deformación.
         """
         self.deformation_scale = scale
+
+    def set_level_of_detail(self, level: str):
+        """
+        Actualiza el nivel de detalle de la malla enviada al navegador.
+        """
+        if level not in LEVELS_OF_DETAIL:
+            raise ValueError(f"Nivel de detalle desconocido: {level}")
+        self.level_of_detail = level
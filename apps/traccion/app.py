@@ -2,7 +2,9 @@ import streamlit as st
 import time
 from apps.traccion.traccion_calculator import TraccionCalculator
 from apps.traccion.traccion_visualizer import TraccionVisualizer
+from apps.profiling import profiled_page, stage
 
+@profiled_page('traccion')
 def render_traccion_app():
     # Inicializar calculadora y visualizador
     if 'traccion_calculator' not in st.session_state:
@@ -79,7 +81,8 @@ def render_traccion_app():
         
         # Mostrar gráfica
         fig = visualizer.create_figure()
-        plot_container.plotly_chart(fig, use_container_width=True)
+        with stage('st.plotly_chart'):
+            plot_container.plotly_chart(fig, use_container_width=True)
         
         # Ecuaciones
         with st.expander("Ecuaciones Fundamentales"):
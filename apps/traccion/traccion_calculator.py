@@ -1,5 +1,7 @@
 import numpy as np
 
+from apps.profiling import timed
+
 class TraccionCalculator:
     def __init__(self):
         self.materiales = {
@@ -33,6 +35,7 @@ class TraccionCalculator:
         """Obtiene las propiedades de un material."""
         return self.materiales.get(material_name)
 
+    @timed()
     def calculate_stress_strain(self, material_name, strain):
         """Calcula el esfuerzo para una deformación dada."""
         material = self.materiales[material_name]
@@ -1,6 +1,8 @@
 import numpy as np
 import plotly.graph_objects as go
 
+from apps.profiling import timed
+
 class TraccionVisualizer:
     def __init__(self):
         self.data = {}  # Almacena los datos de cada material
@@ -21,6 +23,7 @@ class TraccionVisualizer:
         self.data[material_name]['strain'].append(strain)
         self.data[material_name]['stress'].append(stress)
 
+    @timed()
     def create_figure(self):
         """Crea la figura con las curvas esfuerzo-deformación."""
         fig = go.Figure()
@@ -0,0 +1,61 @@
+"""
+Scaling benchmark of the continuous beam solver.
+
+Solves continuous beams with a growing number of spans (clamped at the
+left end, simply supported elsewhere, a uniform load over the whole beam
+and a point load at every mid-span) and reports the time per span, which
+stays flat when the solve is linear in the number of spans.
+
+Usage: python benchmarks/bench_continuous_beam.py [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Añadir el directorio raíz al path para poder importar desde apps
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apps.beam_diagrams.beam_continuous import calculate_continuous_beam, support_positions
+
+SPAN_COUNTS = (2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+
+def continuous_beam_params(n_spans, seed=0):
+    spans = np.random.default_rng(seed).uniform(2.0, 6.0, n_spans)
+    x = support_positions(spans)
+    return {
+        'spans': spans.tolist(),
+        'supports': ['Empotrado'] + ['Simple'] * n_spans,
+        'distributed_loads': [{'start': 0.0, 'end': float(x[-1]), 'magnitude': 1.0}],
+        'point_loads': [{'position': float((a + b) / 2), 'magnitude': 3.0} for a, b in zip(x[:-1], x[1:])],
+        'EI': 100.0,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=3, help="Repeticiones por tamaño (se toma el mínimo).")
+    args = parser.parse_args(argv)
+
+    counts, times = [], []
+    print(f"{'tramos':>7} {'tiempo [ms]':>12} {'ms/tramo':>10}")
+    for n in SPAN_COUNTS:
+        params = continuous_beam_params(n)
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            calculate_continuous_beam(params)
+            best = min(best, time.perf_counter() - start)
+        counts.append(n)
+        times.append(best)
+        print(f"{n:>7} {best * 1e3:>12.2f} {best * 1e3 / n:>10.3f}")
+
+    # Slope of log(time) against log(spans) on the larger sizes: ~1 for linear scaling
+    large = np.array(counts) >= 100
+    slope = np.polyfit(np.log(np.array(counts)[large]), np.log(np.array(times)[large]), 1)[0]
+    print(f"Exponente de escala (tramos >= 100): {slope:.2f}")
+
+if __name__ == '__main__':
+    main()
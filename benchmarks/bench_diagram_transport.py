@@ -0,0 +1,85 @@
+"""
+Payload benchmark of the V/M diagrams sent to the browser.
+
+Samples the shear and moment of a beam with point loads, a couple and a
+partial distributed load at a growing resolution and builds the Plotly
+figure of each with and without the LTTB downsampling of plot_diagram. It
+reports the JSON payload, the time to build and serialize the figure (the
+server-side render cost; the browser parses and draws that same payload)
+and the largest gap between the downsampled polyline and the dense samples,
+relative to the peak of the diagram.
+
+Usage: python benchmarks/bench_diagram_transport.py [--max-points N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Añadir el directorio raíz al path para poder importar desde apps
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apps.beam_diagrams.beam_diagrams_calculator import calculate_beam_diagrams
+from apps.beam_diagrams.beam_diagrams_visualizer import plot_diagram
+from apps.beam_diagrams.beam_downsample import DIAGRAM_MAX_POINTS, downsample
+from apps.beam_diagrams.beam_piecewise import adaptive_samples
+
+RESOLUTIONS = (1_000, 10_000, 100_000)
+
+PARAMS = {
+    'length': 12.0,
+    'support_left': 'Empotrado',
+    'support_right': 'Simple',
+    'point_loads': [{'position': 3.0, 'magnitude': 8.0}, {'position': 9.5, 'magnitude': -4.0}],
+    'distributed_loads': [{'start': 1.0, 'end': 11.0, 'magnitude_start': 2.0, 'magnitude_end': 5.0}],
+    'moments': [{'position': 6.0, 'magnitude': 10.0}],
+}
+
+def dense_samples(results, n_points):
+    """About n_points common samples of V and M, with both sides of every jump."""
+    polys = [results['shear_poly'], results['moment_poly']]
+    per_segment = max(2, n_points // (len(polys[0].breakpoints) - 1))
+    return adaptive_samples(polys, rel_tol=1e-15, max_points_per_segment=per_segment)
+
+def polyline_error(x, y, x_kept, y_kept, jumps):
+    """Largest |dense - downsampled polyline| away from the jumps, relative to the peak."""
+    mask = ~np.isin(x, jumps)
+    gap = np.abs(np.interp(x[mask], x_kept, y_kept) - y[mask])
+    return gap.max() / np.abs(y).max()
+
+def best_time(function, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--max-points', type=int, default=DIAGRAM_MAX_POINTS, help="Puntos enviados por diagrama.")
+    parser.add_argument('--repeat', type=int, default=3, help="Repeticiones por tamaño (se toma el mínimo).")
+    args = parser.parse_args(argv)
+
+    results = calculate_beam_diagrams(PARAMS)
+    print(f"{'muestras':>9} {'diagrama':>8} {'JSON completo':>14} {'JSON reducido':>14} "
+          f"{'t completo [ms]':>16} {'t reducido [ms]':>16} {'puntos':>7} {'error rel.':>11}")
+    for n in RESOLUTIONS:
+        x, (shear, moment) = dense_samples(results, n)
+        jumps = x[1:][x[1:] == x[:-1]]
+        for name, y in (('V', shear), ('M', moment)):
+            full = len(plot_diagram(x, y, name, name, max_points=len(x)).to_json())
+            reduced = len(plot_diagram(x, y, name, name, max_points=args.max_points).to_json())
+            t_full = best_time(lambda: plot_diagram(x, y, name, name, max_points=len(x)).to_json(), args.repeat)
+            t_reduced = best_time(lambda: plot_diagram(x, y, name, name, max_points=args.max_points).to_json(),
+                                  args.repeat)
+            x_kept, (y_kept,) = downsample(x, [y], args.max_points)
+            error = polyline_error(x, y, x_kept, y_kept, jumps)
+            print(f"{len(x):>9} {name:>8} {full / 1024:>11.1f} kB {reduced / 1024:>11.1f} kB "
+                  f"{t_full * 1e3:>16.1f} {t_reduced * 1e3:>16.1f} {len(x_kept):>7} {error:>11.2e}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,462 @@
+"""
+Load test of the multipage app with many concurrent browser sessions.
+
+Starts the app on a local Streamlit server (or attaches to one with --url)
+and opens --sessions websocket sessions against it, spread over the pages
+and arriving over --ramp seconds, as a class opening the simulators. Every
+session speaks the browser's protocol: it loads its page, reads the widgets
+of each run from the elements it receives and then makes --interactions
+random changes (a slider or number moved within its range, a checkbox or
+expander toggled, an option picked, a button pressed), waiting --think
+seconds between them like a student would. The latency of a rerun is the
+time from sending the new widget state until the server reports the script
+finished, so it includes the queueing behind the other sessions and the
+serialization of every element.
+
+Reported per page: the p50/p95/max latency of the first load and of the
+reruns, the bytes received per rerun and the exceptions shown. For the
+server process (sampled from /proc, so Linux only): mean and peak CPU, CPU
+time per rerun and per session, and the resident memory before the sessions,
+with all of them connected and at its peak; the growth divided by the
+number of sessions is the memory a session costs, including what it adds to
+the shared caches. Unless --cold is given, every page is loaded once before
+measuring, so the one-time imports of the libraries are not charged to the
+sessions. The client runs on the same machine and its own CPU time is
+reported to tell how much it competes with the server.
+
+Widget values are encoded as Streamlit >= 1.40 expects them (options by
+label); the websocket client is the `websockets` package Streamlit itself
+depends on.
+
+Usage:
+    python benchmarks/bench_load.py --sessions 60 --interactions 10
+    python benchmarks/bench_load.py --pages Viga Torsion --sessions 120 --think 2 8
+    python benchmarks/bench_load.py --url http://localhost:8501 --server-pid 1234 --json load.json
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+
+def app_pages():
+    """URL names of the pages (file name without the order prefix), in menu order."""
+    return [re.sub(r'^\d+_', '', os.path.splitext(os.path.basename(path))[0])
+            for path in sorted(glob.glob(os.path.join(ROOT, 'pages', '*.py')))]
+
+# --- Server process ---
+def start_server(port, env=None):
+    """Runs home.py on a headless local server and waits until it is healthy."""
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', 'home.py', '--server.headless', 'true',
+         '--server.port', str(port), '--browser.gatherUsageStats', 'false',
+         '--server.fileWatcherType', 'none'],
+        cwd=ROOT, env={**os.environ, **(env or {})}, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    url = f'http://localhost:{port}'
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise ValueError(f"El servidor terminó al iniciar: {server.stderr.read().decode()[-500:]}")
+        try:
+            with urllib.request.urlopen(f'{url}/_stcore/health', timeout=1) as response:
+                if response.status == 200:
+                    return server, url
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise ValueError("El servidor no respondió en 60 s")
+
+def cpu_seconds(pid):
+    """User + system CPU time of a process, from /proc/<pid>/stat."""
+    with open(f'/proc/{pid}/stat') as file:
+        fields = file.read().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+def rss_bytes(pid):
+    """Resident memory of a process, from /proc/<pid>/status."""
+    with open(f'/proc/{pid}/status') as file:
+        for line in file:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) * 1024
+    return 0
+
+class ProcessMonitor(threading.Thread):
+    """Samples the CPU usage and resident memory of a process every `interval` seconds."""
+    def __init__(self, pid, interval=0.25):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.cpu_percent = []
+        self.peak_rss = rss_bytes(pid)
+        self._stop_event = threading.Event()
+
+    def run(self):
+        last_cpu, last_time = cpu_seconds(self.pid), time.monotonic()
+        while not self._stop_event.wait(self.interval):
+            cpu, now = cpu_seconds(self.pid), time.monotonic()
+            self.cpu_percent.append(100 * (cpu - last_cpu) / (now - last_time))
+            self.peak_rss = max(self.peak_rss, rss_bytes(self.pid))
+            last_cpu, last_time = cpu, now
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+# --- Widgets ---
+WIDGET_KINDS = ('slider', 'number_input', 'checkbox', 'toggle', 'selectbox', 'radio', 'button')
+
+def widget_of(delta):
+    """(id, kind, element) of a delta that adds a widget the session can drive, else None."""
+    if delta.WhichOneof('type') == 'add_block':
+        expandable = delta.add_block.expandable
+        if delta.add_block.WhichOneof('type') == 'expandable' and expandable.id:
+            return expandable.id, 'expander', expandable
+        return None
+    if delta.WhichOneof('type') != 'new_element':
+        return None
+    kind = delta.new_element.WhichOneof('type')
+    if kind not in WIDGET_KINDS:
+        return None
+    element = getattr(delta.new_element, kind)
+    if kind == 'checkbox' and element.type == element.TOGGLE:
+        kind = 'toggle'
+    return element.id, kind, element
+
+def _snap(value, lo, hi, step, integer):
+    if step > 0:
+        value = (lo if lo is not None else 0.0) + round((value - (lo if lo is not None else 0.0)) / step) * step
+    value = min(max(value, lo if lo is not None else value), hi if hi is not None else value)
+    return int(round(value)) if integer else round(value, 10)
+
+def random_value(kind, element, current, rng):
+    """A new random value for a widget, within its limits."""
+    if kind in ('checkbox', 'toggle', 'expander'):
+        if current is None:
+            current = element.expanded if kind == 'expander' else element.default
+        return not current
+    if kind in ('selectbox', 'radio'):
+        return rng.choice(list(element.options)) if element.options else None
+    if kind == 'button':
+        return True
+    integer = element.data_type == element.INT
+    if kind == 'slider':
+        values = sorted(_snap(rng.uniform(element.min, element.max), element.min, element.max, element.step, integer)
+                        for _ in element.default)
+        return values
+    # number_input: uniform when bounded, otherwise up to ±50 % around the current value
+    lo = element.min if element.has_min else None
+    hi = element.max if element.has_max else None
+    if lo is not None and hi is not None:
+        value = rng.uniform(lo, hi)
+    else:
+        current = element.default if current is None else current
+        span = max(abs(current), 10 * element.step or 1.0) / 2
+        value = current + rng.uniform(-span, span)
+    return _snap(value, lo, hi, element.step, integer)
+
+def widget_state(widget_id, kind, element, value):
+    """WidgetState proto of a value, as the browser sends it."""
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+    state = WidgetState(id=widget_id)
+    if kind == 'button':
+        state.trigger_value = True
+    elif kind in ('checkbox', 'toggle', 'expander'):
+        state.bool_value = value
+    elif kind in ('selectbox', 'radio'):
+        state.string_value = value
+    elif kind == 'slider':
+        state.double_array_value.data.extend(value)
+    elif element.data_type == element.INT:
+        state.int_value = value
+    else:
+        state.double_value = value
+    return state
+
+# --- Sessions ---
+class Session:
+    """
+    One browser session on a page: its websocket, widgets and the values it
+    has set. A reader task follows every run the server streams; the latency
+    of an interaction ends with the first run that started after it was sent.
+    Runs the app starts by itself with st.rerun() (the frames of an
+    animation, the run after rolling the dice) are counted apart.
+    """
+    def __init__(self, url, page, rng, timeout):
+        self.url = url.replace('http', 'ws', 1) + '/_stcore/stream'
+        self.page = page
+        self.rng = rng
+        self.timeout = timeout
+        self.widgets = {} # id -> (kind, element) of the last run
+        self.values = {} # id -> value set by this session
+        self.load_ms = None
+        self.rerun_ms = []
+        self.rerun_bytes = []
+        self.auto_ms = [] # Runs started by the app itself
+        self.exceptions = 0
+        self.errors = []
+        self.slowest = None # (ms, widget label, value) of the slowest rerun
+        self._sent_at = None # Request waiting for its run
+        self._reply = None
+        self._run = None # (start, requested, bytes, widgets) of the run being streamed
+
+    async def _read(self, ws):
+        try:
+            await self._follow_runs(ws)
+        except Exception as error:
+            if self._reply is not None and not self._reply.done():
+                self._reply.set_exception(error)
+            return
+        if self._reply is not None and not self._reply.done():
+            self._reply.set_exception(ConnectionError("El servidor cerró la conexión"))
+
+    async def _follow_runs(self, ws):
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        async for data in ws:
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            kind = forward.WhichOneof('type')
+            now = time.perf_counter()
+            if kind == 'new_session': # Sent at the start of every run
+                self._run = [now, self._sent_at is not None, 0, {}]
+            if self._run is not None:
+                self._run[2] += len(data)
+            if kind == 'delta' and self._run is not None:
+                widget = widget_of(forward.delta)
+                if widget is not None:
+                    self._run[3][widget[0]] = widget[1:]
+                elif forward.delta.new_element.WhichOneof('type') == 'exception':
+                    self.exceptions += 1
+            elif kind == 'page_not_found' and self._reply is not None and not self._reply.done():
+                self._reply.set_exception(ValueError(f"Página no encontrada: {self.page}"))
+            elif kind == 'script_finished' and self._run is not None:
+                start, requested, received, widgets = self._run
+                self._run = None
+                if widgets:
+                    # Values of widgets that are gone no longer apply
+                    self.widgets = widgets
+                    self.values = {key: value for key, value in self.values.items() if key in widgets}
+                if requested and self._sent_at is not None:
+                    elapsed, self._sent_at = (now - self._sent_at) * 1e3, None
+                    if not self._reply.done():
+                        self._reply.set_result((elapsed, received))
+                elif not requested:
+                    self.auto_ms.append((now - start) * 1e3)
+
+    async def rerun(self, ws, trigger=None):
+        """Sends the widget state and waits for its run; returns (ms, bytes received)."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        message = BackMsg()
+        message.rerun_script.page_name = self.page
+        states = [widget_state(widget_id, *self.widgets[widget_id], value) for widget_id, value in self.values.items()]
+        if trigger is not None:
+            states.append(widget_state(trigger, *self.widgets[trigger], True))
+        message.rerun_script.widget_states.widgets.extend(states)
+        self._reply = asyncio.get_running_loop().create_future()
+        self._sent_at = time.perf_counter()
+        await ws.send(message.SerializeToString())
+        return await asyncio.wait_for(self._reply, self.timeout)
+
+    async def run(self, interactions, think, done, release):
+        """Loads the page, makes the interactions, sets `done` and stays connected until `release`."""
+        import websockets
+        try:
+            async with websockets.connect(self.url, max_size=None) as ws:
+                reader = asyncio.create_task(self._read(ws))
+                try:
+                    self.load_ms, _ = await self.rerun(ws)
+                    for _ in range(interactions):
+                        await asyncio.sleep(self.rng.uniform(*think))
+                        if not self.widgets:
+                            break
+                        widget_id = self.rng.choice(sorted(self.widgets))
+                        kind, element = self.widgets[widget_id]
+                        trigger = None
+                        if kind == 'button':
+                            trigger = widget_id
+                        else:
+                            value = random_value(kind, element, self.values.get(widget_id), self.rng)
+                            if value is None:
+                                continue
+                            self.values[widget_id] = value
+                        elapsed, received = await self.rerun(ws, trigger)
+                        self.rerun_ms.append(elapsed)
+                        self.rerun_bytes.append(received)
+                        if self.slowest is None or elapsed > self.slowest[0]:
+                            self.slowest = (elapsed, element.label, True if trigger else self.values.get(widget_id))
+                    done.set()
+                    # Stay connected until every session is done, so the memory of all of them is measured
+                    await release.wait()
+                finally:
+                    reader.cancel()
+        except Exception as error: # Timeouts, connections closed by the server and the like
+            self.errors.append(f"{type(error).__name__}: {error}")
+        finally:
+            done.set()
+
+async def run_sessions(url, pages, n_sessions, interactions, think, ramp, timeout, seed, on_all_done):
+    """Runs the sessions (round-robin over the pages); on_all_done is called while they are still connected."""
+    release = asyncio.Event()
+    done = [asyncio.Event() for _ in range(n_sessions)]
+    sessions = [Session(url, pages[i % len(pages)], random.Random(seed + i), timeout) for i in range(n_sessions)]
+
+    async def start(i, session):
+        await asyncio.sleep(ramp * i / (n_sessions - 1) if n_sessions > 1 else 0)
+        await session.run(interactions, think, done[i], release)
+
+    tasks = [asyncio.create_task(start(i, session)) for i, session in enumerate(sessions)]
+    await asyncio.gather(*(event.wait() for event in done))
+    on_all_done()
+    release.set()
+    await asyncio.gather(*tasks)
+    return sessions
+
+# --- Report ---
+def _percentiles(values):
+    if not values:
+        return {'n': 0, 'p50_ms': None, 'p95_ms': None, 'max_ms': None}
+    values = np.asarray(values)
+    return {'n': len(values), 'p50_ms': float(np.percentile(values, 50)),
+            'p95_ms': float(np.percentile(values, 95)), 'max_ms': float(values.max())}
+
+def _summarize_group(group):
+    sent = [size for session in group for size in session.rerun_bytes]
+    return {
+        'sessions': len(group),
+        'load': _percentiles([session.load_ms for session in group if session.load_ms is not None]),
+        'rerun': _percentiles([ms for session in group for ms in session.rerun_ms]),
+        'auto_runs': _percentiles([ms for session in group for ms in session.auto_ms]),
+        'kb_per_rerun': float(np.mean(sent)) / 1024 if sent else None,
+        'exceptions': sum(session.exceptions for session in group),
+        'slowest': max((session.slowest for session in group if session.slowest), default=None),
+        'errors': [error for session in group for error in session.errors],
+    }
+
+def summarize(sessions, server):
+    """Per-page and total latencies and the server figures, as a JSON-ready dict."""
+    pages = {page: _summarize_group([session for session in sessions if session.page == page])
+             for page in dict.fromkeys(session.page for session in sessions)}
+    return {'pages': pages, 'total': _summarize_group(sessions), 'server': server}
+
+def _ms(value):
+    return f"{value:>8.0f}" if value is not None else f"{'-':>8}"
+
+def print_report(report):
+    width = max([len(page) for page in report['pages']] + [6])
+    print(f"{'página':<{width}} {'ses.':>4} {'carga p50':>9} {'p95':>8} {'reruns':>6} {'p50 [ms]':>8} "
+          f"{'p95 [ms]':>8} {'máx [ms]':>8} {'kB/rerun':>8} {'autom.':>6} {'excep.':>6} {'fallos':>6}")
+    for page, row in [*report['pages'].items(), ('total', report['total'])]:
+        kb = f"{row['kb_per_rerun']:>8.1f}" if row['kb_per_rerun'] is not None else f"{'-':>8}"
+        print(f"{page:<{width}} {row['sessions']:>4} {_ms(row['load']['p50_ms']):>9} {_ms(row['load']['p95_ms'])} "
+              f"{row['rerun']['n']:>6} {_ms(row['rerun']['p50_ms'])} {_ms(row['rerun']['p95_ms'])} "
+              f"{_ms(row['rerun']['max_ms'])} {kb} {row['auto_runs']['n']:>6} {row['exceptions']:>6} "
+              f"{len(row['errors']):>6}")
+    for page, row in report['pages'].items():
+        if row['slowest']:
+            ms, label, value = row['slowest']
+            print(f"  {page}: rerun más lento {ms:.0f} ms, {label} = {value}")
+        for error in sorted(set(row['errors'])):
+            print(f"  {page}: {error}")
+    server = report['server']
+    if server:
+        mb = 2**20
+        print(f"\nServidor: CPU media {server['cpu_mean_percent']:.0f} %, pico {server['cpu_peak_percent']:.0f} % "
+              f"(100 % = un núcleo; {os.cpu_count()} núcleos)")
+        print(f"  CPU por rerun {server['cpu_ms_per_run']:.1f} ms, por sesión {server['cpu_s_per_session']:.2f} s")
+        print(f"  Memoria: {server['rss_before'] / mb:.0f} MB antes, {server['rss_connected'] / mb:.0f} MB con las "
+              f"sesiones abiertas, pico {server['rss_peak'] / mb:.0f} MB; "
+              f"{server['rss_per_session'] / mb:.2f} MB por sesión")
+    print(f"Cliente de carga: {report['client_cpu_s']:.1f} s de CPU")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sessions', type=int, default=30, help="Sesiones concurrentes.")
+    parser.add_argument('--interactions', type=int, default=10, help="Cambios de widgets por sesión.")
+    parser.add_argument('--think', type=float, nargs=2, default=(0.5, 2.0), metavar=('MIN', 'MAX'),
+                        help="Pausa aleatoria entre interacciones (s).")
+    parser.add_argument('--ramp', type=float, default=5.0, help="Tiempo en el que llegan todas las sesiones (s).")
+    parser.add_argument('--pages', nargs='*', default=[],
+                        help="Páginas a probar (texto contenido en el nombre); todas por defecto.")
+    parser.add_argument('--timeout', type=float, default=120.0, help="Espera máxima de un rerun (s).")
+    parser.add_argument('--seed', type=int, default=0, help="Semilla de las interacciones.")
+    parser.add_argument('--port', type=int, default=8599, help="Puerto del servidor local.")
+    parser.add_argument('--url', help="Usar un servidor ya iniciado en esta URL en lugar de iniciar uno.")
+    parser.add_argument('--server-pid', type=int, help="PID del servidor de --url, para medir su CPU y memoria.")
+    parser.add_argument('--no-warm-up', action='store_true', help="Iniciar el servidor con SIM_WARMUP=0.")
+    parser.add_argument('--cold', action='store_true',
+                        help="No cargar cada página una vez antes de medir (servidor recién iniciado).")
+    parser.add_argument('--json', help="Guardar el informe en este archivo JSON.")
+    args = parser.parse_args(argv)
+
+    pages = [page for page in app_pages() if not args.pages or any(text in page for text in args.pages)]
+    if not pages:
+        parser.error(f"Ninguna página coincide con {args.pages}; disponibles: {', '.join(app_pages())}")
+
+    server_process = None
+    if args.url:
+        url, pid = args.url.rstrip('/'), args.server_pid
+    else:
+        server_process, url = start_server(args.port, {'SIM_WARMUP': '0'} if args.no_warm_up else None)
+        pid = server_process.pid
+    try:
+        if not args.cold:
+            asyncio.run(run_sessions(url, pages, len(pages), 0, (0, 0), 0, args.timeout, args.seed, lambda: None))
+        measures = {}
+        if pid:
+            monitor = ProcessMonitor(pid)
+            measures.update(rss_before=rss_bytes(pid), cpu_before=cpu_seconds(pid))
+            monitor.start()
+
+        def on_all_done():
+            if pid:
+                measures.update(rss_connected=rss_bytes(pid), cpu_after=cpu_seconds(pid))
+
+        client_start = time.process_time()
+        sessions = asyncio.run(run_sessions(url, pages, args.sessions, args.interactions, tuple(args.think),
+                                            args.ramp, args.timeout, args.seed, on_all_done))
+        server = None
+        if pid:
+            monitor.stop()
+            runs = sum(len(session.rerun_ms) + len(session.auto_ms) + (session.load_ms is not None)
+                       for session in sessions)
+            cpu = measures['cpu_after'] - measures['cpu_before']
+            server = {
+                'cpu_mean_percent': float(np.mean(monitor.cpu_percent)) if monitor.cpu_percent else 0.0,
+                'cpu_peak_percent': float(np.max(monitor.cpu_percent)) if monitor.cpu_percent else 0.0,
+                'cpu_ms_per_run': 1e3 * cpu / max(1, runs),
+                'cpu_s_per_session': cpu / len(sessions),
+                'rss_before': measures['rss_before'],
+                'rss_connected': measures['rss_connected'],
+                'rss_peak': monitor.peak_rss,
+                'rss_per_session': (measures['rss_connected'] - measures['rss_before']) / len(sessions),
+            }
+        report = summarize(sessions, server)
+        report['client_cpu_s'] = time.process_time() - client_start
+        report['settings'] = {key: value for key, value in vars(args).items() if key != 'json'}
+    finally:
+        if server_process is not None:
+            server_process.terminate()
+            server_process.wait(timeout=10)
+
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+            file.write('\n')
+        print(f"Informe guardado en {args.json}")
+    sys.exit(1 if report['total']['errors'] else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,326 @@
+"""
+Benchmark suite of every calculator and figure builder of the apps.
+
+Times each case (a representative input and a worst case for every
+calculator and visualizer) headless, with the figures built but never shown:
+the matplotlib ones on the Agg backend and closed after each call. Every case
+is run enough times per repeat to last at least --min-time seconds and the
+best and median time per call of the repeats are reported; the best is the
+figure compared, as it is the least disturbed by other load.
+
+The results can be saved as JSON (--save) and compared against a stored
+baseline (--baseline, benchmarks/baseline.json by default): a case whose
+best time exceeds its baseline by more than --tolerance, and by more than
+--min-delta milliseconds, is reported as a regression and the exit status is
+1; the absolute floor keeps the sub-microsecond closed-form calculators
+from flagging timer noise. A fixed calibration workload is timed along with
+the cases and the ratios are divided by its own ratio, which
+absorbs a machine that is uniformly faster or slower than when the baseline
+was saved; baselines from a different machine remain only indicative.
+
+Usage:
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --save benchmarks/baseline.json
+    python benchmarks/bench_suite.py --filter beam --tolerance 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+# Añadir el directorio raíz al path para poder importar desde apps
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apps.beam_diagrams.beam_diagrams_calculator import calculate_beam_diagrams
+from apps.beam_diagrams.beam_diagrams_visualizer import plot_beam_schematic, plot_diagram, plot_deflection
+from apps.flexion.flexion_calculator import calculate_flexion
+from apps.flexion.flexion_visualizer import visualize_flexion
+from apps.indeterminacion.indeterminacion_calculator import CableParameters, IndeterminacionCalculator
+from apps.indeterminacion.indeterminacion_visualizer import IndeterminacionVisualizer
+from apps.mohr.mohr_calculator import MohrCalculator
+from apps.mohr.mohr_visualizer import MohrVisualizer
+from apps.torsion.torsion_calculator import TorsionCalculator
+from apps.torsion.torsion_shaft import SteppedShaft, TaperedShaft
+from apps.torsion.torsion_visualizer import TorsionVisualizer
+from apps.traccion.traccion_calculator import TraccionCalculator
+from apps.traccion.traccion_visualizer import TraccionVisualizer
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# --- Inputs: a representative case and a worst case per app ---
+
+BEAMS = {
+    'tipica': {
+        'length': 10.0, 'support_left': 'Empotrado', 'support_right': 'Simple', 'EI': 1000.0,
+        'point_load_p': {'magnitude': 5.0, 'position': 4.0},
+        'dist_load_w': {'magnitude': 3.0, 'start': 2.0, 'end': 8.0},
+    },
+    'muchas_cargas': {
+        'length': 20.0, 'support_left': 'Empotrado', 'support_right': 'Empotrado', 'EI': 1000.0,
+        'point_loads': [{'position': float(x), 'magnitude': (-1) ** i * 3.0}
+                        for i, x in enumerate(np.linspace(1, 19, 12))],
+        'distributed_loads': [{'start': float(a), 'end': float(a + 3), 'magnitude_start': 2.0,
+                               'magnitude_end': -1.0 if i % 2 else 2.0} for i, a in enumerate(range(0, 18, 3))],
+        'moments': [{'position': float(x), 'magnitude': 2.0} for x in (5, 10, 15)],
+    },
+}
+
+SHAFTS = {
+    'tipico': {'length': 1.0, 'outer_diameter': 0.1, 'inner_diameter': 0.0, 'segments': 20,
+               'elastic_modulus': 200.0, 'shear_modulus': 80.0, 'poisson_ratio': 0.3, 'torque': 1000.0},
+    'maximo': {'length': 5.0, 'outer_diameter': 0.2, 'inner_diameter': 0.15, 'segments': 50,
+               'elastic_modulus': 200.0, 'shear_modulus': 80.0, 'poisson_ratio': 0.3, 'torque': 50000.0},
+}
+
+STEPPED_SHAFTS = {
+    'escalonado': SteppedShaft([0.5, 0.5], [0.1, 0.06], [0.0, 0.0], [80.0, 80.0], [0.5, 1.0], [2000.0, -800.0],
+                               'Empotrado - Empotrado'),
+    'muchos_tramos': SteppedShaft(np.full(12, 0.25), np.linspace(0.2, 0.08, 12), np.zeros(12), np.full(12, 80.0),
+                                  np.linspace(0.1, 2.9, 15), (-1.0) ** np.arange(15) * 5000.0, 'Empotrado - Empotrado'),
+}
+
+TAPERED_SHAFTS = {
+    'conico': TaperedShaft.conical(1.0, 0.1, 0.05, shear_modulus=80.0, torque=1000.0),
+    'perfil': TaperedShaft(2.0, (np.linspace(0, 2, 9), 0.12 - 0.04 * np.abs(np.sin(np.linspace(0, 2, 9)))),
+                           0.02, 80.0, 5000.0),
+}
+
+STRESS_STATES = {
+    'tipico': {'sigma_x': 80.0, 'sigma_y': -40.0, 'tau_xy': 30.0, 'theta': 25.0},
+    'hidrostatico': {'sigma_x': 50.0, 'sigma_y': 50.0, 'tau_xy': 0.0, 'theta': 0.0},
+}
+
+CABLES = {
+    'tipico': (CableParameters(200e9, 100e-6, 2.0), CableParameters(70e9, 100e-6, 2.0), 10000.0),
+    'disparejo': (CableParameters(200e9, 150e-6, 1.0), CableParameters(70e9, 50e-6, 3.0), 15000.0),
+}
+
+# --- Cases: name -> setup returning the callable to time ---
+
+def _beam_cases():
+    cases = {}
+    for name, params in BEAMS.items():
+        results = calculate_beam_diagrams(params)
+        cases[f'beam.calculate_beam_diagrams[{name}]'] = lambda p=params: calculate_beam_diagrams(p)
+        cases[f'beam.plot_beam_schematic[{name}]'] = lambda p=params, r=results: plot_beam_schematic(p, r)
+        cases[f'beam.plot_diagram[{name}]'] = lambda r=results: plot_diagram(
+            r['x_values'], r['moment_values'], "Momento", "M")
+        cases[f'beam.plot_deflection[{name}]'] = lambda r=results: plot_deflection(
+            r['x_values'], r['deflection_values'], r['slope_values'])
+    return cases
+
+def _torsion_cases():
+    cases = {}
+    calculator = TorsionCalculator()
+    for name, params in SHAFTS.items():
+        cases[f'torsion.calculate_results[{name}]'] = lambda p=params: calculator.calculate_results(p)
+        visualizer = TorsionVisualizer()
+        # The worst case turns on every layer
+        visualizer.set_visualization_options(True, True, True, True, show_wireframe=name == 'maximo')
+        cases[f'torsion.create_figure[{name}]'] = lambda p=params, v=visualizer: v.create_figure(p)
+    for name, shaft in STEPPED_SHAFTS.items():
+        results = calculator.calculate_shaft(shaft)
+        cases[f'torsion.calculate_shaft[{name}]'] = lambda s=shaft: calculator.calculate_shaft(s)
+        visualizer = TorsionVisualizer()
+        cases[f'torsion.create_shaft_figure[{name}]'] = lambda s=shaft, r=results, v=visualizer: v.create_shaft_figure(s, r)
+    for name, shaft in TAPERED_SHAFTS.items():
+        results = calculator.calculate_tapered(shaft, rtol=1e-10)
+        cases[f'torsion.calculate_tapered[{name}]'] = lambda s=shaft: calculator.calculate_tapered(s, rtol=1e-10)
+        visualizer = TorsionVisualizer()
+        cases[f'torsion.create_tapered_figure[{name}]'] = lambda s=shaft, r=results, v=visualizer: v.create_tapered_figure(s, r)
+    return cases
+
+def _mohr_cases():
+    cases = {}
+    calculator = MohrCalculator()
+    visualizer = MohrVisualizer()
+    for name, params in STRESS_STATES.items():
+        cases[f'mohr.calculate_results[{name}]'] = lambda p=params: calculator.calculate_results(p)
+        cases[f'mohr.calculate_circle_points[{name}]'] = lambda p=params: calculator.calculate_circle_points(p)
+        cases[f'mohr.create_figure[{name}]'] = lambda p=params: visualizer.create_figure(p, calculator)
+    cases['mohr.calculate_circle_points[10000 puntos]'] = \
+        lambda: calculator.calculate_circle_points(STRESS_STATES['tipico'], num_points=10000)
+    return cases
+
+def _traccion_cases():
+    calculator = TraccionCalculator()
+    strains = np.arange(1, int(calculator.max_strain / calculator.strain_rate) + 1) * calculator.strain_rate
+    # A full run of every material, as after the simulation has finished
+    full = TraccionVisualizer()
+    for material in calculator.materiales:
+        for strain in strains:
+            full.update_data(material, strain, calculator.calculate_stress_strain(material, strain))
+    return {
+        'traccion.calculate_stress_strain[elastico]': lambda: calculator.calculate_stress_strain('acero', 0.0005),
+        'traccion.calculate_stress_strain[curva completa]':
+            lambda: [calculator.calculate_stress_strain('acero', strain) for strain in strains],
+        'traccion.create_figure[vacia]': TraccionVisualizer().create_figure,
+        'traccion.create_figure[curvas completas]': full.create_figure,
+    }
+
+def _indeterminacion_cases():
+    cases = {}
+    calculator = IndeterminacionCalculator()
+    visualizer = IndeterminacionVisualizer()
+    for name, (cable1, cable2, load) in CABLES.items():
+        results = calculator.calculate_forces(cable1, cable2, load)
+        cases[f'indeterminacion.calculate_forces[{name}]'] = \
+            lambda c1=cable1, c2=cable2, w=load: calculator.calculate_forces(c1, c2, w)
+        cases[f'indeterminacion.create_figure[{name}]'] = lambda c1=cable1, c2=cable2, w=load, r=results: \
+            plt.close(visualizer.create_figure(c1.L, c2.L, w, r))
+    return cases
+
+def _flexion_cases():
+    return {
+        'flexion.calculate_flexion': lambda: calculate_flexion(1000.0, 1e-4, 0.05),
+        'flexion.visualize_flexion[100 puntos]': lambda: plt.close(visualize_flexion(1000.0, 1e-4, 1.0)),
+        'flexion.visualize_flexion[10000 puntos]':
+            lambda: plt.close(visualize_flexion(1000.0, 1e-4, 1.0, num_points=10000)),
+    }
+
+def build_cases():
+    """Every benchmark case, name -> callable."""
+    cases = {}
+    for group in (_beam_cases, _torsion_cases, _mohr_cases, _traccion_cases, _indeterminacion_cases, _flexion_cases):
+        cases.update(group())
+    return cases
+
+# --- Timing and baseline ---
+
+def loop_count(function, min_time):
+    """Calls per timed run so that one run lasts at least min_time seconds."""
+    function() # Warm-up: imports, caches and lazy initialization
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return number
+        number *= max(2, min(10, int(min_time / max(elapsed, 1e-9)) + 1))
+
+def time_cases(cases, repeat=7, min_time=0.02):
+    """
+    Best and median ms per call of every case. The repeats are interleaved
+    (one run of every case per round), so each case is sampled across the
+    whole session and a burst of machine load does not hit all its runs.
+    """
+    numbers = {name: loop_count(function, min_time) for name, function in cases.items()}
+    runs = {name: [] for name in cases}
+    for _ in range(repeat):
+        for name, function in cases.items():
+            start = time.perf_counter()
+            for _ in range(numbers[name]):
+                function()
+            runs[name].append((time.perf_counter() - start) / numbers[name] * 1e3)
+    return {name: {'best_ms': min(times), 'median_ms': statistics.median(times), 'number': numbers[name],
+                   'repeat': repeat} for name, times in runs.items()}
+
+CALIBRATION = '_calibracion'
+
+def _calibration_workload():
+    """Fixed mix of interpreter and small-array NumPy work, like the cases."""
+    total = 0.0
+    for i in range(2000):
+        total += i * 0.5
+    values = np.linspace(0.0, 1.0, 2000)
+    for _ in range(50):
+        values = np.sqrt(values * values + 1.0) - 1.0
+    return total + float(values.sum())
+
+def environment():
+    import plotly
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'plotly': plotly.__version__,
+        'matplotlib': matplotlib.__version__,
+        'machine': platform.machine(),
+        'system': platform.system(),
+        'cpus': os.cpu_count(),
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+def compare(results, baseline, tolerance, min_delta=0.001):
+    """
+    Rows (name, best ms, baseline ms, ratio, status) for every case of
+    results, with the ratios relative to that of the calibration workload.
+    A change is only reported when it also exceeds `min_delta` ms per call.
+    """
+    speed = 1.0
+    if CALIBRATION in results and CALIBRATION in baseline:
+        speed = results[CALIBRATION]['best_ms'] / baseline[CALIBRATION]['best_ms']
+    rows = []
+    for name, timing in results.items():
+        if name == CALIBRATION:
+            continue
+        reference = baseline.get(name)
+        if reference is None:
+            rows.append((name, timing['best_ms'], None, None, 'nuevo'))
+            continue
+        ratio = timing['best_ms'] / reference['best_ms'] / speed
+        significant = abs(timing['best_ms'] / speed - reference['best_ms']) > min_delta
+        status = ('REGRESIÓN' if significant and ratio > 1 + tolerance
+                  else 'mejora' if significant and ratio < 1 / (1 + tolerance) else 'ok')
+        rows.append((name, timing['best_ms'], reference['best_ms'], ratio, status))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--filter', default='', help="Ejecutar solo los casos cuyo nombre contiene este texto.")
+    parser.add_argument('--repeat', type=int, default=7, help="Repeticiones por caso (se toma el mínimo).")
+    parser.add_argument('--min-time', type=float, default=0.02, help="Duración mínima de cada repetición (s).")
+    parser.add_argument('--save', help="Guardar los resultados en este archivo JSON.")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Línea base JSON con la que comparar.")
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help="Aumento relativo admitido antes de marcar una regresión.")
+    parser.add_argument('--min-delta', type=float, default=0.001,
+                        help="Diferencia absoluta mínima por llamada (ms) para marcar una regresión o mejora.")
+    args = parser.parse_args(argv)
+
+    cases = {CALIBRATION: _calibration_workload}
+    cases.update((name, case) for name, case in build_cases().items() if args.filter in name)
+    results = time_cases(cases, args.repeat, args.min_time)
+
+    baseline = {}
+    if args.baseline and os.path.exists(args.baseline) and os.path.abspath(args.baseline) != os.path.abspath(args.save or ''):
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)['results']
+
+    width = max(map(len, results), default=10)
+    if CALIBRATION in baseline:
+        speed = results[CALIBRATION]['best_ms'] / baseline[CALIBRATION]['best_ms']
+        print(f"Calibración: {results[CALIBRATION]['best_ms']:.4g} ms, "
+              f"{speed:.2f} veces la de la línea base (razones corregidas por este factor)")
+    print(f"{'caso':<{width}} {'mejor [ms]':>11} {'mediana [ms]':>13} {'base [ms]':>10} {'razón':>7}  estado")
+    rows = compare(results, baseline, args.tolerance, args.min_delta)
+    for name, best, reference, ratio, status in rows:
+        reference_text = f"{reference:>10.4g}" if reference is not None else f"{'-':>10}"
+        ratio_text = f"{ratio:>7.2f}" if ratio is not None else f"{'-':>7}"
+        status = status if baseline else ''
+        print(f"{name:<{width}} {best:>11.4g} {results[name]['median_ms']:>13.4g} {reference_text} {ratio_text}  {status}")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump({'environment': environment(), 'results': results}, file, indent=2, ensure_ascii=False)
+            file.write('\n')
+        print(f"Resultados guardados en {args.save}")
+
+    regressions = [row[0] for row in rows if row[4] == 'REGRESIÓN']
+    if baseline and regressions:
+        print(f"{len(regressions)} regresiones respecto a {args.baseline} (tolerancia {args.tolerance:.0%}).")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
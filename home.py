@@ -1,5 +1,6 @@
 import streamlit as st
-from streamlit_extras.grid import grid
+
+from apps.startup import start_warm_up
 
 st.set_page_config(
     page_title="Simulaciones de Ingeniería",
@@ -7,6 +8,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# Precarga en segundo plano de las librerías y los cálculos más usados
+start_warm_up()
+
 # Título y descripción
 st.title("Mecánica de Sólidos")
 st.markdown("""
@@ -14,11 +18,11 @@ Esta plataforma ofrece una colección de simulaciones interactivas para el anál
 visualización de diferentes fenómenos de Mecánica de Sólidos.
 """)
 
-# Crear grid para las aplicaciones
-apps_grid = grid(3, vertical_align="top")
+# Crear grid para las aplicaciones (dos filas de tres columnas)
+apps_grid = iter([column for _ in range(2) for column in st.columns(3)])
 
 # Simulador de Tracción
-with apps_grid.container():
+with next(apps_grid):
     st.markdown("""
     ### 📈 Simulador de tracción
     
@@ -29,7 +33,7 @@ with apps_grid.container():
     if st.button("Abrir Simulador", key="traccion_btn"):
         st.switch_page("pages/2_Simulador_de_Traccion.py")
 
-with apps_grid.container():
+with next(apps_grid):
     st.markdown("""
     ### 🔗 Generador de Indeterminaciones
     
@@ -41,7 +45,7 @@ with apps_grid.container():
         st.switch_page("pages/3_Generador_de_Indeterminaciones.py")
 
 # Simulador de Torsión
-with apps_grid.container():
+with next(apps_grid):
     st.markdown("""
     ### 🌀 Simulador de Torsión
     
@@ -52,7 +56,7 @@ with apps_grid.container():
     if st.button("Abrir Simulador", key="torsion_btn"):
         st.switch_page("pages/1_Simulador_de_Torsion.py")
 
-with apps_grid.container():
+with next(apps_grid):
     st.markdown("""
     ### Simulador de Flexión pura
     
@@ -62,7 +66,7 @@ with apps_grid.container():
     if st.button("Abrir Simulador", key="flexion_btn"):
         st.switch_page("pages/4_Simulador_de_Flexion.py")
 
-with apps_grid.container():
+with next(apps_grid):
     st.markdown("""
     ### ⭕ Simulador del Círculo de Mohr
     
@@ -74,7 +78,7 @@ with apps_grid.container():
         st.switch_page("pages/5_Simulador_de_Mohr.py")
 
 # Simulador de Diagramas de Viga
-with apps_grid.container():
+with next(apps_grid):
     st.markdown("""
     ### 📊 Simulador de Diagramas de Viga
     
@@ -16,6 +16,10 @@ st.set_page_config(
 
 # Importar después de la configuración de la página
 from apps.torsion.app import main
+from apps.startup import start_warm_up
+
+# Precarga en segundo plano (solo la primera página abierta en el proceso la inicia)
+start_warm_up()
 
 if __name__ == "__main__":
     try:
@@ -1,5 +1,8 @@
 import streamlit as st
 from apps.flexion import app
+from apps.startup import start_warm_up
+
+start_warm_up()
 
 def main():
     app.main()
@@ -1,8 +1,11 @@
 import streamlit as st
 from apps.beam_diagrams.app import main
+from apps.startup import start_warm_up
 
 # Set page config
 st.set_page_config(layout="wide", page_title="Beam Diagram Generator")
 
+start_warm_up()
+
 if __name__ == "__main__":
     main()